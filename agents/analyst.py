@@ -2,21 +2,61 @@
 
 import os
 import json
+import asyncio
+from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
 from groq import Groq
+from config import config
 from .base import BaseAgent
+from .llm_cache import AdviceCache
+from .cassette import AdviceCassette, CassetteMiss
+from .throttle import RateLimiter, CircuitBreaker, ClientUnavailable
 from dotenv import load_dotenv
 
 load_dotenv()
 
+OUTLOOKS = ("BULLISH", "BEARISH", "NEUTRAL")
+SYSTEM_PROMPT = "You are a senior macro analyst for a hedge fund. Output valid JSON."
+
 class AnalystAgent(BaseAgent):
-    def __init__(self):
+    MODEL = "llama-3.1-8b-instant"
+
+    def __init__(self, client=None, cache: AdviceCache = None, cassette: AdviceCassette = None,
+                 limiter: RateLimiter = None, breaker: CircuitBreaker = None):
         super().__init__(name="Analyst")
-        self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        if cassette is None and config.ANALYST_CASSETTE_MODE in ("record", "replay"):
+            cassette = AdviceCassette()
+        self.cassette = cassette
+
+        if client is None and not (cassette is not None and cassette.mode == "replay"):
+            client = Groq(
+                api_key=os.getenv("GROQ_API_KEY"),
+                timeout=config.ANALYST_TIMEOUT_SECONDS # Abandoned async calls still end on their own
+            )
+        self.client = client # None when replaying a cassette: no network at all
+        if cache is None and config.ANALYST_CACHE_ENABLED:
+            cache = AdviceCache()
+        self.cache = cache
+        # Shared by every thread this agent calls the client from
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.tick_id = None # Set by the engine each tick; drives tick-based cache TTL
+
+    @staticmethod
+    def fallback(reason: str = "Error in analysis") -> dict:
+        return {"outlook": "NEUTRAL", "confidence": 0.0, "reasoning": reason}
 
     def run(self, symbol: str, context: str = "") -> dict:
         """
         Analyze sentiment for a specific asset given market context.
         """
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(self.MODEL, symbol, context)
+            cached = self.cache.get(key, self.tick_id)
+            if cached is not None:
+                return cached
+
         prompt = f"""
         Analyze the current sentiment and outlook for {symbol}.
         Context: {context}
@@ -29,21 +69,189 @@ class AnalystAgent(BaseAgent):
         }}
         """
         
+        try:
+            analysis = self._complete(prompt, symbol)
+            if key is not None:
+                self.cache.put(key, analysis, self.tick_id)
+            
+            # Advice record is handled by engine in 3.0
+            return analysis
+
+        except ClientUnavailable as e:
+            return self.fallback(str(e)) # Throttled or circuit open: skip quietly, no client call was made
+        except Exception as e:
+            print(f"Analyst Error for {symbol}: {e}")
+            return self.fallback()
+
+    def run_batch(self, contexts: Dict[str, str], batch_size: int = None) -> Dict[str, dict]:
+        """
+        Analyzes several assets with one JSON-mode request per batch.
+        
+        Args:
+            contexts: Map of symbol -> market context
+            batch_size: Max symbols per request (default ANALYST_BATCH_SIZE)
+            
+        Returns:
+            Map of symbol -> analysis, in the order of `contexts`. Symbols that are
+            missing from the reply or malformed fall back to NEUTRAL individually.
+        """
+        batch_size = batch_size if batch_size is not None else config.ANALYST_BATCH_SIZE
+        results: Dict[str, dict] = {}
+        keys: Dict[str, str] = {}
+        pending = []
+        for symbol, context in contexts.items():
+            if self.cache is not None:
+                keys[symbol] = self.cache.key(self.MODEL, symbol, context)
+                cached = self.cache.get(keys[symbol], self.tick_id)
+                if cached is not None:
+                    results[symbol] = cached
+                    continue
+            pending.append(symbol)
+
+        size = max(1, batch_size)
+        for i in range(0, len(pending), size):
+            chunk = pending[i:i + size]
+            lines = "\n".join(f"        - {symbol}: {contexts[symbol]}" for symbol in chunk)
+            prompt = f"""
+        Analyze the current sentiment and outlook for each asset below.
+{lines}
+        
+        Return one JSON object keyed by symbol:
+        {{
+            "<SYMBOL>": {{
+                "outlook": "BULLISH" | "BEARISH" | "NEUTRAL",
+                "confidence": <float 0.0 to 1.0>,
+                "reasoning": "<brief institutional-grade rationale>"
+            }}
+        }}
+        """
+            try:
+                reply = self._complete(prompt, ",".join(chunk))
+            except ClientUnavailable as e:
+                results.update({symbol: self.fallback(str(e)) for symbol in chunk})
+                continue
+            except Exception as e:
+                print(f"Analyst Error for batch {chunk}: {e}")
+                reply = {}
+
+            for symbol in chunk:
+                analysis = self.validate(reply.get(symbol) if isinstance(reply, dict) else None)
+                if analysis is None:
+                    print(f"Analyst Error for {symbol}: missing or malformed entry in batch reply")
+                    results[symbol] = self.fallback("Missing or malformed batch entry")
+                    continue
+                if symbol in keys:
+                    self.cache.put(keys[symbol], analysis, self.tick_id)
+                results[symbol] = analysis
+
+        return {symbol: results[symbol] for symbol in contexts}
+
+    @staticmethod
+    def validate(entry) -> Optional[dict]:
+        """Normalized copy of one analysis entry, or None if it is unusable."""
+        if not isinstance(entry, dict) or entry.get("outlook") not in OUTLOOKS:
+            return None
+        confidence = entry.get("confidence")
+        if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0.0 <= confidence <= 1.0:
+            return None
+        return {
+            "outlook": entry["outlook"],
+            "confidence": float(confidence),
+            "reasoning": str(entry.get("reasoning", "No rationale"))
+        }
+
+    def run_many(self, contexts: Dict[str, str], concurrency: int = None, timeout: float = None) -> Dict[str, dict]:
+        """
+        Analyzes several assets concurrently (blocking wrapper around run_many_async).
+        
+        Args:
+            contexts: Map of symbol -> market context
+            concurrency: Max in-flight calls (default ANALYST_CONCURRENCY)
+            timeout: Per-call timeout in seconds (default ANALYST_TIMEOUT_SECONDS)
+            
+        Returns:
+            Map of symbol -> analysis, in the order of `contexts`
+        """
+        return asyncio.run(self.run_many_async(contexts, concurrency, timeout))
+
+    async def run_many_async(self, contexts: Dict[str, str], concurrency: int = None,
+                             timeout: float = None) -> Dict[str, dict]:
+        concurrency = concurrency if concurrency is not None else config.ANALYST_CONCURRENCY
+        timeout = timeout if timeout is not None else config.ANALYST_TIMEOUT_SECONDS
+        limit = asyncio.Semaphore(max(1, concurrency))
+        loop = asyncio.get_running_loop()
+        # Private pool, one thread per symbol: a timed-out call keeps its thread
+        # without blocking later calls, and nothing waits for it on exit.
+        pool = ThreadPoolExecutor(max_workers=max(1, len(contexts)), thread_name_prefix="analyst")
+
+        async def analyze(symbol: str, context: str) -> dict:
+            async with limit:
+                try:
+                    # run() is blocking HTTP, so it runs on the pool
+                    return await asyncio.wait_for(loop.run_in_executor(pool, self.run, symbol, context), timeout)
+                except asyncio.TimeoutError:
+                    print(f"Analyst Timeout for {symbol} after {timeout}s")
+                    return self.fallback("Analysis timed out")
+                except Exception as e:
+                    print(f"Analyst Error for {symbol}: {e}")
+                    return self.fallback()
+
+        symbols = list(contexts)
+        try:
+            results = await asyncio.gather(*(analyze(s, contexts[s]) for s in symbols))
+        finally:
+            pool.shutdown(wait=False)
+        return dict(zip(symbols, results))
+
+    def guard_stats(self) -> Dict[str, object]:
+        """Throttled, rate-limited, tripped, short-circuited and failed client calls."""
+        return {**self.limiter.stats(), **self.breaker.stats()}
+
+    def close(self):
+        if self.cassette is not None:
+            self.cassette.close()
+
+    def _complete(self, prompt: str, symbol: str) -> dict:
+        """One JSON-mode completion; served from / written to the cassette when one is active."""
+        cassette = self.cassette
+        if cassette is not None and cassette.mode == "replay":
+            response = cassette.lookup(symbol, self.tick_id, self.MODEL + SYSTEM_PROMPT + prompt)
+            if response is None:
+                raise CassetteMiss(f"no recorded response for {symbol} at tick {self.tick_id}")
+            return response
+
+        completion = self._guarded_create(prompt)
+        response = json.loads(completion.choices[0].message.content)
+        if cassette is not None and cassette.mode == "record":
+            cassette.record(symbol, self.tick_id, self.MODEL + SYSTEM_PROMPT + prompt, response)
+        return response
+
+    def _guarded_create(self, prompt: str):
+        """Client call behind the circuit breaker and the request/token rate limiter."""
+        self.breaker.check()
+        estimate = (len(SYSTEM_PROMPT) + len(prompt)) // 4 + config.ANALYST_RATE_RESPONSE_TOKENS # ~4 chars per token
+        try:
+            self.limiter.acquire(estimate)
+        except ClientUnavailable:
+            self.breaker.release()
+            raise
+
         try:
             completion = self.client.chat.completions.create(
                 messages=[
-                    {"role": "system", "content": "You are a senior macro analyst for a hedge fund. Output valid JSON."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
-                model="llama-3.1-8b-instant",
+                model=self.MODEL,
                 response_format={"type": "json_object"}
             )
-            
-            analysis = json.loads(completion.choices[0].message.content)
-            
-            # Advice record is handled by engine in 3.0
-            return analysis
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
 
-        except Exception as e:
-            print(f"Analyst Error for {symbol}: {e}")
-            return {"outlook": "NEUTRAL", "confidence": 0.0, "reasoning": "Error in analysis"}
+        usage = getattr(completion, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if isinstance(total, int):
+            self.limiter.settle(estimate, total)
+        return completion
@@ -0,0 +1,73 @@
+# agents/cassette.py
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from typing import Dict, Optional, Tuple
+from config import config
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a request that was never recorded."""
+
+class AdviceCassette:
+    """
+    Record/replay store for Analyst completions.
+    In "record" mode every request/response pair is appended to a gzip'd
+    JSON-lines file, keyed by (symbol, tick, prompt hash). In "replay" mode the
+    file is loaded into memory once and completions are served from it with no
+    network at all; requests that were never recorded are reported as misses.
+    """
+
+    def __init__(self, path: str = None, mode: str = None):
+        self.path = path if path is not None else config.ANALYST_CASSETTE_PATH
+        self.mode = mode if mode is not None else config.ANALYST_CASSETTE_MODE
+        self.entries: Dict[Tuple[str, Optional[int], str], dict] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._file = None
+        if self.mode == "replay":
+            self._load()
+
+    @staticmethod
+    def prompt_hash(prompt: str) -> str:
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+    def lookup(self, symbol: str, tick: Optional[int], prompt: str) -> Optional[dict]:
+        with self._lock:
+            response = self.entries.get((symbol, tick, self.prompt_hash(prompt)))
+            if response is None:
+                self.misses += 1
+                return None
+            self.replayed += 1
+            return json.loads(json.dumps(response)) # Callers may mutate their copy
+
+    def record(self, symbol: str, tick: Optional[int], prompt: str, response: dict):
+        line = json.dumps({"symbol": symbol, "tick": tick, "prompt_hash": self.prompt_hash(prompt), "response": response})
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = gzip.open(self.path, "at", encoding="utf-8") # Appends a new gzip member per session
+            self._file.write(line + "\n")
+            self.recorded += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            print(f"WARN Cassette {self.path} not found; every analyst request will miss.")
+            return
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                self.entries[(row["symbol"], row["tick"], row["prompt_hash"])] = row["response"]
+        print(f"DATA Loaded {len(self.entries)} analyst responses from cassette {self.path}")
@@ -0,0 +1,160 @@
+# agents/llm_cache.py
+
+import os
+import re
+import json
+import math
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from config import config
+
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+class AdviceCache:
+    """
+    Cache for Analyst responses keyed by (model, symbol, bucketed context).
+    Numbers in the context are snapped to log-spaced buckets of `bucket_pct`,
+    so prompts whose prices differ by less than a bucket share an entry.
+    Entries expire after `ttl_ticks` ticks and/or `ttl_seconds` seconds
+    (0 disables either), the in-memory map is LRU-bounded to `max_entries`,
+    and an optional SQLite file keeps entries across runs so repeated
+    backtests skip the network entirely. On disk each entry is stored per
+    `ttl_ticks`-wide tick bucket, so advice stored late in a run does not
+    replace the entries a replay needs at earlier ticks; the file keeps the
+    newest `disk_max_entries` rows (and drops rows older than `ttl_seconds`).
+    """
+
+    PRUNE_EVERY = 256 # Disk writes between prunes
+
+    def __init__(self, max_entries: int = None, ttl_ticks: int = None, ttl_seconds: float = None,
+                 bucket_pct: float = None, path: str = None, disk_max_entries: int = None):
+        self.max_entries = max_entries if max_entries is not None else config.ANALYST_CACHE_MAX_ENTRIES
+        self.ttl_ticks = ttl_ticks if ttl_ticks is not None else config.ANALYST_CACHE_TTL_TICKS
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.ANALYST_CACHE_TTL_SECONDS
+        self.bucket_pct = bucket_pct if bucket_pct is not None else config.ANALYST_CACHE_BUCKET_PCT
+        self.path = path if path is not None else config.ANALYST_CACHE_PATH
+        self.disk_max_entries = disk_max_entries if disk_max_entries is not None else config.ANALYST_CACHE_DISK_MAX_ENTRIES
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict() # key -> (value, tick, created_at)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = self._open_db(self.path) if self.path else None
+        if self._db is not None:
+            self._prune()
+
+    # --- Public API ---
+
+    def key(self, model: str, symbol: str, context: str) -> str:
+        return f"{model}|{symbol}|{self.normalize(context)}"
+
+    def normalize(self, context: str) -> str:
+        """Collapses whitespace and replaces every number with its bucket index."""
+        def bucket(match) -> str:
+            value = float(match.group())
+            if value <= 0 or self.bucket_pct <= 0:
+                return match.group()
+            return f"~{round(math.log(value) / math.log1p(self.bucket_pct))}"
+        return NUMBER.sub(bucket, " ".join(context.split()))
+
+    def get(self, key: str, tick: Optional[int] = None) -> Optional[dict]:
+        with self._lock:
+            entry = self.entries.get(key)
+            if (entry is None or self._expired(entry, tick)) and self._db is not None:
+                stored = self._load(key, tick)
+                if stored is not None:
+                    entry = stored
+                    self._remember(key, entry)
+
+            if entry is None or self._expired(entry, tick):
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[0])
+
+    def put(self, key: str, value: dict, tick: Optional[int] = None):
+        entry = (dict(value), tick, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO advice (key, value, tick, created_at) VALUES (?, ?, ?, ?)",
+                    (self._disk_key(key, tick), json.dumps(entry[0]), tick, entry[2])
+                )
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    self._prune()
+                self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self.entries)
+        }
+
+    # --- Internals ---
+
+    def _expired(self, entry: tuple, tick: Optional[int]) -> bool:
+        _, entry_tick, created_at = entry
+        if self.ttl_ticks > 0 and tick is not None and entry_tick is not None:
+            # abs(): a replay may start again below the tick an entry was stored at
+            if abs(tick - entry_tick) >= self.ttl_ticks:
+                return True
+        return self.ttl_seconds > 0 and time.time() - created_at >= self.ttl_seconds
+
+    def _remember(self, key: str, entry: tuple):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _disk_key(self, key: str, tick: Optional[int]) -> str:
+        if self.ttl_ticks > 0 and tick is not None:
+            return f"{key}|t{tick // self.ttl_ticks}"
+        return key
+
+    @staticmethod
+    def _open_db(path: str) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False) # Access is serialized by _lock
+        db.execute("CREATE TABLE IF NOT EXISTS advice (key TEXT PRIMARY KEY, value TEXT, tick INTEGER, created_at REAL)")
+        db.execute("CREATE INDEX IF NOT EXISTS advice_created_at ON advice (created_at)")
+        return db
+
+    def _load(self, key: str, tick: Optional[int]) -> Optional[tuple]:
+        """
+        Live stored entry for `key` at `tick`: from the tick's bucket or the one before it
+        (anything older has expired), preferring the latest entry stored at or before `tick`,
+        which is the one the recording run used.
+        """
+        keys = {self._disk_key(key, tick)}
+        if self.ttl_ticks > 0 and tick is not None:
+            keys.add(self._disk_key(key, tick - self.ttl_ticks))
+        rows = self._db.execute(
+            f"SELECT value, tick, created_at FROM advice WHERE key IN ({', '.join('?' * len(keys))})", tuple(keys)
+        ).fetchall()
+        entries = [(json.loads(value), entry_tick, created_at) for value, entry_tick, created_at in rows]
+        entries = [entry for entry in entries if not self._expired(entry, tick)]
+        if not entries:
+            return None
+        if tick is None:
+            return max(entries, key=lambda entry: entry[2])
+        return min(entries, key=lambda entry: (entry[1] is not None and entry[1] > tick, abs(tick - (entry[1] or 0))))
+
+    def _prune(self):
+        """Bounds the disk store: drops rows past `ttl_seconds`, then all but the newest `disk_max_entries`."""
+        if self.ttl_seconds > 0:
+            self._db.execute("DELETE FROM advice WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        if self.disk_max_entries > 0:
+            self._db.execute(
+                "DELETE FROM advice WHERE key IN (SELECT key FROM advice ORDER BY created_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.disk_max_entries,)
+            )
+        self._db.commit()
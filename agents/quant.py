@@ -1,29 +1,230 @@
-# agents/quant.py 
+# agents/quant.py
 
 import ta
 import json
+import numpy as np
 import pandas as pd
+from typing import Dict, List, Tuple
+from config import config
 from .base import BaseAgent
 
+class WilderRSI:
+    """
+    Incremental Wilder RSI. Keeps the smoothed average gain/loss and updates them
+    in O(1) from each new close, using the same recursion as ta.momentum.rsi
+    (EWM with alpha=1/window, adjust=False, first diff counted as zero).
+    The value is NaN until `window` closes have been seen, like ta's min_periods.
+    """
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.alpha = 1.0 / window
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.last_close = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, close: float) -> float:
+        if self.count > 0:
+            diff = close - self.last_close
+            gain = diff if diff > 0 else 0.0
+            loss = -diff if diff < 0 else 0.0
+            self.avg_gain = (1 - self.alpha) * self.avg_gain + self.alpha * gain
+            self.avg_loss = (1 - self.alpha) * self.avg_loss + self.alpha * loss
+        self.last_close = close
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.count < self.window:
+            return float("nan")
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+
+class BatchWilderRSI:
+    """
+    Vectorized WilderRSI across a whole universe: one state slot per asset,
+    updated with a single NumPy pass per new row of closes. Uses the exact
+    per-element arithmetic of WilderRSI, so results are bit-identical.
+    Stale cells (forward-filled, no fresh print) leave their asset's state untouched,
+    and an asset's RSI stays NaN until it has `window` real closes.
+    """
+
+    def __init__(self, n_assets: int, window: int = 14):
+        self.n_assets = n_assets
+        self.window = window
+        self.alpha = 1.0 / window
+        self.reset()
+
+    def reset(self):
+        self.count = 0 # Rows fed
+        self.closes = np.zeros(self.n_assets, dtype=np.int64) # Real closes fed, per asset
+        self.last_row = np.full(self.n_assets, np.nan) # Last row fed, stale cells included
+        self.last_close = np.full(self.n_assets, np.nan) # Last real close per asset
+        self.avg_gain = np.zeros(self.n_assets)
+        self.avg_loss = np.zeros(self.n_assets)
+
+    def update(self, closes: np.ndarray, stale: np.ndarray = None) -> np.ndarray:
+        fresh = np.ones(self.n_assets, dtype=bool) if stale is None else ~np.asarray(stale, dtype=bool)
+        if self.count > 0:
+            diff = closes - self.last_close
+            gain = np.where(diff > 0, diff, 0.0)
+            loss = np.where(diff < 0, -diff, 0.0)
+            avg_gain = (1 - self.alpha) * self.avg_gain + self.alpha * gain
+            avg_loss = (1 - self.alpha) * self.avg_loss + self.alpha * loss
+            self.avg_gain[fresh] = avg_gain[fresh]
+            self.avg_loss[fresh] = avg_loss[fresh]
+        self.last_row = np.array(closes, dtype=np.float64)
+        self.last_close[fresh] = self.last_row[fresh]
+        self.closes += fresh
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+        rsi = np.where(self.avg_loss == 0, 100.0, rsi)
+        return np.where(self.closes < self.window, np.nan, rsi)
+
 class QuantAgent(BaseAgent):
-    def __init__(self):
+    def __init__(self, incremental: bool = None, rsi_window: int = 14):
         super().__init__(name="Quant")
+        self.incremental = incremental if incremental is not None else config.QUANT_INCREMENTAL_RSI
+        self.rsi_window = rsi_window
+        self.rsi_state: Dict[str, WilderRSI] = {}
+        self.batch_state: BatchWilderRSI = None
+        self.batch_symbols: List[str] = []
 
     def run(self, symbol: str, price_history: pd.DataFrame) -> dict:
         """
         Calculates technical signals for a specific asset.
         """
-        if price_history.empty or len(price_history) < 20:
+        if price_history.empty:
+            return {"outlook": "NEUTRAL", "confidence": 0.0, "reasoning": "Insufficient history"}
+
+        closes = price_history['close']
+        if 'stale' in price_history.columns:
+            # Forward-filled closes (market closed) are not price moves
+            closes = closes[~price_history['stale'].to_numpy(dtype=bool)]
+
+        if self.incremental:
+            # Keep the running state in sync even while history is too short to trade on
+            rsi = self._incremental_rsi(symbol, closes)
+
+        if len(closes) < 20: # Real closes only; a mostly-stale frame is not enough history
             return {"outlook": "NEUTRAL", "confidence": 0.0, "reasoning": "Insufficient history"}
 
         # Calculate RSI
-        rsi = ta.momentum.rsi(price_history['close'], window=14).iloc[-1]
+        if not self.incremental:
+            rsi = ta.momentum.rsi(closes, window=self.rsi_window).iloc[-1]
+
+        outlook, confidence, reason = self._signal(rsi)
+
+        return {
+            "outlook": outlook,
+            "confidence": min(1.0, float(confidence)),
+            "reasoning": reason,
+            "indicators": {"rsi": float(rsi)}
+        }
+
+    def run_batch(self, symbols: List[str], closes: np.ndarray, stale: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """
+        Signals for the whole universe in one vectorized pass.
         
+        Args:
+            symbols: Asset names, one per column of `closes`
+            closes: (ticks x assets) close history up to and including the current tick
+            stale: Matching (ticks x assets) mask of forward-filled closes (skipped by the RSI)
+            
+        Returns:
+            Map of "outlook" / "confidence" / "rsi" / "history" (real closes seen) -> per-asset arrays
+        """
+        n_ticks = closes.shape[0]
+        state = self.batch_state
+        if (state is None or symbols != self.batch_symbols or n_ticks < state.count
+                or (state.count and not np.array_equal(closes[state.count - 1], state.last_row, equal_nan=True))):
+            state = self.batch_state = BatchWilderRSI(len(symbols), self.rsi_window)
+            self.batch_symbols = list(symbols)
+
+        for t in range(state.count, n_ticks):
+            state.update(closes[t], None if stale is None else stale[t])
+        rsi = state.value
+        history = state.closes.copy()
+
+        outlook, confidence = self.batch_signals(rsi, history)
+        return {"outlook": outlook, "confidence": confidence, "rsi": rsi, "history": history}
+
+    @staticmethod
+    def batch_signals(rsi: np.ndarray, history) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized mean-reversion rule over an RSI array of any shape.
+        `history` is the number of real (non-stale) closes behind each value (scalar or broadcastable).
+        """
+        outlook = np.full(rsi.shape, "NEUTRAL", dtype=object)
+        confidence = np.full(rsi.shape, 0.5)
+        bullish, bearish = rsi < 35, rsi > 65
+        outlook[bullish] = "BULLISH"
+        outlook[bearish] = "BEARISH"
+        confidence[bullish] = (35 - rsi[bullish]) / 35 + 0.5
+        confidence[bearish] = (rsi[bearish] - 65) / 35 + 0.5
+        confidence = np.minimum(confidence, 1.0)
+
+        short = np.broadcast_to(np.asarray(history) < 20, rsi.shape)
+        outlook[short] = "NEUTRAL"
+        confidence[short] = 0.0
+        return outlook, confidence
+
+    @staticmethod
+    def batch_advice(batch: Dict[str, np.ndarray], j: int) -> dict:
+        """Per-asset advice dict (same shape as run()) for column j of a run_batch() result."""
+        if batch["history"][j] < 20:
+            return {"outlook": "NEUTRAL", "confidence": 0.0, "reasoning": "Insufficient history"}
+
+        rsi = float(batch["rsi"][j])
+        outlook = batch["outlook"][j]
+        if outlook == "BULLISH":
+            reason = f"RSI oversold ({rsi:.1f})"
+        elif outlook == "BEARISH":
+            reason = f"RSI overbought ({rsi:.1f})"
+        else:
+            reason = "RSI is in neutral territory."
+
+        return {
+            "outlook": outlook,
+            "confidence": float(batch["confidence"][j]),
+            "reasoning": reason,
+            "indicators": {"rsi": rsi}
+        }
+
+    def _incremental_rsi(self, symbol: str, closes: pd.Series) -> float:
+        """
+        Feeds only the closes not seen yet (normally one per tick) into the symbol's RSI state.
+        """
+        state = self.rsi_state.get(symbol)
+        if state is None:
+            state = self.rsi_state[symbol] = WilderRSI(self.rsi_window)
+
+        # History was rewound or replaced: rebuild from scratch
+        if len(closes) < state.count or (state.count and closes.iat[state.count - 1] != state.last_close):
+            state.reset()
+
+        for close in closes.iloc[state.count:].to_numpy():
+            state.update(float(close))
+        return state.value
+
+    @staticmethod
+    def _signal(rsi: float) -> Tuple[str, float, str]:
         # Simple Mean Reversion logic
         outlook = "NEUTRAL"
         confidence = 0.5
         reason = "RSI is in neutral territory."
-        
+
         if rsi < 35:
             outlook = "BULLISH"
             confidence = (35 - rsi) / 35 + 0.5 # Higher confidence as it gets deeper oversold
@@ -33,9 +234,4 @@ class QuantAgent(BaseAgent):
             confidence = (rsi - 65) / 35 + 0.5
             reason = f"RSI overbought ({rsi:.1f})"
 
-        return {
-            "outlook": outlook,
-            "confidence": min(1.0, float(confidence)),
-            "reasoning": reason,
-            "indicators": {"rsi": float(rsi)}
-        }
+        return outlook, confidence, reason
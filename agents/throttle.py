@@ -0,0 +1,151 @@
+# agents/throttle.py
+
+import time
+import threading
+from typing import Callable, Dict
+from config import config
+
+class ClientUnavailable(RuntimeError):
+    """Raised instead of calling the LLM client when the guard refuses the request."""
+
+class RateLimited(ClientUnavailable):
+    """The request/token budget did not free up within the allowed wait."""
+
+class CircuitOpen(ClientUnavailable):
+    """The circuit breaker is open after repeated failures."""
+
+class RateLimiter:
+    """
+    Token buckets for requests and tokens per minute, shared by every thread
+    that uses the client. Each bucket holds at most one minute of budget and
+    refills continuously. `acquire()` waits up to `max_wait` seconds for both
+    buckets to cover the request, otherwise raises RateLimited. Token costs
+    are estimated up front and corrected with `settle()` once the real usage
+    is known. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_min: float = None, tokens_per_min: float = None,
+                 max_wait: float = None, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.requests_per_min = requests_per_min if requests_per_min is not None else config.ANALYST_RATE_REQUESTS_PER_MIN
+        self.tokens_per_min = tokens_per_min if tokens_per_min is not None else config.ANALYST_RATE_TOKENS_PER_MIN
+        self.max_wait = max_wait if max_wait is not None else config.ANALYST_RATE_MAX_WAIT_SECONDS
+        self._clock = clock
+        self._sleep = sleep
+        self._requests = float(self.requests_per_min)
+        self._tokens = float(self.tokens_per_min)
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.throttled = 0 # Requests that had to wait
+        self.rejected = 0  # Requests refused after max_wait
+
+    def acquire(self, tokens: int = 0):
+        deadline = self._clock() + self.max_wait
+        waited = False
+        while True:
+            with self._lock:
+                delay = self._delay(tokens)
+                if delay <= 0:
+                    if self.requests_per_min > 0:
+                        self._requests -= 1
+                    if self.tokens_per_min > 0:
+                        self._tokens -= tokens
+                    return
+                if not waited:
+                    self.throttled += 1
+                    waited = True
+                remaining = deadline - self._clock()
+                if delay > remaining:
+                    self.rejected += 1
+                    raise RateLimited(f"rate limit: budget frees up in {delay:.1f}s (max wait {self.max_wait}s)")
+            self._sleep(delay)
+
+    def stats(self) -> Dict[str, int]:
+        return {"throttled": self.throttled, "rate_limited": self.rejected}
+
+    def settle(self, estimated: int, actual: int):
+        """Charges (or refunds) the difference between estimated and actual token usage."""
+        if self.tokens_per_min <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens + estimated - actual, float(self.tokens_per_min))
+
+    def _delay(self, tokens: int) -> float:
+        """Seconds until both buckets cover the request (<= 0 if it can go now). Holds _lock."""
+        self._refill()
+        delay = 0.0
+        if self.requests_per_min > 0 and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60.0 / self.requests_per_min)
+        if self.tokens_per_min > 0 and self._tokens < tokens:
+            # A request larger than the whole bucket goes through on a full bucket
+            need = min(tokens, self.tokens_per_min) - self._tokens
+            if need > 0:
+                delay = max(delay, need * 60.0 / self.tokens_per_min)
+        return delay
+
+    def _refill(self):
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated)
+        self._updated = now
+        self._requests = min(self._requests + elapsed * self.requests_per_min / 60.0, float(self.requests_per_min))
+        self._tokens = min(self._tokens + elapsed * self.tokens_per_min / 60.0, float(self.tokens_per_min))
+
+class CircuitBreaker:
+    """
+    Stops calling a degraded API. After `failure_threshold` consecutive failures
+    the breaker opens and `check()` raises CircuitOpen for `cooloff` seconds.
+    Then a single trial call is let through (half-open): success closes the
+    breaker, failure opens it for another cool-off window.
+    """
+
+    def __init__(self, failure_threshold: int = None, cooloff: float = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold if failure_threshold is not None else config.ANALYST_BREAKER_FAILURES
+        self.cooloff = cooloff if cooloff is not None else config.ANALYST_BREAKER_COOLOFF_SECONDS
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = "closed" # closed | open | half_open
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.tripped = 0  # Times the breaker opened
+        self.skipped = 0  # Calls refused while open
+        self.failed = 0   # Failed calls seen
+
+    def check(self):
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self.state == "closed":
+                return
+            if self.state == "open" and self._clock() - self.opened_at >= self.cooloff:
+                self.state = "half_open" # This caller is the trial call
+                return
+            self.skipped += 1
+            retry_in = max(0.0, self.cooloff - (self._clock() - self.opened_at))
+            raise CircuitOpen(f"circuit open after {self.consecutive_failures} failures; retry in {retry_in:.0f}s")
+
+    def stats(self) -> Dict[str, object]:
+        return {"tripped": self.tripped, "short_circuited": self.skipped, "failed": self.failed, "breaker_state": self.state}
+
+    def release(self):
+        """The admitted call never reached the client: hands a pending trial to the next caller."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failed += 1
+            self.consecutive_failures += 1
+            if self.failure_threshold <= 0:
+                return
+            if self.state == "half_open" or (self.state == "closed" and self.consecutive_failures >= self.failure_threshold):
+                self.state = "open"
+                self.opened_at = self._clock()
+                self.tripped += 1
@@ -31,21 +31,92 @@ class SimulationConfig(BaseSettings):
     INITIAL_CAPITAL: float = 100000.0
     MAX_POSITION_PCT: float = 0.15       # Max 15% per single asset
     PORTFOLIO_CASH_RESERVE: float = 0.05 # Keep 5% in cash
+    ALLOCATOR_MODE: str = "vectorized"   # vectorized (caps redistribute excess weight) | erc (equal risk contribution) | dict (legacy)
+    ERC_TOLERANCE: float = 1e-8          # Stop when the Newton step changes every weight by less than this (relative)
+    ERC_MAX_ITERATIONS: int = 50         # Newton steps per tick (warm-started from the previous tick)
     
     # === Risk Management ===
     MAX_DRAWDOWN_PCT: float = 0.15
     VOLATILITY_LOOKBACK: int = 20        # Ticks for vol calculation
+    COVARIANCE_DECAY: float = 0.94       # EWMA lambda for the return covariance matrix
+    CORRELATION_AWARE: bool = True       # Penalize allocations to mutually correlated assets
+    COVARIANCE_MIN_OBSERVATIONS: int = 20 # Real returns per asset before its correlations reach the allocator
+    COVARIANCE_PERSIST_EVERY: int = 50   # Ticks between RiskSnapshot rows (0 disables)
+    
+    # === Quant Signals ===
+    QUANT_INCREMENTAL_RSI: bool = True   # O(1) per-tick Wilder RSI state instead of full recompute
+    QUANT_BATCH: bool = True             # One vectorized pass over the (ticks x assets) close matrix
+    INDICATOR_MODE: str = "incremental"  # incremental | precomputed (whole-run panels for backtests)
     
     # === LLM Advisory ===
     LLM_COOLDOWN_TICKS: int = 20         # Min ticks between advisor calls
     LLM_COOLDOWN_SECONDS: int = 300      # 5 minute cooldown (legacy/real-time)
     CONFIDENCE_THRESHOLD: float = 0.6    # Advisor threshold
+    ARBITER_MODE: str = "vectorized"     # dict | vectorized (masked array ops) | lazy (decay computed on read)
+    
+    # === Analyst Dispatch ===
+    ANALYST_TRIGGER_MODE: str = "cooldown"   # cooldown | state_change (price/volatility triggers)
+    ANALYST_TRIGGER_PRICE_PCT: float = 0.02  # Re-analyze after a 2% move since the last analysis
+    ANALYST_TRIGGER_VOL_RATIO: float = 1.5   # ...or when volatility rose/fell by this factor
+    ANALYST_SCHEDULE: str = "staggered"      # staggered (spread first calls over the cooldown) | aligned (legacy bursts)
+    ANALYST_MAX_CALLS_PER_TICK: int = 0      # Global per-tick call budget (0 = unlimited)
+    ANALYST_PRIORITY: str = "none"           # none | volatility (volatile assets analyzed more often)
+    ANALYST_MAX_STRETCH: float = 4.0         # Low-priority intervals stretch up to this x cooldown
+    ANALYST_ASYNC: bool = True               # Fan out all due analyst calls of a tick concurrently
+    ANALYST_CONCURRENCY: int = 8             # Max in-flight analyst calls
+    ANALYST_TIMEOUT_SECONDS: float = 20.0    # Per-call timeout; slow calls fall back to NEUTRAL
+    ANALYST_BATCH_SIZE: int = 0              # >1: up to this many due assets per JSON request (0 = one per asset)
+    ADVISORY_MODE: str = "sync"              # sync (deterministic, same-tick advice) | background (worker thread)
+    
+    # === LLM Client Guard ===
+    ANALYST_RATE_REQUESTS_PER_MIN: int = 30       # Request bucket (0 disables)
+    ANALYST_RATE_TOKENS_PER_MIN: int = 6000       # Token bucket (0 disables)
+    ANALYST_RATE_MAX_WAIT_SECONDS: float = 5.0    # Longer waits fall back to NEUTRAL instead of stalling the tick
+    ANALYST_RATE_RESPONSE_TOKENS: int = 200       # Completion tokens reserved per request until usage is known
+    ANALYST_BREAKER_FAILURES: int = 5             # Consecutive failures that open the circuit (0 disables)
+    ANALYST_BREAKER_COOLOFF_SECONDS: float = 60.0 # Skip calls this long, then let one trial call through
+    
+    # === LLM Response Cache ===
+    ANALYST_CACHE_ENABLED: bool = True
+    ANALYST_CACHE_MAX_ENTRIES: int = 1024    # LRU bound of the in-memory map
+    ANALYST_CACHE_TTL_TICKS: int = 60        # Entry lifetime in ticks (0 disables)
+    ANALYST_CACHE_TTL_SECONDS: float = 0.0   # Entry lifetime in seconds (0 disables; use for live runs)
+    ANALYST_CACHE_BUCKET_PCT: float = 0.005  # Prices within ~0.5% share a cache entry
+    ANALYST_CACHE_PATH: str = ""             # SQLite file to persist entries across runs ("" = memory only)
+    ANALYST_CACHE_DISK_MAX_ENTRIES: int = 100000 # Rows kept in the SQLite file, oldest pruned first (0 = unbounded)
+    
+    # === LLM Record/Replay ===
+    ANALYST_CASSETTE_MODE: str = "off"       # off | record (save every completion) | replay (offline, no network)
+    ANALYST_CASSETTE_PATH: str = ".cache/llm/cassette.jsonl.gz"
     
     # === Execution ===
     SYMBOL: str = "BTC-USD"              # Legacy support
     TIMEFRAME: str = "5m"
     HISTORY_DAYS: int = 30
     
+    # === Market Data Loading ===
+    DATA_LOAD_WORKERS: int = 8               # Concurrent symbol downloads
+    DATA_LOAD_TIMEOUT_SECONDS: float = 30.0  # Per-symbol attempt timeout
+    DATA_LOAD_RETRIES: int = 2
+    DATA_LOAD_BACKOFF_SECONDS: float = 1.0   # Doubles on every retry
+    
+    # === Market Data Cache ===
+    MARKET_CACHE_ENABLED: bool = True
+    MARKET_CACHE_DIR: str = ".cache/market"
+    MARKET_CACHE_MAX_MB: int = 512           # LRU eviction above this size
+    MARKET_CACHE_TTL_SECONDS: int = 900      # Serve cached tail without network if fetched within TTL
+    MARKET_CACHE_OFFLINE: bool = False       # Never hit the network (offline CI replays)
+    
+    # === Persistence ===
+    PERSIST_PROFILE: str = "full"            # full | decisions (orders, LLM advice, traded ticks) | sampled | summary (final state) | none
+    PERSIST_SAMPLE_EVERY: int = 10           # "sampled": write every row of every Nth tick (orders always)
+    PERSIST_ADVICE: bool = True              # Write LLMAdvice rows (off: advice only feeds the arbiter, under any profile)
+    PERSIST_MODE: str = "sync"               # sync (commit inside the tick) | background (write-behind thread)
+    PERSIST_QUEUE_TICKS: int = 256           # Pending ticks before the writer applies backpressure
+    PERSIST_BATCH_TICKS: int = 20            # Max ticks coalesced into one transaction
+    PERSIST_FLUSH_SECONDS: float = 0.5       # ...or whatever arrived within this window
+    PERSIST_OVERFLOW: str = "block"          # block | drop_market_data (full queue sheds MarketData rows first)
+    
     model_config = {"env_prefix": "ALPHAPULSE_"}
 
 config = SimulationConfig()
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from sqlalchemy import Column, JSON
 from sqlmodel import Field, SQLModel
 
@@ -44,6 +44,15 @@ class PortfolioState(SQLModel, table=True):
     unrealized_pnl: float = 0.0
     max_drawdown: float = 0.0
 
+class RiskSnapshot(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run_id: str = Field(index=True)
+    tick_id: int
+    assets: List[str] = Field(sa_column=Column(JSON))  # Row/column order of the matrix
+    volatility: List[float] = Field(sa_column=Column(JSON))  # EWMA per-tick volatility
+    correlation: List[List[float]] = Field(sa_column=Column(JSON))
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
 class Order(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     run_id: str = Field(index=True)
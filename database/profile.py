@@ -0,0 +1,63 @@
+# database/profile.py
+
+from config import config
+
+PROFILES = ("full", "decisions", "sampled", "summary", "none")
+ALIASES = {"decisions-only": "decisions", "summary-only": "summary"}
+
+class PersistenceProfile:
+    """
+    Decides which rows a run writes.
+    - full: every market tick, every advice, order and portfolio state (audit trail).
+    - decisions: orders, LLM analyst advice, and portfolio states of ticks that traded.
+      Market data and quant advice are reproducible from the price history and are skipped.
+    - sampled: every row of every `sample_every`-th tick, plus all orders.
+    - summary: the run record and the final portfolio state only.
+    - none: nothing, not even the run record (parameter sweeps, research).
+    "decisions-only" and "summary-only" are accepted as aliases; any other name raises
+    ValueError rather than silently writing everything. PERSIST_ADVICE=false still drops
+    advice under any profile.
+    """
+
+    def __init__(self, name: str = None, sample_every: int = None, persist_advice: bool = None):
+        name = name if name is not None else config.PERSIST_PROFILE
+        key = str(name).strip().lower()
+        self.name = ALIASES.get(key, key)
+        if self.name not in PROFILES:
+            raise ValueError(f"Unknown PERSIST_PROFILE {name!r}; expected one of {', '.join(PROFILES)}")
+        self.sample_every = max(1, sample_every if sample_every is not None else config.PERSIST_SAMPLE_EVERY)
+        self.persist_advice = persist_advice if persist_advice is not None else config.PERSIST_ADVICE
+
+    @property
+    def run_record(self) -> bool:
+        return self.name != "none"
+
+    @property
+    def summary(self) -> bool:
+        return self.name == "summary"
+
+    def sampled(self, tick_id: int) -> bool:
+        """True on ticks whose full row set is written."""
+        return self.name == "full" or (self.name == "sampled" and tick_id % self.sample_every == 0)
+
+    def market_data(self, tick_id: int) -> bool:
+        return self.sampled(tick_id)
+
+    def advice(self, tick_id: int, advisor_name: str) -> bool:
+        if not self.persist_advice:
+            return False
+        return self.sampled(tick_id) or (self.name == "decisions" and advisor_name != "Quant")
+
+    def orders(self) -> bool:
+        return self.name in ("full", "decisions", "sampled")
+
+    def portfolio(self, tick_id: int, traded: bool) -> bool:
+        return self.sampled(tick_id) or (self.name == "decisions" and traded)
+
+    def risk(self) -> bool:
+        """RiskSnapshots keep their own COVARIANCE_PERSIST_EVERY sampling."""
+        return self.name in ("full", "decisions", "sampled")
+
+    def __repr__(self) -> str:
+        suffix = f" every {self.sample_every}" if self.name == "sampled" else ""
+        return f"PersistenceProfile({self.name}{suffix})"
@@ -0,0 +1,81 @@
+# database/unit_of_work.py
+
+from typing import Any, Dict, List, Type
+from pydantic_core import PydanticUndefined
+from sqlalchemy import insert
+from sqlmodel import SQLModel
+from .models import MarketData, LLMAdvice, Order, PortfolioState
+
+# Flush order; RiskSnapshot and other rare rows go through `objects`
+BULK_MODELS = (MarketData, LLMAdvice, Order, PortfolioState)
+
+_defaults_cache: Dict[type, Dict[str, Any]] = {}
+
+def _column_defaults(model: Type[SQLModel]) -> Dict[str, Any]:
+    """Model-level defaults (values or factories) of every non-primary-key field."""
+    defaults = _defaults_cache.get(model)
+    if defaults is None:
+        primary_key = set(model.__table__.primary_key.columns.keys())
+        defaults = {}
+        for name, field in model.model_fields.items():
+            if name in primary_key:
+                continue
+            if field.default_factory is not None:
+                defaults[name] = field.default_factory
+            elif field.default is not PydanticUndefined:
+                defaults[name] = field.default
+        _defaults_cache[model] = defaults
+    return defaults
+
+class TickBatch:
+    """
+    Unit of work for one tick.
+    Collects MarketData, LLMAdvice, Order and PortfolioState rows as plain
+    dicts and writes them with one executemany INSERT per table, in a single
+    transaction owned by the caller. Rows skip ORM/Pydantic construction, so
+    omitted model defaults (e.g. `created_at`) are filled in by add(), when the
+    row is produced; ticks coalesced into one later flush keep their own
+    timestamps. Rare rows such as sampled RiskSnapshots can be added as ORM objects.
+    """
+
+    def __init__(self):
+        self.rows: Dict[Type[SQLModel], List[Dict[str, Any]]] = {model: [] for model in BULK_MODELS}
+        self.objects: List[SQLModel] = []
+
+    def add(self, model: Type[SQLModel], values: Dict[str, Any]):
+        row = {
+            name: default() if callable(default) else default
+            for name, default in _column_defaults(model).items()
+            if name not in values
+        }
+        row.update(values)
+        self.rows[model].append(row)
+
+    def add_object(self, obj: SQLModel):
+        self.objects.append(obj)
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self.rows.values()) + len(self.objects)
+
+    def extend(self, other: "TickBatch"):
+        """Appends every row of `other` (coalesces several ticks into one transaction)."""
+        for model, rows in other.rows.items():
+            self.rows[model].extend(rows)
+        self.objects.extend(other.objects)
+
+    def drop(self, model: Type[SQLModel]) -> int:
+        """Discards the queued rows of `model`; returns how many were dropped."""
+        dropped = len(self.rows[model])
+        self.rows[model] = []
+        return dropped
+
+    def counts(self) -> Dict[str, int]:
+        return {model.__name__: len(rows) for model, rows in self.rows.items() if rows}
+
+    def flush(self, session):
+        """Writes every collected row on `session`; the caller commits."""
+        for model, rows in self.rows.items():
+            if rows:
+                session.execute(insert(model.__table__), rows)
+        for obj in self.objects:
+            session.add(obj)
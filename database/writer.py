@@ -0,0 +1,155 @@
+# database/writer.py
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, List
+from config import config
+from .models import MarketData
+from .unit_of_work import TickBatch
+
+Write = Callable[[TickBatch], None]
+
+class BackgroundWriter:
+    """
+    Write-behind persistence for TickBatches.
+    In "background" mode the engine only enqueues each tick's batch; a daemon
+    thread drains the queue and writes up to `batch_ticks` ticks per
+    transaction, or whatever arrived within `flush_interval` seconds. The queue
+    is bounded: when the database falls behind, `submit()` blocks the tick loop
+    (backpressure), or with overflow="drop_market_data" first sheds the
+    incoming tick's MarketData rows and only blocks for what is left.
+    "sync" mode writes inline, so rows are committed before the tick returns
+    and a failed write raises to the caller; only the writer thread, which has
+    no caller to raise to, logs and counts failures.
+    """
+
+    def __init__(self, write: Write, mode: str = None, max_queue: int = None, batch_ticks: int = None,
+                 flush_interval: float = None, overflow: str = None, clock: Callable[[], float] = time.perf_counter):
+        self.write = write
+        self.mode = mode if mode is not None else config.PERSIST_MODE
+        self.max_queue = max_queue if max_queue is not None else config.PERSIST_QUEUE_TICKS
+        self.batch_ticks = max(1, batch_ticks if batch_ticks is not None else config.PERSIST_BATCH_TICKS)
+        self.flush_interval = flush_interval if flush_interval is not None else config.PERSIST_FLUSH_SECONDS
+        self.overflow = overflow if overflow is not None else config.PERSIST_OVERFLOW
+        self.clock = clock
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max(1, self.max_queue))
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+
+        # Metrics
+        self.ticks_written = 0
+        self.rows_written = 0
+        self.failed_ticks = 0
+        self.flushes = 0
+        self.flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.max_queue_depth = 0
+        self.blocked = 0             # submit() calls that waited for queue space
+        self.blocked_seconds = 0.0
+        self.dropped_rows = 0        # MarketData rows shed on overflow
+
+    def submit(self, batch: TickBatch):
+        """Hands one tick's rows to the writer; the batch must not be modified afterwards."""
+        if not len(batch):
+            return
+        if self.mode != "background":
+            self._flush([batch])
+            return
+
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+            self._thread.start()
+        try:
+            self.queue.put_nowait(batch)
+        except queue.Full:
+            if self.overflow == "drop_market_data":
+                with self._lock:
+                    self.dropped_rows += batch.drop(MarketData)
+                if not len(batch):
+                    return
+            start = self.clock()
+            self.queue.put(batch)
+            with self._lock:
+                self.blocked += 1
+                self.blocked_seconds += self.clock() - start
+        with self._lock:
+            self.max_queue_depth = max(self.max_queue_depth, self.queue.qsize())
+
+    def drain(self):
+        """Blocks until every batch submitted so far has been written."""
+        if self._thread is not None:
+            self.queue.join()
+
+    def stop(self, timeout: float = None):
+        """Writes everything still queued, then stops the writer thread."""
+        if self._thread is None:
+            return
+        self.queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"DB Writer: {self.queue.qsize()} batches still queued after {timeout}s")
+        self._thread = None
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "queue_depth": self.queue.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "ticks_written": self.ticks_written,
+                "rows_written": self.rows_written,
+                "failed_ticks": self.failed_ticks,
+                "flushes": self.flushes,
+                "flush_ms_avg": 1e3 * self.flush_seconds / self.flushes if self.flushes else 0.0,
+                "flush_ms_max": 1e3 * self.max_flush_seconds,
+                "blocked": self.blocked,
+                "blocked_seconds": self.blocked_seconds,
+                "dropped_rows": self.dropped_rows
+            }
+
+    def _loop(self):
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            batches = [item]
+            deadline = self.clock() + self.flush_interval
+            while len(batches) < self.batch_ticks:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - self.clock()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batches.append(item)
+            self._flush(batches)
+            for _ in range(len(batches) + stopping):
+                self.queue.task_done()
+
+    def _flush(self, batches: List[TickBatch]):
+        """Writes `batches` in one transaction and records its latency."""
+        merged = batches[0]
+        if len(batches) > 1:
+            merged = TickBatch()
+            for batch in batches:
+                merged.extend(batch)
+        start = self.clock()
+        try:
+            self.write(merged)
+        except Exception as e:
+            if self.mode != "background":
+                raise
+            print(f"DB Writer Error ({len(batches)} ticks, {len(merged)} rows): {e}")
+            with self._lock:
+                self.failed_ticks += len(batches)
+            return
+        elapsed = self.clock() - start
+        with self._lock:
+            self.ticks_written += len(batches)
+            self.rows_written += len(merged)
+            self.flushes += 1
+            self.flush_seconds += elapsed
+            self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
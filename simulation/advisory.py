@@ -0,0 +1,91 @@
+# simulation/advisory.py
+
+import queue
+import threading
+from typing import Callable, Dict, List, Set, Tuple
+from config import config
+
+Dispatch = Callable[[int, Dict[str, str]], Dict[str, dict]]
+
+class AdvisoryWorker:
+    """
+    Runs Analyst requests off the tick loop.
+    The engine submits the assets that are due on a tick and, on every tick,
+    collects whatever analyses have completed since, each tagged with how many
+    ticks old it is. In "background" mode a daemon thread drains a request queue,
+    so tick cadence no longer depends on LLM latency. "sync" mode dispatches
+    inline and returns results on the same tick (staleness 0), which keeps
+    backtests deterministic.
+    """
+
+    def __init__(self, dispatch: Dispatch, mode: str = None):
+        self.dispatch = dispatch
+        self.mode = mode if mode is not None else config.ADVISORY_MODE
+        self.requests: "queue.Queue" = queue.Queue()
+        self.completed: List[Tuple[int, str, dict]] = [] # (requested tick, asset, advice)
+        self.in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread = None
+
+    def submit(self, tick_id: int, due: Dict[str, str]):
+        """Queues analyses for `due` (asset -> context) requested on `tick_id`."""
+        if not due:
+            return
+        if self.mode != "background":
+            self._finish(tick_id, due, self.dispatch(tick_id, due))
+            return
+
+        with self._lock:
+            self.in_flight.update(due)
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._loop, name="advisory-worker", daemon=True)
+            self._thread.start()
+        self.requests.put((tick_id, dict(due)))
+
+    def collect(self, tick_id: int) -> List[Tuple[str, dict]]:
+        """
+        Returns (asset, advice) for every analysis completed since the last call.
+        Each advice is a copy carrying "requested_tick" and "staleness_ticks".
+        """
+        with self._lock:
+            done, self.completed = self.completed, []
+
+        results = []
+        for requested, asset, advice in done:
+            advice = dict(advice)
+            advice["requested_tick"] = requested
+            advice["staleness_ticks"] = tick_id - requested
+            results.append((asset, advice))
+        return results
+
+    def is_pending(self, asset: str) -> bool:
+        with self._lock:
+            return asset in self.in_flight
+
+    def stop(self, timeout: float = None):
+        """Stops the worker after the requests already queued have been processed."""
+        if self._thread is None:
+            return
+        self.requests.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _loop(self):
+        while True:
+            item = self.requests.get()
+            if item is None:
+                return
+            tick_id, due = item
+            try:
+                results = self.dispatch(tick_id, due)
+            except Exception as e:
+                print(f"Advisory Worker Error for {list(due)}: {e}")
+                results = {}
+            self._finish(tick_id, due, results)
+
+    def _finish(self, tick_id: int, due: Dict[str, str], results: Dict[str, dict]):
+        with self._lock:
+            for asset in due:
+                advice = results.get(asset) or {"outlook": "NEUTRAL", "confidence": 0.0, "reasoning": "Error in analysis"}
+                self.completed.append((tick_id, asset, advice))
+                self.in_flight.discard(asset)
@@ -0,0 +1,178 @@
+# simulation/cache.py
+
+import os
+import json
+import time
+import threading
+import pandas as pd
+from typing import Callable, Dict, Optional
+from datetime import datetime, timezone
+from config import config
+from simulation.loader import PermanentFetchError
+
+Fetcher = Callable[[str, datetime, datetime], pd.DataFrame]
+
+class MarketDataCache:
+    """
+    Persistent on-disk cache for downloaded candles.
+    One Parquet file per (symbol, interval) holds the union of every range fetched
+    so far; a JSON manifest records the covered [start, end] window, so overlapping
+    requests only download the missing head/tail. Files are evicted least-recently
+    used first once the cache grows past max_bytes.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, root: str = None, max_bytes: int = None, ttl_seconds: int = None, offline: bool = None):
+        self.root = root if root is not None else config.MARKET_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else config.MARKET_CACHE_MAX_MB * 1024 * 1024
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else config.MARKET_CACHE_TTL_SECONDS
+        self.offline = offline if offline is not None else config.MARKET_CACHE_OFFLINE
+        self.manifest: Dict[str, Dict] = self._read_manifest()
+        # Downloads run outside the lock; only manifest/file bookkeeping is serialized.
+        self._lock = threading.RLock()
+
+    # --- Public API ---
+
+    def get(self, symbol: str, interval: str, start: datetime, end: datetime, fetch: Fetcher) -> pd.DataFrame:
+        """
+        Returns candles for [start, end], downloading only what the cache does not cover.
+        """
+        start, end = self._utc(start), self._utc(end)
+        key = self._key(symbol, interval)
+        entry = self.manifest.get(key)
+        cached = self._read_entry(entry)
+
+        if cached is None:
+            if self.offline:
+                raise PermanentFetchError(f"{symbol} ({interval}) is not in the offline market cache")
+            df = fetch(symbol, start, end)
+            if df.empty:
+                return df
+            self._write_entry(key, df, start, end)
+            return self._slice(df, start, end)
+
+        cov_start = datetime.fromisoformat(entry["start"])
+        cov_end = datetime.fromisoformat(entry["end"])
+        parts = [cached]
+
+        if not self.offline:
+            if start < cov_start:
+                head = fetch(symbol, start, cov_start)
+                if not head.empty:
+                    parts.insert(0, head)
+                    cov_start = start
+            if end > cov_end and not self._is_fresh(entry):
+                tail = fetch(symbol, cov_end, end)
+                if not tail.empty:
+                    parts.append(tail)
+                    cov_end = end
+
+        if len(parts) > 1:
+            merged = self._merge(parts)
+            self._write_entry(key, merged, cov_start, cov_end)
+        else:
+            merged = cached
+            self._touch(key)
+
+        return self._slice(merged, start, end)
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return sum(e.get("bytes", 0) for e in self.manifest.values())
+
+    # --- Internals ---
+
+    @staticmethod
+    def _key(symbol: str, interval: str) -> str:
+        return f"{symbol}|{interval}"
+
+    @staticmethod
+    def _utc(dt: datetime) -> datetime:
+        # Naive datetimes (e.g. datetime.now()) are treated as local time.
+        return dt.astimezone(timezone.utc)
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return (time.time() - entry.get("fetched_at", 0.0)) < self.ttl_seconds
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.root, filename)
+
+    def _read_manifest(self) -> Dict[str, Dict]:
+        path = self._path(self.MANIFEST)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"WARN Market cache manifest unreadable, starting empty: {e}")
+            return {}
+
+    def _write_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = self._path(self.MANIFEST + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, self._path(self.MANIFEST))
+
+    def _read_entry(self, entry: Optional[Dict]) -> Optional[pd.DataFrame]:
+        if not entry:
+            return None
+        path = self._path(entry["file"])
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"WARN Corrupt cache file {entry['file']}, refetching: {e}")
+            return None
+
+    def _write_entry(self, key: str, df: pd.DataFrame, start: datetime, end: datetime):
+        with self._lock:
+            os.makedirs(self.root, exist_ok=True)
+            filename = key.replace("|", "__").replace("/", "_") + ".parquet"
+            df.to_parquet(self._path(filename), index=False)
+
+            now = time.time()
+            self.manifest[key] = {
+                "file": filename,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "fetched_at": now,
+                "last_access": now,
+                "bytes": os.path.getsize(self._path(filename))
+            }
+            self._evict(keep=key)
+            self._write_manifest()
+
+    def _touch(self, key: str):
+        with self._lock:
+            self.manifest[key]["last_access"] = time.time()
+            self._write_manifest()
+
+    def _evict(self, keep: str):
+        """Drops least-recently-accessed files until the cache fits in max_bytes."""
+        by_age = sorted((e["last_access"], k) for k, e in self.manifest.items() if k != keep)
+        for _, key in by_age:
+            if self.size_bytes() <= self.max_bytes:
+                break
+            entry = self.manifest.pop(key)
+            try:
+                os.remove(self._path(entry["file"]))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _merge(parts) -> pd.DataFrame:
+        merged = pd.concat(parts, ignore_index=True)
+        merged = merged.drop_duplicates(subset="datetime", keep="last")
+        return merged.sort_values("datetime").reset_index(drop=True)
+
+    @staticmethod
+    def _slice(df: pd.DataFrame, start: datetime, end: datetime) -> pd.DataFrame:
+        ts = pd.to_datetime(df["datetime"])
+        if ts.dt.tz is None:
+            ts = ts.dt.tz_localize("UTC")
+        mask = (ts >= pd.Timestamp(start)) & (ts <= pd.Timestamp(end))
+        return df.loc[mask].reset_index(drop=True)
@@ -3,38 +3,60 @@
 import time
 import json
 import logging
+import numpy as np
 import pandas as pd
-from typing import Dict, List
+from typing import Dict, List, Optional
 from config import config
 from sqlmodel import Session, select
 from database.db import engine, init_db
-from database.models import SimulationRun, MarketData, LLMAdvice, PortfolioState, Order
+from database.models import SimulationRun, PortfolioState, Order, RiskSnapshot, LLMAdvice
+from database.unit_of_work import TickBatch
+from database.writer import BackgroundWriter
+from database.profile import PersistenceProfile
 
 from simulation.market import MarketReplay
+from simulation.store import TickStore
+from simulation.panel import IndicatorPanel
+from simulation.advisory import AdvisoryWorker
 from agents.quant import QuantAgent
 from agents.analyst import AnalystAgent
-from utils.arbiter import DecisionArbiter
-from utils.allocator import CapitalAllocator
+from utils.advice import Advice
+from utils.arbiter import DecisionArbiter, VectorArbiter, LazyDecayArbiter
+from utils.allocator import CapitalAllocator, VectorAllocator, ERCAllocator
+from utils.risk import RollingVolatility, EWMACovariance, observed_returns
+from utils.triggers import AnalystTrigger
 
 class SimulationEngine:
     def __init__(self, load_data=True):
         print(f"[INIT] Initializing {config.PROJECT_NAME} v{config.VERSION}")
         self.run_id = config.RUN_ID
         print(f"[ID] Run ID: {self.run_id}")
+        self.profile = PersistenceProfile()
         
-        if load_data:
+        if load_data and self.profile.run_record:
             init_db()
             self._start_run_record()
         
         self.market = MarketReplay(assets=config.ASSET_UNIVERSE, days=config.HISTORY_DAYS, load_data=load_data)
         self.quant = QuantAgent()
         self.analyst = AnalystAgent()
-        self.arbiter = DecisionArbiter(config.CONFIDENCE_THRESHOLD)
-        self.allocator = CapitalAllocator()
+        arbiter_cls = {"vectorized": VectorArbiter, "lazy": LazyDecayArbiter}.get(config.ARBITER_MODE, DecisionArbiter)
+        self.arbiter = arbiter_cls(config.CONFIDENCE_THRESHOLD)
+        self.allocator = {"vectorized": VectorAllocator, "erc": ERCAllocator}.get(config.ALLOCATOR_MODE, CapitalAllocator)()
+        self.panel: Optional[IndicatorPanel] = None
+        self.rolling_vol: Optional[RollingVolatility] = None
+        self.vol_assets: List[str] = []
+        self.covariance: Optional[EWMACovariance] = None
+        self.cov_assets: List[str] = []
+        self.cov_last_prices: Optional[np.ndarray] = None
         
         self.tick_id = 0
         self.portfolio = self._init_portfolio()
-        self.last_analyst_call = {} # {asset: tick_id}
+        self.batch = TickBatch() # Rows of the current tick, written in one transaction
+        self.writer = BackgroundWriter(self._write_batch)
+        self.trigger = AnalystTrigger()
+        self.last_analyst_call = self.trigger.last_call # {asset: tick_id}
+        self.advisory = AdvisoryWorker(self._dispatch_analyst)
 
     def _start_run_record(self):
         with Session(engine) as session:
@@ -55,19 +77,37 @@ class SimulationEngine:
         }
 
     def _persist_portfolio(self):
+        self.batch.add(PortfolioState, {
+            "run_id": self.run_id,
+            "tick_id": self.tick_id,
+            "balance": self.portfolio["balance"],
+            "holdings": dict(self.portfolio["holdings"]),
+            "total_equity": self.portfolio["total_equity"],
+            "max_drawdown": self.portfolio["max_drawdown"]
+        })
+
+    def _flush_tick(self):
+        """Hands every row of the tick (market data, advice, orders, portfolio) to the writer."""
+        self.writer.submit(self.batch)
+
+    def _persist_summary(self):
+        """Final portfolio state of a "summary" run."""
+        self.batch = TickBatch()
+        self._persist_portfolio()
+        self._flush_tick()
+
+    def _write_batch(self, batch: TickBatch):
+        """One transaction per batch; runs on the writer thread in background mode."""
         with Session(engine) as session:
-            state = PortfolioState(
-                run_id=self.run_id,
-                tick_id=self.tick_id,
-                balance=self.portfolio["balance"],
-                holdings=self.portfolio["holdings"],
-                total_equity=self.portfolio["total_equity"],
-                max_drawdown=self.portfolio["max_drawdown"]
-            )
-            session.add(state)
+            batch.flush(session)
             session.commit()
 
     def run_tick(self):
+        # Unit of work for this tick; MarketReplay queues its MarketData rows here too
+        self.batch = TickBatch()
+        self.market.batch = self.batch
+        self.market.persist = self.profile.market_data(self.market.current_tick_id + 1) # Tick about to be replayed
+        
         # 1. Market Data
         tick_data = self.market.tick()
         if not tick_data:
@@ -78,74 +118,202 @@ class SimulationEngine:
         # 2. Portfolio Valuation
         self._update_valuation(tick_data)
         
+        # Rolling Volatility (streaming, O(1) per asset per tick); also feeds the analyst triggers
+        vols = self._volatilities(tick_data)
+        vol_of = {a: v for a, v, warm in zip(self.market.assets, vols.tolist(), self._volatility_warm()) if warm}
+        
         # 3. Advisory Layer (Deterministic + AI)
         all_advice = []
+        due = {} # {asset: context} for analyst calls dispatched this tick
+        reasons = {} # {asset: trigger reason} before the per-tick budget
+        scheduler = self.trigger.scheduler
+        scheduler.register(self.market.assets, self.tick_id)
+        if config.ANALYST_PRIORITY == "volatility" and vol_of:
+            scheduler.set_priorities(vol_of)
+        quant_advice = self._run_quant(tick_data)
         for asset, candle in tick_data.items():
             # Quant Analysis (Deterministic)
-            history = self.market.data[asset].iloc[:self.market.current_index]
-            q_advice = self.quant.run(asset, history)
+            q_advice = quant_advice[asset]
             
-            # Persist Quant Advice
-            advice_obj = LLMAdvice(
-                run_id=self.run_id,
-                tick_id=self.tick_id,
-                asset=asset,
-                advisor_name="Quant",
-                outlook=q_advice["outlook"],
-                confidence=q_advice["confidence"],
-                rationale=q_advice["reasoning"],
-                raw_response=q_advice
-            )
-            all_advice.append(advice_obj)
+            # Quant Advice (lightweight record; ORM rows are built at persistence time)
+            all_advice.append(Advice(
+                self.tick_id, asset, "Quant",
+                q_advice["outlook"], q_advice["confidence"], q_advice["reasoning"], q_advice
+            ))
             
-            # LLM Analysis (Advisory) - Limited by cooldown
-            last_call = self.last_analyst_call.get(asset, -config.LLM_COOLDOWN_TICKS)
-            if (self.tick_id - last_call) >= config.LLM_COOLDOWN_TICKS:
-                a_advice = self.analyst.run(asset, context=f"Price: {candle['price']}")
-                self.last_analyst_call[asset] = self.tick_id
-                all_advice.append(LLMAdvice(
-                    run_id=self.run_id,
-                    tick_id=self.tick_id,
-                    asset=asset,
-                    advisor_name="LLM_Analyst",
-                    outlook=a_advice.get("outlook", "NEUTRAL"),
-                    confidence=a_advice.get("confidence", 0.0),
-                    rationale=a_advice.get("reasoning", a_advice.get("rationale", "No rationale")),
-                    raw_response=a_advice
-                ))
+            # LLM Analysis (Advisory) - Scheduled cooldown floor, then price/volatility triggers
+            reason = self.trigger.due(asset, self.tick_id, candle["price"], vol_of.get(asset))
+            if reason and not self.advisory.is_pending(asset):
+                reasons[asset] = reason
+
+        # Per-tick call budget; deferred assets stay due and go first next tick
+        for asset in scheduler.select(list(reasons), self.tick_id):
+            price = tick_data[asset]["price"]
+            due[asset] = f"Price: {price}"
+            self.trigger.record_call(asset, self.tick_id, price, vol_of.get(asset), reasons[asset])
+
+        # Analyses run through the advisory worker; in background mode they land on a later tick
+        self.advisory.submit(self.tick_id, due)
+        for asset, a_advice in self.advisory.collect(self.tick_id):
+            all_advice.append(Advice(
+                self.tick_id, asset, "LLM_Analyst",
+                a_advice.get("outlook", "NEUTRAL"),
+                a_advice.get("confidence", 0.0),
+                a_advice.get("reasoning", a_advice.get("rationale", "No rationale")),
+                a_advice
+            ))
 
         # 4. Arbitration & Allocation (The Math Core)
         sentiment_scores = self.arbiter.aggregate_advice(all_advice)
-        
-        # Calculate Rolling Volatility (Simple proxy for allocator)
-        vols = {}
-        for asset in self.market.assets:
-            history = self.market.data[asset].iloc[max(0, self.market.current_index-20):self.market.current_index]
-            if len(history) > 1:
-                vols[asset] = float(history['close'].pct_change().std())
-            else:
-                vols[asset] = 0.02 # default 2%
+        correlation = self._correlation(tick_data)
                 
         target_allocations = self.allocator.allocate(
-            sentiment_scores, vols, self.portfolio["total_equity"]
+            sentiment_scores, vols, self.portfolio["total_equity"],
+            assets=self.market.assets, correlation=correlation
         )
         
         # 5. Execution (Rebalance to target)
-        self._execute_rebalance(target_allocations, tick_data)
+        fills = self._execute_rebalance(target_allocations, tick_data)
         
-        # 6. Persistence
-        with Session(engine) as session:
-            for adv in all_advice:
-                session.add(adv)
-            session.commit()
+        # 6. Persistence (rows selected by the PERSIST_PROFILE)
+        for adv in all_advice:
+            if self.profile.advice(self.tick_id, adv.advisor_name):
+                self.batch.add(LLMAdvice, adv.values(self.run_id))
+        snapshot = self._risk_snapshot() if self.profile.risk() else None
+        if snapshot is not None:
+            self.batch.add_object(snapshot)
             
-        self._persist_portfolio()
+        if self.profile.portfolio(self.tick_id, traded=bool(fills)):
+            self._persist_portfolio()
+        self._flush_tick()
         
         if self.tick_id % 10 == 0:
             print(f"TICK {self.tick_id:4} | Equity: ${self.portfolio['total_equity']:,.2f} | Drawdown: {self.portfolio['max_drawdown']:.2%}")
             
         return True
 
+    def _replay_store(self) -> Optional[TickStore]:
+        # Replay markets expose the columnar store; live feeds and test doubles do not
+        if isinstance(self.market, MarketReplay):
+            return self.market.store
+        return None
+
+    def _indicator_panel(self) -> Optional[IndicatorPanel]:
+        """Whole-run indicator panel, built once on first use in precomputed mode."""
+        store = self._replay_store()
+        if config.INDICATOR_MODE != "precomputed" or store is None:
+            return None
+        if self.panel is None or self.panel.store is not store:
+            self.panel = IndicatorPanel.build(store)
+        return self.panel
+
+    def _run_quant(self, tick_data) -> Dict[str, dict]:
+        panel = self._indicator_panel()
+        store = self._replay_store()
+        if panel is not None:
+            batch = panel.batch(self.market.current_index - 1)
+        elif config.QUANT_BATCH and store is not None:
+            # Score the whole universe in one vectorized pass
+            batch = self.quant.run_batch(self.market.assets, store.close[:self.market.current_index],
+                                         store.stale[:self.market.current_index])
+        else:
+            return {
+                asset: self.quant.run(asset, self.market.data[asset].iloc[:self.market.current_index])
+                for asset in tick_data
+            }
+        return {asset: self.quant.batch_advice(batch, j) for j, asset in enumerate(self.market.assets)}
+
+    def _dispatch_analyst(self, tick_id: int, due: Dict[str, str]) -> Dict[str, dict]:
+        self.analyst.tick_id = tick_id
+        return self._run_analyst(due)
+
+    def _run_analyst(self, due: Dict[str, str]) -> Dict[str, dict]:
+        """
+        Runs every due analyst call: batched into multi-asset prompts when ANALYST_BATCH_SIZE > 1,
+        otherwise one call per asset, concurrently unless ANALYST_ASYNC is off or only one is due.
+        """
+        if config.ANALYST_BATCH_SIZE > 1 and len(due) > 1:
+            return self.analyst.run_batch(due)
+        if config.ANALYST_ASYNC and len(due) > 1:
+            return self.analyst.run_many(due)
+        return {asset: self.analyst.run(asset, context=context) for asset, context in due.items()}
+
+    def _volatilities(self, tick_data) -> np.ndarray:
+        """Rolling volatility vector aligned with self.market.assets."""
+        panel = self._indicator_panel()
+        if panel is not None:
+            return panel.volatility[self.market.current_index - 1]
+
+        assets = list(self.market.assets)
+        if self.rolling_vol is None or assets != self.vol_assets:
+            self.rolling_vol = RollingVolatility(len(assets))
+            self.vol_assets = assets
+        return self.rolling_vol.update(self._tick_prices(tick_data), self._tick_stale(tick_data))
+
+    def _volatility_warm(self) -> np.ndarray:
+        """Per-asset mask: volatility is measured from real returns rather than the default placeholder."""
+        if self.panel is not None:
+            return self.panel.warm[self.market.current_index - 1]
+        if self.rolling_vol is None:
+            return np.zeros(len(self.market.assets), dtype=bool)
+        return self.rolling_vol.warm
+
+    def _correlation(self, tick_data) -> Optional[np.ndarray]:
+        """
+        EWMA correlation matrix aligned with self.market.assets. None when disabled or while
+        fewer than two assets are warm; assets still warming up are treated as uncorrelated.
+        """
+        if not config.CORRELATION_AWARE:
+            return None
+
+        assets = list(self.market.assets)
+        if self.covariance is None or assets != self.cov_assets:
+            self.covariance = EWMACovariance(len(assets))
+            self.cov_assets = assets
+            self.cov_last_prices = None
+
+        first = self.cov_last_prices is None
+        returns, observed, self.cov_last_prices = observed_returns(
+            self._tick_prices(tick_data), self.cov_last_prices, self._tick_stale(tick_data)
+        )
+        if not first:
+            self.covariance.update(returns, observed)
+
+        warm = self.covariance.warm
+        if warm.sum() < 2:
+            return None # A few seeded returns make every pair look perfectly (anti-)correlated
+        correlation = self.covariance.correlation
+        correlation[~warm, :] = 0.0
+        correlation[:, ~warm] = 0.0
+        np.fill_diagonal(correlation, 1.0)
+        return correlation
+
+    def _tick_prices(self, tick_data) -> np.ndarray:
+        store = self._replay_store()
+        if store is not None:
+            return store.close[self.market.current_index - 1] # Zero-copy row view
+        return np.array([tick_data[asset]["price"] for asset in self.market.assets], dtype=np.float64)
+
+    def _tick_stale(self, tick_data) -> np.ndarray:
+        """Assets without a fresh print on this tick (forward-filled prices)."""
+        store = self._replay_store()
+        if store is not None:
+            return store.stale[self.market.current_index - 1]
+        return np.array([tick_data[asset].get("stale", False) for asset in self.market.assets], dtype=bool)
+
+    def _risk_snapshot(self) -> Optional[RiskSnapshot]:
+        """Sampled copy of the covariance state, every COVARIANCE_PERSIST_EVERY ticks."""
+        every = config.COVARIANCE_PERSIST_EVERY
+        if self.covariance is None or every <= 0 or self.tick_id % every != 0:
+            return None
+        return RiskSnapshot(
+            run_id=self.run_id,
+            tick_id=self.tick_id,
+            assets=self.cov_assets,
+            volatility=self.covariance.volatility.tolist(),
+            correlation=self.covariance.correlation.tolist()
+        )
+
     def _update_valuation(self, tick_data):
         market_value = 0.0
         for asset, candle in tick_data.items():
@@ -158,40 +326,46 @@ class SimulationEngine:
             
         self.portfolio["max_drawdown"] = (self.portfolio["peak_equity"] - self.portfolio["total_equity"]) / self.portfolio["peak_equity"]
 
-    def _execute_rebalance(self, targets: Dict[str, float], prices: Dict[str, Dict]):
-        with Session(engine) as session:
-            for asset, target_usd in targets.items():
-                current_price = prices[asset]["price"]
-                current_holding_usd = self.portfolio["holdings"].get(asset, 0.0) * current_price
-                
-                diff_usd = target_usd - current_holding_usd
+    def _execute_rebalance(self, targets: Dict[str, float], prices: Dict[str, Dict]) -> int:
+        """Trades towards `targets`; returns the number of fills."""
+        fills = 0
+        for asset, target_usd in targets.items():
+            # No fresh print (market closed / data gap): hold the current position
+            if prices[asset].get("stale", False):
+                continue
+            current_price = prices[asset]["price"]
+            current_holding_usd = self.portfolio["holdings"].get(asset, 0.0) * current_price
+            
+            diff_usd = target_usd - current_holding_usd
+            
+            # Execution Threshold ($100 or ~0.1% of capital)
+            if abs(diff_usd) > 100:
+                qty = diff_usd / current_price
+                side = "BUY" if qty > 0 else "SELL"
+                qty = abs(qty)
                 
-                # Execution Threshold ($100 or ~0.1% of capital)
-                if abs(diff_usd) > 100:
-                    qty = diff_usd / current_price
-                    side = "BUY" if qty > 0 else "SELL"
-                    qty = abs(qty)
+                # Update Memory
+                if side == "BUY":
+                    self.portfolio["balance"] -= diff_usd
+                    self.portfolio["holdings"][asset] += qty
+                else:
+                    self.portfolio["balance"] += abs(diff_usd)
+                    self.portfolio["holdings"][asset] -= qty
                     
-                    # Update Memory
-                    if side == "BUY":
-                        self.portfolio["balance"] -= diff_usd
-                        self.portfolio["holdings"][asset] += qty
-                    else:
-                        self.portfolio["balance"] += abs(diff_usd)
-                        self.portfolio["holdings"][asset] -= qty
-                        
-                    # Persist Order
-                    print(f"TRADE | {side:4} | {asset:8} | Qty: {qty:10.4f} | @ ${current_price:10.2f}")
-                    session.add(Order(
-                        run_id=self.run_id,
-                        tick_id=self.tick_id,
-                        symbol=asset,
-                        side=side,
-                        quantity=qty,
-                        filled_price=current_price,
-                        status="FILLED"
-                    ))
-            session.commit()
+                # Persist Order
+                print(f"TRADE | {side:4} | {asset:8} | Qty: {qty:10.4f} | @ ${current_price:10.2f}")
+                fills += 1
+                if self.profile.orders():
+                    self.batch.add(Order, {
+                        "run_id": self.run_id,
+                        "tick_id": self.tick_id,
+                        "symbol": asset,
+                        "side": side,
+                        "quantity": qty,
+                        "filled_price": current_price,
+                        "status": "FILLED"
+                    })
+        return fills
 
     def start_loop(self):
         print("STARTING Portfolio Intelligence Loop.")
@@ -199,5 +373,17 @@ class SimulationEngine:
             while self.run_tick():
                 pass
             print("FINISHED Simulation Complete.")
+            stats = self.trigger.stats(self.analyst.cache.hits if self.analyst.cache is not None else 0)
+            print(f"LLM   | Analyst calls: {stats['calls']} (+{stats['cache_hits']} cached; cooldown-only: {stats['baseline_calls']}, saved {stats['saved_pct']:.1%}) | {stats['by_reason']}")
+            guard = self.analyst.guard_stats()
+            print(f"LLM   | Throttled: {guard['throttled']} | Rate-limited: {guard['rate_limited']} | Failed: {guard['failed']} | Breaker trips: {guard['tripped']} (skipped {guard['short_circuited']})")
         except KeyboardInterrupt:
             print("STOPPED Simulation Interrupted.")
+        finally:
+            self.advisory.stop(timeout=config.ANALYST_TIMEOUT_SECONDS)
+            self.analyst.close()
+            if self.profile.summary and self.tick_id > 0:
+                self._persist_summary()
+            self.writer.stop() # Graceful flush of every queued tick
+            db = self.writer.stats()
+            print(f"DB    | Ticks written: {db['ticks_written']} ({db['failed_ticks']} failed) | Flushes: {db['flushes']} (avg {db['flush_ms_avg']:.1f}ms, max {db['flush_ms_max']:.1f}ms) | Max queue depth: {db['max_queue_depth']} | Backpressure waits: {db['blocked']} ({db['blocked_seconds']:.2f}s) | Dropped MarketData rows: {db['dropped_rows']}")
@@ -0,0 +1,106 @@
+# simulation/loader.py
+
+import time
+import threading
+import pandas as pd
+from typing import Callable, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from config import config
+
+class PermanentFetchError(RuntimeError):
+    """A fetch failure that retrying cannot fix (e.g. a miss in the offline market cache)."""
+
+class ParallelLoader:
+    """
+    Fetches many symbols concurrently on a bounded thread pool.
+    Each attempt gets its own timeout; failed attempts are retried with
+    exponential backoff. Backoff is waited out by the scheduling loop, not on a
+    worker, so other symbols keep loading meanwhile. Empty results and
+    PermanentFetchError fail at once, since a retry returns the same. Symbols
+    that fail are reported back instead of aborting the load, and results are
+    always keyed in input order so the output does not depend on completion order.
+    """
+
+    POLL_SECONDS = 0.01
+
+    def __init__(self, fetch: Callable[[str], pd.DataFrame], max_workers: int = None,
+                 timeout: float = None, retries: int = None, backoff: float = None):
+        self.fetch = fetch
+        self.max_workers = max_workers if max_workers is not None else config.DATA_LOAD_WORKERS
+        self.timeout = timeout if timeout is not None else config.DATA_LOAD_TIMEOUT_SECONDS
+        self.retries = retries if retries is not None else config.DATA_LOAD_RETRIES
+        self.backoff = backoff if backoff is not None else config.DATA_LOAD_BACKOFF_SECONDS
+
+    def load(self, symbols: List[str]) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        """
+        Returns (frames, failures): frames in the order of `symbols`, and a map of
+        symbol -> reason for every symbol that could not be loaded.
+        """
+        frames: Dict[str, pd.DataFrame] = {}
+        failures: Dict[str, str] = {}
+        attempts = {s: 0 for s in symbols}
+        started: Dict[Tuple[str, int], float] = {}
+        lock = threading.Lock()
+        pending = {}
+        delayed: List[Tuple[float, str]] = [] # (due time, symbol) retries waiting out their backoff
+
+        pool = ThreadPoolExecutor(max_workers=max(1, self.max_workers), thread_name_prefix="market-loader")
+
+        def job(symbol: str, attempt: int) -> pd.DataFrame:
+            with lock:
+                started[(symbol, attempt)] = time.monotonic()
+            return self.fetch(symbol)
+
+        def submit(symbol: str):
+            attempts[symbol] += 1
+            future = pool.submit(job, symbol, attempts[symbol])
+            pending[future] = (symbol, attempts[symbol])
+
+        def retry_or_fail(symbol: str, reason: str):
+            if attempts[symbol] <= self.retries:
+                delayed.append((time.monotonic() + self.backoff * 2 ** (attempts[symbol] - 1), symbol))
+            else:
+                failures[symbol] = reason
+
+        try:
+            for symbol in symbols:
+                submit(symbol)
+
+            while pending or delayed:
+                now = time.monotonic()
+                for due, symbol in [item for item in delayed if item[0] <= now]:
+                    delayed.remove((due, symbol))
+                    submit(symbol)
+                if not pending:
+                    time.sleep(self.POLL_SECONDS)
+                    continue
+
+                done, _ = wait(list(pending), timeout=self.POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    symbol, _ = pending.pop(future)
+                    try:
+                        df = future.result()
+                    except PermanentFetchError as e:
+                        failures[symbol] = str(e)
+                        continue
+                    except Exception as e:
+                        retry_or_fail(symbol, f"{type(e).__name__}: {e}")
+                        continue
+                    if df is None or df.empty:
+                        failures[symbol] = "no data returned"
+                    else:
+                        frames[symbol] = df
+
+                # Abandon attempts that overran their timeout (the worker thread is left to finish on its own)
+                now = time.monotonic()
+                with lock:
+                    overdue = [f for f, key in pending.items() if key in started and now - started[key] > self.timeout]
+                for future in overdue:
+                    symbol, _ = pending.pop(future)
+                    future.cancel()
+                    retry_or_fail(symbol, f"timed out after {self.timeout}s")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        ordered = {s: frames[s] for s in symbols if s in frames}
+        return ordered, {s: failures[s] for s in symbols if s in failures}
@@ -1,45 +1,159 @@
 # simulation/market.py
 
 import time
-import os
-import sys
+import logging
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from typing import Dict, Optional, List
 from sqlmodel import Session
 from database.db import engine
 from database.models import MarketData
+from database.unit_of_work import TickBatch
 from config import config
+from simulation.store import TickStore, TickRow
+from simulation.cache import MarketDataCache
+from simulation.loader import ParallelLoader
 from datetime import datetime, timedelta
-from contextlib import contextmanager
+
+# yfinance reports failed downloads through its logger. Downloads run on loader
+# threads, so they are quieted here rather than by swapping sys.stdout/stderr.
+logging.getLogger("yfinance").setLevel(logging.CRITICAL)
 
 class MarketReplay:
     def __init__(self, assets: List[str], days=30, interval="5m", load_data=True):
         self.assets = assets
         self.interval = interval
         self.data: Dict[str, pd.DataFrame] = {}
+        self.store: Optional[TickStore] = None
+        self.stale: Optional[np.ndarray] = None  # (ticks x assets) no fresh print at this tick
+        self.cache = MarketDataCache() if config.MARKET_CACHE_ENABLED else None
         self.current_index = 0
         self.current_tick_id = 0
+        self.load_failures: Dict[str, str] = {}
+        self.batch: Optional[TickBatch] = None # When set, tick() queues MarketData rows here instead of committing them
+        self.persist = True # Off: MarketData rows are not built at all
         if load_data:
             self._load_all_data(days)
 
     def _load_all_data(self, days: int):
         print(f"DATA Loading market data for {len(self.assets)} assets...")
-        for asset in self.assets:
-            self.data[asset] = self._fetch_asset_data(asset, days)
+        loader = ParallelLoader(lambda symbol: self._fetch_asset_data(symbol, days))
+        frames, self.load_failures = loader.load(self.assets)
+        for symbol, reason in self.load_failures.items():
+            print(f"WARN Dropping {symbol} from the universe: {reason}")
+
+        self.assets = [a for a in self.assets if a in frames]
+        self.data = frames
+        if not self.assets:
+            print("WARN No market data could be loaded.")
+            self.build_store()
+            return
         
-        # Align indexes to the shortest common length
-        min_len = min(len(df) for df in self.data.values())
-        for asset in self.assets:
-            self.data[asset] = self.data[asset].iloc[:min_len]
-        print(f"SYNC Market data synchronized. Timeline length: {min_len} ticks.")
+        self._align_data()
+        print(f"SYNC Market data synchronized. Timeline length: {len(self.store)} ticks.")
+
+    def _align_data(self):
+        """
+        Reindexes every asset onto one master UTC timeline (the union of all
+        timestamps) and forward-fills in a single vectorized pass. Ticks where an
+        asset had no fresh, valid print (market closed, gap, bad price) are flagged
+        in self.stale so the engine can hold those positions. Builds the store.
+        """
+        stamps, closes, volumes, columns = [], [], [], []
+        for j, asset in enumerate(self.assets):
+            df = self.data[asset]
+            stamps.append(TickStore._timestamp_vector(df, len(df)))
+            closes.append(pd.to_numeric(df['close'], errors="coerce").to_numpy(dtype=np.float64))
+            volume = df['volume'] if 'volume' in df.columns else pd.Series(0.0, index=df.index)
+            volumes.append(pd.to_numeric(volume, errors="coerce").fillna(0.0).to_numpy(dtype=np.float64))
+            columns.append(np.full(len(df), j))
+
+        stamps, closes = np.concatenate(stamps), np.concatenate(closes)
+        volumes, columns = np.concatenate(volumes), np.concatenate(columns)
+
+        timeline = np.unique(stamps)
+        rows = np.searchsorted(timeline, stamps)
+        # Duplicate timestamps within an asset: keep the last print
+        cell = rows * len(self.assets) + columns
+        _, last = np.unique(cell[::-1], return_index=True)
+        keep = len(cell) - 1 - last
+        rows, columns, closes, volumes = rows[keep], columns[keep], closes[keep], volumes[keep]
+
+        n_ticks, n_assets = len(timeline), len(self.assets)
+        close = np.full((n_ticks, n_assets), np.nan)
+        volume = np.zeros((n_ticks, n_assets))
+        close[rows, columns] = np.where(closes > 0, closes, np.nan)
+        volume[rows, columns] = volumes
+        observed = ~np.isnan(close)
+
+        alive = observed.any(axis=0)
+        for asset in [a for a, ok in zip(self.assets, alive) if not ok]:
+            print(f"WARN Dropping {asset} from the universe: no valid prices")
+            self.load_failures[asset] = "no valid prices"
+        self.assets = [a for a, ok in zip(self.assets, alive) if ok]
+        if not self.assets:
+            self.data = {}
+            self.store = TickStore([], np.empty((0, 0)), np.empty((0, 0)), np.empty(0, dtype=np.int64))
+            return
+        close, volume, observed = close[:, alive], volume[:, alive], observed[:, alive]
+
+        # Forward-fill: each cell takes the value at the last row where its asset printed
+        last_print = np.maximum.accumulate(np.where(observed, np.arange(n_ticks)[:, None], 0), axis=0)
+        close = np.take_along_axis(close, last_print, axis=0)
+        volume = np.where(observed, volume, 0.0)
+
+        # Start once every asset has printed, so nothing is back-filled from the future
+        start = int(observed.argmax(axis=0).max())
+        close, volume, stale = close[start:], volume[start:], ~observed[start:]
+        timeline = timeline[start:]
+
+        index = pd.DatetimeIndex(timeline.view("datetime64[ns]")).tz_localize("UTC")
+        self.data = {
+            asset: pd.DataFrame({"datetime": index, "close": close[:, j], "volume": volume[:, j], "stale": stale[:, j]})
+            for j, asset in enumerate(self.assets)
+        }
+        self.stale = stale
+        self.store = TickStore(self.assets, close, volume, timeline, stale)
+
+    @property
+    def data(self) -> Dict[str, pd.DataFrame]:
+        return self._data
+
+    @data.setter
+    def data(self, frames: Dict[str, pd.DataFrame]):
+        # Replacing the frames invalidates the columnar store; it is rebuilt lazily on the next tick.
+        self._data = frames
+        self.store = None
+        self.stale = None
+
+    def build_store(self) -> TickStore:
+        """Builds the columnar (ticks x assets) store from the loaded frames."""
+        self.store = TickStore.from_frames(self.assets, self.data, stale=self.stale)
+        return self.store
+
+    def row_view(self, index: Optional[int] = None) -> Optional[TickRow]:
+        """
+        Zero-copy array view of a tick. Defaults to the most recently emitted tick.
+        """
+        if self.store is None:
+            return None
+        index = self.current_index - 1 if index is None else index
+        if index < 0 or index >= len(self.store):
+            return None
+        return self.store.row(index)
 
     def _fetch_asset_data(self, symbol: str, days: int) -> pd.DataFrame:
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        if self.cache is not None:
+            return self.cache.get(symbol, self.interval, start_date, end_date, self._download)
+        return self._download(symbol, start_date, end_date)
+
+    def _download(self, symbol: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            with self.suppress_output():
-                df = yf.download(symbol, start=start_date, end=end_date, interval=self.interval, progress=False)
+            df = yf.download(symbol, start=start_date, end=end_date, interval=self.interval,
+                             progress=False, timeout=config.DATA_LOAD_TIMEOUT_SECONDS)
             
             if not df.empty:
                 # Flatten MultiIndex if present (yfinance v0.2.x+ behavior)
@@ -48,71 +162,62 @@ class MarketReplay:
                 
                 df.reset_index(inplace=True)
                 df.columns = [str(c).lower() for c in df.columns]
+                # Daily bars come back indexed by 'date' rather than 'datetime'
+                df = df.rename(columns={"date": "datetime"})
                 return df
         except Exception as e:
             print(f"WARN Error fetching {symbol}: {e}")
         
         return pd.DataFrame()
 
-    @contextmanager
-    def suppress_output(self):
-        with open(os.devnull, "w") as devnull:
-            old_stdout, old_stderr = sys.stdout, sys.stderr
-            sys.stdout, sys.stderr = devnull, devnull
-            try:
-                yield
-            finally:
-                sys.stdout, sys.stderr = old_stdout, old_stderr
-
     def tick(self) -> Optional[Dict[str, Dict]]:
         """
         Move to next portfolio-wide tick.
         Returns a map of asset -> candle data.
         """
-        first_asset = self.assets[0]
-        if self.current_index >= len(self.data[first_asset]):
+        if self.store is None:
+            self.build_store()
+        if self.current_index >= len(self.store):
             return None
 
+        idx = self.current_index
+        close, volume, stale, _ = self.store.row(idx)
+        timestamp = self.store.timestamp(idx)
+
         portfolio_tick = {}
         self.current_tick_id += 1
         
-        with Session(engine) as session:
-            for asset in self.assets:
-                row = self.data[asset].iloc[self.current_index]
-                
-                # Robust Validation (Phase 14 Hardening)
-                price = float(row.get('close', 0.0))
-                volume = float(row.get('volume', 0.0))
-                
-                # Handle NaNs
-                if pd.isna(price) or price <= 0:
-                    # Try to use previous index price if available
-                    if self.current_index > 0:
-                        prev_row = self.data[asset].iloc[self.current_index - 1]
-                        price = float(prev_row['close'])
-                        print(f"WARN NaN/Invalid price for {asset} at idx {self.current_index}, forward-filling.")
-                    else:
-                        price = 0.01 # Safe floor
-                
-                candle = {
-                    "symbol": asset,
-                    "price": price,
-                    "volume": volume,
-                    "timestamp": row['datetime']
-                }
-                portfolio_tick[asset] = candle
-                
-                # Persistence
-                session.add(MarketData(
-                    run_id=config.RUN_ID,
-                    tick_id=self.current_tick_id,
-                    symbol=asset,
-                    price=candle['price'],
-                    volume=candle['volume'],
-                    timestamp=candle['timestamp']
-                ))
-            session.commit()
+        for j, asset in enumerate(self.assets):
+            portfolio_tick[asset] = {
+                "symbol": asset,
+                "price": float(close[j]),
+                "volume": float(volume[j]),
+                "timestamp": timestamp,
+                "stale": bool(stale[j])
+            }
+
+        # Persistence
+        if not self.persist:
+            self.current_index += 1
+            return portfolio_tick
+        rows = [
+            {
+                "run_id": config.RUN_ID,
+                "tick_id": self.current_tick_id,
+                "symbol": asset,
+                "price": candle["price"],
+                "volume": candle["volume"],
+                "timestamp": candle["timestamp"].to_pydatetime()
+            }
+            for asset, candle in portfolio_tick.items()
+        ]
+        if self.batch is not None:
+            for row in rows:
+                self.batch.add(MarketData, row)
+        else:
+            with Session(engine) as session:
+                session.add_all([MarketData(**row) for row in rows])
+                session.commit()
             
         self.current_index += 1
         return portfolio_tick
-
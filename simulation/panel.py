@@ -0,0 +1,46 @@
+# simulation/panel.py
+
+import numpy as np
+from typing import Dict
+from agents.quant import QuantAgent, BatchWilderRSI
+from simulation.store import TickStore
+from utils.risk import rolling_volatility_panel
+
+class IndicatorPanel:
+    """
+    Whole-run indicator panels for historical replays.
+    Built once from the TickStore; row t only uses closes[0..t] (the data the
+    engine has seen by tick t), so indexing into it is look-ahead safe. RSI runs
+    the incremental path's update code, so it is bit-identical; volatility is one
+    windowed pass over the whole return matrix and agrees with the streaming
+    values up to floating-point rounding.
+    """
+
+    def __init__(self, store: TickStore, rsi: np.ndarray, volatility: np.ndarray, warm: np.ndarray):
+        self.store = store
+        self.rsi = rsi
+        self.volatility = volatility
+        self.warm = warm # (ticks x assets) volatility measured from >= 2 real returns
+        self.history = np.cumsum(~store.stale, axis=0) # Real closes per asset up to each tick
+        self.outlook, self.confidence = QuantAgent.batch_signals(rsi, self.history)
+
+    @classmethod
+    def build(cls, store: TickStore, rsi_window: int = 14, vol_window: int = None) -> "IndicatorPanel":
+        n_ticks, n_assets = store.close.shape
+        volatility, warm = rolling_volatility_panel(store.close, store.stale, vol_window)
+
+        # Wilder smoothing is a recursion (each average feeds the next), so it stays a loop over ticks
+        rsi = np.empty((n_ticks, n_assets))
+        rsi_state = BatchWilderRSI(n_assets, rsi_window)
+        for t in range(n_ticks):
+            rsi[t] = rsi_state.update(store.close[t], store.stale[t])
+        return cls(store, rsi, volatility, warm)
+
+    def batch(self, index: int) -> Dict[str, np.ndarray]:
+        """Quant signals for one tick, shaped like QuantAgent.run_batch() output."""
+        return {
+            "outlook": self.outlook[index],
+            "confidence": self.confidence[index],
+            "rsi": self.rsi[index],
+            "history": self.history[index]
+        }
@@ -0,0 +1,80 @@
+# simulation/store.py
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, NamedTuple, Optional
+
+class TickRow(NamedTuple):
+    """Zero-copy view of one portfolio-wide tick (one entry per asset)."""
+    close: np.ndarray
+    volume: np.ndarray
+    stale: np.ndarray
+    timestamp: int
+
+class TickStore:
+    """
+    Columnar backing store for MarketReplay.
+    Holds aligned (ticks x assets) float64 matrices for close/volume, a matching
+    boolean stale mask and an int64 vector of UTC epoch nanoseconds, so a tick is
+    a plain index lookup. Prices are already repaired when the store is built.
+    """
+
+    def __init__(self, assets: List[str], close: np.ndarray, volume: np.ndarray,
+                 timestamps: np.ndarray, stale: Optional[np.ndarray] = None):
+        self.assets = list(assets)
+        self.asset_index = {asset: i for i, asset in enumerate(self.assets)}
+        self.close = close
+        self.volume = volume
+        self.timestamps = timestamps
+        self.stale = stale if stale is not None else np.zeros(close.shape, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_frames(cls, assets: List[str], frames: Dict[str, pd.DataFrame],
+                    stale: Optional[np.ndarray] = None) -> "TickStore":
+        """
+        Stacks per-asset frames column-wise. Frames are assumed to be aligned
+        by position (MarketReplay._align_data does this once after loading).
+        Any remaining NaN/non-positive prices are forward-filled here, in one
+        vectorized pass, and flagged stale.
+        """
+        n_ticks = min((len(frames[a]) for a in assets), default=0)
+        close = np.empty((n_ticks, len(assets)), dtype=np.float64)
+        volume = np.zeros((n_ticks, len(assets)), dtype=np.float64)
+        if n_ticks == 0:
+            return cls(assets, close, volume, np.empty(0, dtype=np.int64))
+
+        for j, asset in enumerate(assets):
+            df = frames[asset]
+            close[:, j] = pd.to_numeric(df['close'].iloc[:n_ticks], errors="coerce").to_numpy(dtype=np.float64)
+            if 'volume' in df.columns:
+                volume[:, j] = pd.to_numeric(df['volume'].iloc[:n_ticks], errors="coerce").fillna(0.0).to_numpy(dtype=np.float64)
+
+        invalid = ~(close > 0)
+        if invalid.any():
+            close = pd.DataFrame(np.where(invalid, np.nan, close)).ffill().to_numpy(dtype=np.float64, copy=True)
+            close[np.isnan(close)] = 0.01 # Safe floor before an asset's first valid print
+        stale = invalid if stale is None else (stale[:n_ticks] | invalid)
+
+        timestamps = cls._timestamp_vector(frames[assets[0]], n_ticks)
+        return cls(assets, close, volume, timestamps, stale)
+
+    @staticmethod
+    def _timestamp_vector(df: pd.DataFrame, n_ticks: int) -> np.ndarray:
+        if 'datetime' not in df.columns:
+            now = pd.Timestamp.now(tz="UTC").value
+            return np.full(n_ticks, now, dtype=np.int64)
+
+        ts = pd.DatetimeIndex(pd.to_datetime(df['datetime'].iloc[:n_ticks]))
+        if ts.tz is None:
+            ts = ts.tz_localize("UTC")
+        return ts.as_unit("ns").asi8.copy() # UTC epoch nanoseconds
+
+    def row(self, index: int) -> TickRow:
+        """Returns views (not copies) into the close/volume matrices."""
+        return TickRow(self.close[index], self.volume[index], self.stale[index], int(self.timestamps[index]))
+
+    def timestamp(self, index: int) -> pd.Timestamp:
+        return pd.Timestamp(int(self.timestamps[index]), tz="UTC")
@@ -30,3 +30,11 @@ def mock_llm_agent(monkeypatch, request):
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "live_api: mark test to run against real LLM API")
+    config.addinivalue_line("markers", "performance: wall-clock benchmark (skipped by the `all` audit)")
+
+def pytest_collection_modifyitems(config, items):
+    # Everything under tests/performance asserts on timings; tag it so CI's `all` run can deselect it
+    performance_dir = os.path.join(os.path.dirname(__file__), "performance")
+    for item in items:
+        if str(item.fspath).startswith(performance_dir):
+            item.add_marker(pytest.mark.performance)
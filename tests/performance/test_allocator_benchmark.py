@@ -0,0 +1,45 @@
+# tests/performance/test_allocator_benchmark.py
+
+"""
+TEST SUITE: Vectorized Allocator Benchmark
+OBJECTIVE: Compare per-tick allocation cost of the dict CapitalAllocator vs VectorAllocator from 10 to 5,000 assets.
+EXPECTED RESULT: The vector path (including water-filling) is faster from 100 assets up and scales far better.
+"""
+
+import time
+import pytest
+import numpy as np
+from utils.allocator import CapitalAllocator, VectorAllocator
+
+REPEATS = 20
+
+@pytest.mark.parametrize("n_assets", [10, 100, 1000, 5000])
+def test_allocator_scaling(n_assets):
+    """
+    OBJECTIVE: Time REPEATS allocations of random scores/vols with a binding 5% cap.
+    EXPECTED RESULT: VectorAllocator.allocate_vector beats the dict version at 100+ assets.
+    """
+    rng = np.random.default_rng(2)
+    assets = [f"SYM{j}" for j in range(n_assets)]
+    score_vec = rng.uniform(-1, 1, n_assets)
+    vols = rng.uniform(0.001, 0.05, n_assets)
+    scores = dict(zip(assets, score_vec.tolist()))
+    vol_map = dict(zip(assets, vols.tolist()))
+
+    legacy = CapitalAllocator(max_position_pct=0.05, reserve_pct=0.05)
+    vector = VectorAllocator(max_position_pct=0.05, reserve_pct=0.05)
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        legacy.allocate(scores, vol_map, 100000)
+    dict_time = (time.perf_counter() - start) / REPEATS
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        targets = vector.allocate_vector(score_vec, vols, 100000)
+    vector_time = (time.perf_counter() - start) / REPEATS
+
+    print(f"\nBENCH allocate @{n_assets:5d} assets: vector {vector_time * 1e3:.3f}ms | dict {dict_time * 1e3:.3f}ms")
+    assert targets.max() <= 0.05 * 0.95 * 100000 + 1e-6
+    if n_assets >= 100:
+        assert vector_time < dict_time
@@ -0,0 +1,37 @@
+# tests/performance/test_covariance_benchmark.py
+
+"""
+TEST SUITE: EWMA Covariance Benchmark
+OBJECTIVE: Measure the per-tick cost of the rank-one covariance update and correlation read-out.
+EXPECTED RESULT: Cost scales with N^2 and stays within a tick budget at 500 assets.
+"""
+
+import time
+import pytest
+import numpy as np
+from utils.risk import EWMACovariance
+
+TICKS = 200
+
+@pytest.mark.parametrize("n_assets", [10, 100, 500])
+def test_covariance_update_cost(n_assets):
+    """
+    OBJECTIVE: Time TICKS updates for 10, 100 and 500 assets.
+    EXPECTED RESULT: A 500-asset update + correlation stays under 20ms per tick.
+    """
+    rng = np.random.default_rng(2)
+    returns = rng.normal(0, 0.01, (TICKS, n_assets))
+    cov = EWMACovariance(n_assets)
+
+    start = time.perf_counter()
+    for r in returns:
+        cov.update(r)
+    update_per_tick = (time.perf_counter() - start) / TICKS
+
+    start = time.perf_counter()
+    for _ in range(20):
+        cov.correlation
+    corr_per_call = (time.perf_counter() - start) / 20
+
+    print(f"\nBENCH EWMA cov @{n_assets:4d} assets: update {update_per_tick * 1e3:.3f}ms | correlation {corr_per_call * 1e3:.3f}ms")
+    assert update_per_tick + corr_per_call < 0.02
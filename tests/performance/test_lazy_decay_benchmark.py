@@ -0,0 +1,41 @@
+# tests/performance/test_lazy_decay_benchmark.py
+
+"""
+TEST SUITE: Lazy Decay Arbiter Benchmark
+OBJECTIVE: Compare per-tick arbiter cost with sparse advice (10 signals per tick) as the remembered universe grows.
+EXPECTED RESULT: Lazy decay cost stays flat while the eager dict arbiter grows with the universe.
+"""
+
+import time
+import pytest
+from utils.advice import Advice
+from utils.arbiter import DecisionArbiter, LazyDecayArbiter
+
+TICKS = 50
+SIGNALS = 10
+
+@pytest.mark.parametrize("n_assets", [100, 1000, 10000])
+def test_lazy_decay_scaling(n_assets):
+    """
+    OBJECTIVE: Time TICKS ticks with SIGNALS advice each over n_assets remembered assets.
+    EXPECTED RESULT: Lazy arbiter is faster at every size above the signal count.
+    """
+    assets = [f"SYM{j}" for j in range(n_assets)]
+    ticks = [
+        [Advice(t, assets[(t * SIGNALS + k) % n_assets], "Quant", "BULLISH", 0.9, "", {}) for k in range(SIGNALS)]
+        for t in range(TICKS)
+    ]
+
+    timings = {}
+    for cls in (DecisionArbiter, LazyDecayArbiter):
+        arbiter = cls(confidence_threshold=0.6, smoothing_factor=0.3)
+        for asset in assets:
+            arbiter.sentiment_memory[asset] = 0.5
+        start = time.perf_counter()
+        for advice in ticks:
+            arbiter.aggregate_advice(advice)
+        timings[cls.__name__] = (time.perf_counter() - start) / TICKS
+
+    eager, lazy = timings["DecisionArbiter"], timings["LazyDecayArbiter"]
+    print(f"\nBENCH arbiter per tick @{n_assets:5d} assets, {SIGNALS} signals: lazy {lazy * 1e3:.3f}ms | eager {eager * 1e3:.3f}ms")
+    assert lazy < eager
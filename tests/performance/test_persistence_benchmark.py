@@ -0,0 +1,118 @@
+# tests/performance/test_persistence_benchmark.py
+
+"""
+TEST SUITE: Per-Tick Persistence Benchmark
+OBJECTIVE: Compare ticks/sec of the legacy write path (four sessions, row-by-row ORM adds, four commits)
+with the TickBatch unit of work (one transaction, one executemany INSERT per table).
+EXPECTED RESULT: The batched path sustains more ticks/sec on SQLite (file and in-memory) and on Postgres
+when BENCH_POSTGRES_URL points at a local server. With the write-behind BackgroundWriter, commits leave
+the tick path entirely.
+"""
+
+import os
+import time
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+from database.models import MarketData, LLMAdvice, Order, PortfolioState
+from database.unit_of_work import TickBatch
+from database.writer import BackgroundWriter
+
+TICKS = 100
+N_ASSETS = 10
+N_ORDERS = 3
+
+def make_db(kind, tmp_path):
+    if kind == "sqlite-file":
+        db = create_engine(f"sqlite:///{tmp_path / 'bench.db'}")
+    elif kind == "sqlite-memory":
+        db = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        url = os.getenv("BENCH_POSTGRES_URL")
+        if not url:
+            pytest.skip("BENCH_POSTGRES_URL not set")
+        db = create_engine(url)
+    SQLModel.metadata.drop_all(db)
+    SQLModel.metadata.create_all(db)
+    return db
+
+def tick_rows(tick_id):
+    """(market, advice, orders, portfolio) column dicts of one tick."""
+    stamp = datetime.now(timezone.utc)
+    assets = [f"SYM{j}" for j in range(N_ASSETS)]
+    market = [{"run_id": "bench", "tick_id": tick_id, "symbol": a, "price": 100.0 + j, "volume": 1e3, "timestamp": stamp}
+              for j, a in enumerate(assets)]
+    advice = [{"run_id": "bench", "tick_id": tick_id, "asset": a, "advisor_name": "Quant", "outlook": "BULLISH",
+               "confidence": 0.7, "rationale": "rsi", "raw_response": {"outlook": "BULLISH", "confidence": 0.7}}
+              for a in assets]
+    orders = [{"run_id": "bench", "tick_id": tick_id, "symbol": a, "side": "BUY", "quantity": 1.0,
+               "filled_price": 100.0, "status": "FILLED"} for a in assets[:N_ORDERS]]
+    portfolio = {"run_id": "bench", "tick_id": tick_id, "balance": 5e4, "holdings": {a: 1.0 for a in assets},
+                 "total_equity": 1e5, "max_drawdown": 0.0}
+    return market, advice, orders, portfolio
+
+def legacy_tick(db, tick_id):
+    market, advice, orders, portfolio = tick_rows(tick_id)
+    for model, rows in ((MarketData, market), (Order, orders), (LLMAdvice, advice), (PortfolioState, [portfolio])):
+        with Session(db) as session:
+            for row in rows:
+                session.add(model(**row))
+            session.commit()
+
+def build_batch(tick_id):
+    market, advice, orders, portfolio = tick_rows(tick_id)
+    batch = TickBatch()
+    for model, rows in ((MarketData, market), (Order, orders), (LLMAdvice, advice), (PortfolioState, [portfolio])):
+        for row in rows:
+            batch.add(model, row)
+    return batch
+
+def write_batch(db, batch):
+    with Session(db) as session:
+        batch.flush(session)
+        session.commit()
+
+def batched_tick(db, tick_id):
+    write_batch(db, build_batch(tick_id))
+
+def ticks_per_sec(write, db):
+    write(db, 0) # Warm-up (connection, statement cache)
+    start = time.perf_counter()
+    for tick in range(1, TICKS + 1):
+        write(db, tick)
+    return TICKS / (time.perf_counter() - start)
+
+@pytest.mark.parametrize("kind", ["sqlite-file", "sqlite-memory", "postgres"])
+def test_batched_vs_legacy_persistence(kind, tmp_path):
+    """
+    OBJECTIVE: Write TICKS ticks of 10 assets (market data + quant advice + 3 orders + portfolio) both ways.
+    EXPECTED RESULT: The batched unit of work is faster on every backend.
+    """
+    db = make_db(kind, tmp_path)
+    legacy = ticks_per_sec(legacy_tick, db)
+    batched = ticks_per_sec(batched_tick, db)
+    print(f"\nBENCH persistence @{kind:13s}: batched {batched:8.1f} ticks/s | legacy {legacy:8.1f} ticks/s ({batched / legacy:.1f}x)")
+    assert batched > legacy
+
+@pytest.mark.parametrize("kind", ["sqlite-file", "postgres"])
+def test_write_behind_tick_path(kind, tmp_path):
+    """
+    OBJECTIVE: Time only the tick-path cost (build + submit) of TICKS ticks in sync vs background mode.
+    EXPECTED RESULT: Background submits are cheaper than inline commits, and every tick still reaches the database.
+    """
+    db = make_db(kind, tmp_path)
+    tick_path = {}
+    for mode in ("sync", "background"):
+        writer = BackgroundWriter(lambda batch: write_batch(db, batch), mode=mode,
+                                  max_queue=TICKS, batch_ticks=20, flush_interval=0.05)
+        start = time.perf_counter()
+        for tick in range(TICKS):
+            writer.submit(build_batch(tick))
+        tick_path[mode] = (time.perf_counter() - start) / TICKS
+        writer.stop(timeout=30)
+        stats = writer.stats()
+        assert stats["ticks_written"] == TICKS
+        print(f"\nBENCH write-behind @{kind:11s} {mode:10s}: {tick_path[mode] * 1e3:.3f}ms/tick on the tick path"
+              f" | {stats['flushes']} flushes (avg {stats['flush_ms_avg']:.1f}ms, max depth {stats['max_queue_depth']})")
+    assert tick_path["background"] < tick_path["sync"]
@@ -0,0 +1,61 @@
+# tests/performance/test_precomputed_benchmark.py
+
+"""
+TEST SUITE: Vectorized Backtest Benchmark
+OBJECTIVE: Compare indicator cost per tick for the legacy per-asset pandas path, the incremental batch path and precomputed panels.
+EXPECTED RESULT: Precomputed panels (including the one-off build) beat the per-tick paths over a full replay.
+"""
+
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from agents.quant import QuantAgent
+from simulation.panel import IndicatorPanel
+from simulation.store import TickStore
+from utils.risk import RollingVolatility
+
+N_TICKS = 3000
+N_ASSETS = 50
+LEGACY_SAMPLE = 20 # Legacy path is sampled; it is far too slow to replay in full
+
+def test_precomputed_speedup():
+    """
+    OBJECTIVE: Run RSI + rolling volatility for 3,000 ticks x 50 assets three ways.
+    EXPECTED RESULT: Precomputed total time < incremental total time < projected legacy time.
+    """
+    rng = np.random.default_rng(2)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (N_TICKS, N_ASSETS)), axis=0))
+    symbols = [f"SYM{j}" for j in range(N_ASSETS)]
+    store = TickStore(symbols, closes, np.zeros_like(closes), np.arange(N_TICKS, dtype=np.int64))
+
+    # Legacy: per-asset pandas slices + ta RSI + pct_change().std()
+    frames = {s: pd.DataFrame({"close": closes[:, j]}) for j, s in enumerate(symbols)}
+    legacy = QuantAgent(incremental=False)
+    start = time.perf_counter()
+    for i in range(N_TICKS - LEGACY_SAMPLE + 1, N_TICKS + 1):
+        for s in symbols:
+            legacy.run(s, frames[s].iloc[:i])
+            frames[s].iloc[max(0, i - 20):i]['close'].pct_change().std()
+    legacy_total = (time.perf_counter() - start) / LEGACY_SAMPLE * N_TICKS
+
+    # Incremental: vectorized state update + streaming volatility every tick
+    agent = QuantAgent()
+    rolling = RollingVolatility(N_ASSETS)
+    start = time.perf_counter()
+    for i in range(1, N_TICKS + 1):
+        agent.run_batch(symbols, closes[:i])
+        rolling.update(closes[i - 1])
+    incremental_total = time.perf_counter() - start
+
+    # Precomputed: one build, then index lookups
+    start = time.perf_counter()
+    panel = IndicatorPanel.build(store)
+    for i in range(1, N_TICKS + 1):
+        panel.batch(i - 1)
+        panel.volatility[i - 1]
+    precomputed_total = time.perf_counter() - start
+
+    print(f"\nBENCH {N_TICKS} ticks x {N_ASSETS} assets: legacy ~{legacy_total:.1f}s (projected) | "
+          f"incremental {incremental_total:.3f}s | precomputed {precomputed_total:.3f}s")
+    assert precomputed_total < incremental_total < legacy_total
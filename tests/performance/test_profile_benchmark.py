@@ -0,0 +1,51 @@
+# tests/performance/test_profile_benchmark.py
+
+"""
+TEST SUITE: Persistence Profile Benchmark
+OBJECTIVE: Measure engine ticks/sec under each PERSIST_PROFILE against a SQLite file database.
+EXPECTED RESULT: Lighter profiles run faster; "none" runs at memory-bound speed.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlmodel import SQLModel, create_engine
+
+TICKS = 200
+N_ASSETS = 10
+
+def ticks_per_sec(profile, tmp_path, monkeypatch):
+    from config import config
+    from simulation.engine import SimulationEngine
+    db = create_engine(f"sqlite:///{tmp_path / f'{profile}.db'}")
+    SQLModel.metadata.create_all(db)
+    monkeypatch.setattr(config, "PERSIST_PROFILE", profile)
+    monkeypatch.setattr("simulation.engine.engine", db)
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    engine = SimulationEngine(load_data=False)
+    engine.analyst.run = lambda symbol, context="": {"outlook": "BULLISH", "confidence": 0.9, "reasoning": "up"}
+    engine.market.assets = [f"SYM{j}" for j in range(N_ASSETS)]
+    engine.portfolio["holdings"] = {a: 0.0 for a in engine.market.assets}
+    rng = np.random.default_rng(5)
+    engine.market.data = {a: pd.DataFrame({"close": 100 + rng.normal(0, 1, TICKS).cumsum()}) for a in engine.market.assets}
+    start = time.perf_counter()
+    engine.start_loop()
+    return TICKS / (time.perf_counter() - start)
+
+@patch("simulation.engine.SimulationEngine._start_run_record")
+@patch("simulation.engine.init_db")
+def test_profile_ticks_per_sec(mock_init, mock_record, tmp_path, monkeypatch, capsys):
+    """
+    OBJECTIVE: Run TICKS ticks over N_ASSETS assets under every profile.
+    EXPECTED RESULT: "none" and "summary" beat "full" on ticks/sec.
+    """
+    rates = {}
+    for profile in ("full", "decisions", "sampled", "summary", "none"):
+        rates[profile] = ticks_per_sec(profile, tmp_path, monkeypatch)
+    with capsys.disabled():
+        print("\nBENCH persistence profiles: " + " | ".join(f"{p} {r:.0f} ticks/s" for p, r in rates.items()))
+    assert rates["none"] > rates["full"]
+    assert rates["summary"] > rates["full"]
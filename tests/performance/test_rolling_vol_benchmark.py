@@ -0,0 +1,42 @@
+# tests/performance/test_rolling_vol_benchmark.py
+
+"""
+TEST SUITE: Rolling Volatility Benchmark
+OBJECTIVE: Compare per-tick cost of the legacy per-asset DataFrame slice + pct_change().std() against the streaming ring buffer.
+EXPECTED RESULT: Streaming cost stays flat as the universe grows and is far below the slice path.
+"""
+
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from utils.risk import RollingVolatility
+
+TICKS = 50
+
+@pytest.mark.parametrize("n_assets", [10, 100, 500])
+def test_streaming_vol_speedup(n_assets):
+    """
+    OBJECTIVE: Time TICKS ticks of volatility updates for 10, 100 and 500 assets.
+    EXPECTED RESULT: Streaming is at least 10x faster per tick.
+    """
+    rng = np.random.default_rng(4)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (TICKS + 20, n_assets)), axis=0))
+    frames = [pd.DataFrame({"close": closes[:, j]}) for j in range(n_assets)]
+
+    start = time.perf_counter()
+    for i in range(21, TICKS + 21):
+        for df in frames:
+            df.iloc[max(0, i - 20):i]['close'].pct_change().std()
+    slice_per_tick = (time.perf_counter() - start) / TICKS
+
+    rolling = RollingVolatility(n_assets, window=20)
+    for row in closes[:20]:
+        rolling.update(row)
+    start = time.perf_counter()
+    for row in closes[20:]:
+        rolling.update(row)
+    stream_per_tick = (time.perf_counter() - start) / TICKS
+
+    print(f"\nBENCH vol per tick @{n_assets:4d} assets: slices {slice_per_tick * 1e3:.3f}ms | streaming {stream_per_tick * 1e3:.3f}ms")
+    assert stream_per_tick * 10 < slice_per_tick
@@ -0,0 +1,40 @@
+# tests/performance/test_rsi_benchmark.py
+
+"""
+TEST SUITE: Incremental RSI Benchmark
+OBJECTIVE: Compare per-tick QuantAgent cost of incremental RSI vs full recompute on a 10k-tick history.
+EXPECTED RESULT: Incremental cost is flat per tick and far below the O(n) full recompute.
+"""
+
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from agents.quant import QuantAgent
+
+N_TICKS = 10_000
+SAMPLE_TICKS = 200 # Full recompute is O(n^2) over a replay, so it is sampled at the end of the history
+
+def test_incremental_rsi_speedup():
+    """
+    OBJECTIVE: Replay 10k ticks incrementally and time full-recompute calls on the final 10k-long slices.
+    EXPECTED RESULT: Incremental per-tick time is at least 10x lower.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, N_TICKS)))})
+
+    fast = QuantAgent(incremental=True)
+    start = time.perf_counter()
+    for i in range(1, N_TICKS + 1):
+        fast.run("BTC", df.iloc[:i])
+    incremental_per_tick = (time.perf_counter() - start) / N_TICKS
+
+    full = QuantAgent(incremental=False)
+    start = time.perf_counter()
+    for i in range(N_TICKS - SAMPLE_TICKS + 1, N_TICKS + 1):
+        full.run("BTC", df.iloc[:i])
+    full_per_tick = (time.perf_counter() - start) / SAMPLE_TICKS
+
+    print(f"\nBENCH RSI per tick @10k history: incremental {incremental_per_tick * 1e6:.1f}us | full {full_per_tick * 1e6:.1f}us "
+          f"| projected full replay {full_per_tick * N_TICKS / 2:.1f}s vs {incremental_per_tick * N_TICKS:.2f}s")
+    assert incremental_per_tick * 10 < full_per_tick
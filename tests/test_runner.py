@@ -4,6 +4,7 @@
 # Full Audit:        python tests/test_runner.py host all
 # Unit Tests:        python tests/test_runner.py host unit
 # Integration:       python tests/test_runner.py host integration
+# Benchmarks:        python tests/test_runner.py host performance
 # Raw Pytest:        docker-compose -f docker-compose.test.yml run --rm test_runner pytest tests/ -v
 # ====================================
 
@@ -202,14 +203,22 @@ def run_internal(category):
     paths = {
         "unit": "tests/unit/",
         "integration": "tests/integration/",
+        "performance": "tests/performance/",
         "decision": "tests/unit/test_decisions.py",
         "all": "tests/"
     }
+    # Benchmarks assert on wall-clock timings; they only run in their own category
+    markers = {
+        "all": "not performance",
+        "performance": "performance"
+    }
     
     env = os.environ.copy()
     env["PYTHONPATH"] = f".{os.pathsep}{env.get('PYTHONPATH', '')}"
     
     cmd = ["pytest", paths.get(category, "tests/"), "-v", "--cov=simulation", "--cov=agents", "--cov=utils", "--cov-report=term-missing"]
+    if category in markers:
+        cmd.extend(["-m", markers[category]])
     print(f"[INTERNAL] Running {category} tests with coverage...")
     
     result = subprocess.run(cmd, capture_output=True, text=True, env=env)
@@ -250,7 +259,7 @@ def run_host(category):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="NexusQuant Unified Test Runner")
     parser.add_argument("mode", choices=["host", "internal"], default="host", nargs="?")
-    parser.add_argument("category", default="all", help="all, unit, integration, decision")
+    parser.add_argument("category", default="all", help="all, unit, integration, performance, decision")
     
     args = parser.parse_args()
     
@@ -0,0 +1,99 @@
+# tests/unit/test_advisory_worker.py
+
+"""
+TEST SUITE: Background Advisory Worker
+OBJECTIVE: Verify that analyst calls can run off the tick loop and that their advice is tagged with staleness.
+EXPECTED RESULT: Ticks do not wait for slow analyses in background mode; sync mode stays same-tick and deterministic.
+"""
+
+import time
+import threading
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from simulation.advisory import AdvisoryWorker
+
+def bullish(tick_id, due):
+    return {a: {"outlook": "BULLISH", "confidence": 0.9, "reasoning": "ok"} for a in due}
+
+def test_sync_mode_is_same_tick():
+    """
+    OBJECTIVE: Submit and collect on tick 7 in sync mode.
+    EXPECTED RESULT: Advice is available immediately with staleness 0.
+    """
+    worker = AdvisoryWorker(bullish, mode="sync")
+    worker.submit(7, {"BTC-USD": "Price: 1"})
+    [(asset, advice)] = worker.collect(7)
+    assert asset == "BTC-USD"
+    assert advice["staleness_ticks"] == 0 and advice["outlook"] == "BULLISH"
+    assert worker.collect(8) == []
+
+def test_background_mode_reports_staleness():
+    """
+    OBJECTIVE: Submit on tick 0 to a worker whose dispatch blocks until released.
+    EXPECTED RESULT: Nothing completes while blocked, the asset is pending, and the result collected on tick 3 has staleness 3.
+    """
+    release = threading.Event()
+    def slow(tick_id, due):
+        release.wait(5)
+        return bullish(tick_id, due)
+
+    worker = AdvisoryWorker(slow, mode="background")
+    worker.submit(0, {"ETH-USD": "Price: 1"})
+    assert worker.collect(0) == []
+    assert worker.is_pending("ETH-USD")
+
+    release.set()
+    worker.stop(timeout=5)
+    [(asset, advice)] = worker.collect(3)
+    assert advice["requested_tick"] == 0 and advice["staleness_ticks"] == 3
+    assert not worker.is_pending("ETH-USD")
+
+def test_dispatch_error_falls_back():
+    """
+    OBJECTIVE: The dispatch raises inside the background thread.
+    EXPECTED RESULT: Each requested asset yields a NEUTRAL fallback and the worker survives.
+    """
+    def broken(tick_id, due):
+        raise RuntimeError("boom")
+
+    worker = AdvisoryWorker(broken, mode="background")
+    worker.submit(1, {"SPY": "", "QQQ": ""})
+    worker.stop(timeout=5)
+    results = dict(worker.collect(2))
+    assert {r["outlook"] for r in results.values()} == {"NEUTRAL"}
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_engine_ticks_do_not_wait_for_llm(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Run 20 ticks in background mode with a 0.5s analyst.
+    EXPECTED RESULT: The loop finishes in well under one analyst latency per tick, and late advice carries its staleness.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "ADVISORY_MODE", "background")
+    monkeypatch.setattr(config, "ANALYST_ASYNC", False)
+    monkeypatch.setattr(config, "LLM_COOLDOWN_TICKS", 5)
+    session_cls = MagicMock()
+    monkeypatch.setattr("simulation.engine.Session", session_cls)
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    engine = SimulationEngine(load_data=False)
+    engine._persist_portfolio = MagicMock()
+    engine.market.assets = ["BTC-USD"]
+    engine.market.data = {"BTC-USD": pd.DataFrame({"close": np.linspace(100, 120, 20)})}
+    def slow_run(symbol, context=""):
+        time.sleep(0.5)
+        return {"outlook": "BULLISH", "confidence": 0.9, "reasoning": "slow"}
+    engine.analyst.run = slow_run
+
+    start = time.perf_counter()
+    while engine.run_tick():
+        pass
+    assert time.perf_counter() - start < 0.5
+
+    engine.advisory.stop(timeout=5)
+    late = engine.advisory.collect(engine.tick_id)
+    assert late and all(advice["staleness_ticks"] > 0 for _, advice in late)
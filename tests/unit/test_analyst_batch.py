@@ -0,0 +1,104 @@
+# tests/unit/test_analyst_batch.py
+
+"""
+TEST SUITE: Batched Analyst Prompts
+OBJECTIVE: Verify that due assets are analyzed in multi-symbol JSON requests with per-entry validation.
+EXPECTED RESULT: One request per batch; missing or malformed symbols fall back to NEUTRAL individually.
+"""
+
+import re
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from agents.analyst import AnalystAgent
+
+class BatchClient:
+    """Fake groq.Groq that answers every listed symbol unless overridden in `replies`."""
+
+    def __init__(self, replies=None, raw=None):
+        self.replies = replies or {}
+        self.raw = raw
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        if self.raw is not None:
+            content = self.raw
+        else:
+            reply = {}
+            for symbol in re.findall(r"- (\S+): ", prompt):
+                entry = self.replies.get(symbol, {"outlook": "BULLISH", "confidence": 0.9, "reasoning": symbol})
+                if entry is not None:
+                    reply[symbol] = entry
+            content = json.dumps(reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+CONTEXTS = {s: "Price: 100.0" for s in ["BTC-USD", "ETH-USD", "SOL-USD", "SPY", "QQQ"]}
+
+def test_one_request_per_batch():
+    """
+    OBJECTIVE: Analyze 5 symbols with batch sizes 10 and 2.
+    EXPECTED RESULT: 1 and 3 requests respectively; every symbol gets its own analysis in input order.
+    """
+    client = BatchClient()
+    results = AnalystAgent(client=client, cache=None).run_batch(CONTEXTS, batch_size=10)
+    assert len(client.prompts) == 1
+    assert list(results) == list(CONTEXTS)
+    assert all(r["outlook"] == "BULLISH" and r["reasoning"] == s for s, r in results.items())
+
+    client = BatchClient()
+    AnalystAgent(client=client, cache=None).run_batch(CONTEXTS, batch_size=2)
+    assert len(client.prompts) == 3
+
+def test_missing_and_malformed_entries_fall_back():
+    """
+    OBJECTIVE: Reply omits ETH, gives SOL an unknown outlook and SPY an out-of-range confidence.
+    EXPECTED RESULT: Those three are NEUTRAL/0.0; BTC and QQQ keep their analysis.
+    """
+    client = BatchClient(replies={
+        "ETH-USD": None,
+        "SOL-USD": {"outlook": "MOON", "confidence": 0.9},
+        "SPY": {"outlook": "BEARISH", "confidence": 7}
+    })
+    results = AnalystAgent(client=client, cache=None).run_batch(CONTEXTS, batch_size=10)
+    for symbol in ["ETH-USD", "SOL-USD", "SPY"]:
+        assert results[symbol]["outlook"] == "NEUTRAL" and results[symbol]["confidence"] == 0.0
+    assert results["BTC-USD"]["outlook"] == results["QQQ"]["outlook"] == "BULLISH"
+
+def test_unparseable_reply_falls_back_for_whole_batch():
+    """
+    OBJECTIVE: The model returns invalid JSON.
+    EXPECTED RESULT: Every symbol of the batch is NEUTRAL; no exception escapes.
+    """
+    results = AnalystAgent(client=BatchClient(raw="not json"), cache=None).run_batch(CONTEXTS, batch_size=10)
+    assert {r["outlook"] for r in results.values()} == {"NEUTRAL"}
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_engine_uses_batch_mode(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Run one engine tick with ANALYST_BATCH_SIZE=10 and three due assets.
+    EXPECTED RESULT: run_batch() receives all three contexts in a single call.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "ANALYST_BATCH_SIZE", 10)
+    monkeypatch.setattr(config, "ANALYST_SCHEDULE", "aligned") # All three due on the same tick
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+
+    engine = SimulationEngine(load_data=False)
+    assets = ["BTC-USD", "ETH-USD", "SPY"]
+    engine.market = MagicMock()
+    engine.market.assets = assets
+    engine.market.current_tick_id = 0
+    engine.market.tick = MagicMock(return_value={a: {"symbol": a, "price": 100.0} for a in assets})
+    engine.quant.run = MagicMock(return_value={"outlook": "NEUTRAL", "confidence": 0.5, "reasoning": "q"})
+    engine.analyst.run_batch = MagicMock(return_value={a: AnalystAgent.fallback() for a in assets})
+    engine._execute_rebalance = MagicMock()
+    engine._persist_portfolio = MagicMock()
+
+    engine.run_tick()
+    engine.analyst.run_batch.assert_called_once_with({a: "Price: 100.0" for a in assets})
@@ -0,0 +1,128 @@
+# tests/unit/test_analyst_cassette.py
+
+"""
+TEST SUITE: Analyst Record/Replay Cassette
+OBJECTIVE: Verify that analyst completions recorded in one run are served offline in a later run.
+EXPECTED RESULT: Replay makes zero client calls, reproduces the recorded advice and the run's final equity.
+"""
+
+import gzip
+import json
+import random
+import pytest
+import numpy as np
+import pandas as pd
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from agents.analyst import AnalystAgent
+from agents.cassette import AdviceCassette
+
+REAL_RUN = AnalystAgent.run # Captured before conftest mocks it
+
+class RandomClient:
+    """Fake groq.Groq returning a random outlook, so replay equality is meaningful."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        content = json.dumps({
+            "outlook": self.rng.choice(["BULLISH", "BEARISH", "NEUTRAL"]),
+            "confidence": round(self.rng.random(), 3),
+            "reasoning": f"call {self.calls}"
+        })
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+@pytest.fixture
+def real_run(monkeypatch):
+    from config import config
+    monkeypatch.setattr(AnalystAgent, "run", REAL_RUN)
+    # The fake clients answer instantly; the default rate limiter would sleep on the wall clock
+    monkeypatch.setattr(config, "ANALYST_RATE_REQUESTS_PER_MIN", 0)
+    monkeypatch.setattr(config, "ANALYST_RATE_TOKENS_PER_MIN", 0)
+
+def test_record_then_replay(real_run, tmp_path):
+    """
+    OBJECTIVE: Record 10 completions, then replay them with no client.
+    EXPECTED RESULT: Identical responses, a gzip JSONL file, and an unrecorded request falls back to NEUTRAL.
+    """
+    path = str(tmp_path / "cassette.jsonl.gz")
+    recorder = AnalystAgent(client=RandomClient(), cache=None, cassette=AdviceCassette(path, "record"))
+    recorded = {}
+    for tick in range(5):
+        recorder.tick_id = tick
+        for symbol in ["BTC-USD", "ETH-USD"]:
+            recorded[(symbol, tick)] = recorder.run(symbol, f"Price: {100 + tick}")
+    recorder.close()
+
+    with gzip.open(path, "rt") as f:
+        assert len(f.readlines()) == 10
+
+    player = AnalystAgent(client=None, cache=None, cassette=AdviceCassette(path, "replay"))
+    for (symbol, tick), response in recorded.items():
+        player.tick_id = tick
+        assert player.run(symbol, f"Price: {100 + tick}") == response
+    assert player.cassette.replayed == 10
+
+    player.tick_id = 99
+    assert player.run("BTC-USD", "Price: 1") == AnalystAgent.fallback()
+    assert player.cassette.misses == 1
+
+def test_batch_requests_replay(real_run, tmp_path):
+    """
+    OBJECTIVE: Record a batched request and replay it.
+    EXPECTED RESULT: The whole batch is served from the cassette.
+    """
+    path = str(tmp_path / "batch.jsonl.gz")
+
+    class BatchClient(RandomClient):
+        def create(self, messages, **kwargs):
+            self.calls += 1
+            reply = {s: {"outlook": "BEARISH", "confidence": 0.7, "reasoning": "b"} for s in ["SPY", "QQQ"]}
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))])
+
+    contexts = {"SPY": "Price: 500", "QQQ": "Price: 400"}
+    recorder = AnalystAgent(client=BatchClient(), cache=None, cassette=AdviceCassette(path, "record"))
+    recorded = recorder.run_batch(contexts, batch_size=5)
+    recorder.close()
+
+    player = AnalystAgent(client=None, cache=None, cassette=AdviceCassette(path, "replay"))
+    assert player.run_batch(contexts, batch_size=5) == recorded
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_engine_run_replays_offline(mock_record, mock_init, real_run, monkeypatch, tmp_path):
+    """
+    OBJECTIVE: Run a 60-tick, 3-asset simulation in record mode, then again in replay mode without a client.
+    EXPECTED RESULT: Same final portfolio, no network calls during replay.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "ANALYST_CASSETTE_PATH", str(tmp_path / "run.jsonl.gz"))
+    monkeypatch.setattr(config, "LLM_COOLDOWN_TICKS", 5)
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    rng = np.random.default_rng(8)
+    assets = ["BTC-USD", "ETH-USD", "SPY"]
+    data = {a: pd.DataFrame({"close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 60)))}) for a in assets}
+
+    def simulate(mode, client):
+        monkeypatch.setattr(config, "ANALYST_CASSETTE_MODE", mode)
+        engine = SimulationEngine(load_data=False)
+        engine.analyst.client = client
+        engine._persist_portfolio = MagicMock()
+        engine.market.assets = assets
+        engine.market.data = data
+        engine.start_loop()
+        return engine
+
+    recorded = simulate("record", RandomClient(seed=3))
+    replayed = simulate("replay", None)
+    assert replayed.analyst.cassette.replayed == recorded.analyst.cassette.recorded > 0
+    assert replayed.analyst.cassette.misses == 0
+    assert replayed.portfolio["total_equity"] == recorded.portfolio["total_equity"]
+    assert replayed.portfolio["holdings"] == recorded.portfolio["holdings"]
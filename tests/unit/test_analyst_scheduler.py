@@ -0,0 +1,81 @@
+# tests/unit/test_analyst_scheduler.py
+
+"""
+TEST SUITE: Staggered Analyst Scheduler
+OBJECTIVE: Verify per-asset analyst calls are spread over the cooldown window, honour priorities and a per-tick budget.
+EXPECTED RESULT: Flat per-tick call load instead of bursts on the same ticks.
+"""
+
+import pytest
+from utils.scheduler import AnalystScheduler
+from utils.triggers import AnalystTrigger
+
+ASSETS = [f"A{i}" for i in range(10)]
+
+def drive(trigger, assets, ticks):
+    """Runs the cooldown schedule for flat prices and returns the number of calls per tick."""
+    trigger.scheduler.register(assets, 0)
+    load = []
+    for t in range(ticks):
+        reasons = {a: r for a in assets if (r := trigger.due(a, t, 100.0))}
+        chosen = trigger.scheduler.select(list(reasons), t)
+        for asset in chosen:
+            trigger.record_call(asset, t, 100.0, reason=reasons[asset])
+        load.append(len(chosen))
+    return load
+
+def test_aligned_mode_bursts():
+    """
+    OBJECTIVE: Legacy aligned schedule with 10 assets and cooldown 10.
+    EXPECTED RESULT: All 10 calls land on ticks 0, 10, 20.
+    """
+    trigger = AnalystTrigger(mode="cooldown", cooldown_ticks=10,
+                             scheduler=AnalystScheduler(10, mode="aligned", max_calls_per_tick=0))
+    load = drive(trigger, ASSETS, 30)
+    assert max(load) == 10 and sum(load) == 30
+
+def test_staggered_mode_is_flat():
+    """
+    OBJECTIVE: Same universe with the staggered schedule.
+    EXPECTED RESULT: Exactly one call per tick, same total number of calls.
+    """
+    trigger = AnalystTrigger(mode="cooldown", cooldown_ticks=10,
+                             scheduler=AnalystScheduler(10, mode="staggered", max_calls_per_tick=0))
+    load = drive(trigger, ASSETS, 30)
+    assert load == [1] * 30
+
+def test_budget_defers_most_overdue_first():
+    """
+    OBJECTIVE: Aligned schedule capped at 3 calls per tick.
+    EXPECTED RESULT: Never more than 3 calls per tick; deferred assets are served on the following ticks.
+    """
+    scheduler = AnalystScheduler(10, mode="aligned", max_calls_per_tick=3)
+    trigger = AnalystTrigger(mode="cooldown", cooldown_ticks=10, scheduler=scheduler)
+    load = drive(trigger, ASSETS, 4)
+    assert load == [3, 3, 3, 1]
+    assert set(trigger.last_call) == set(ASSETS)
+
+def test_priority_stretches_low_priority_intervals():
+    """
+    OBJECTIVE: One asset twice as volatile as another, and one far calmer than the stretch cap.
+    EXPECTED RESULT: The top asset keeps the cooldown; others stretch proportionally, capped at max_stretch.
+    """
+    scheduler = AnalystScheduler(10, mode="staggered", max_calls_per_tick=0, max_stretch=4.0)
+    scheduler.set_priorities({"HOT": 0.04, "MID": 0.02, "CALM": 0.001, "WARMUP": None})
+    assert scheduler.interval("HOT") == 10
+    assert scheduler.interval("MID") == 20
+    assert scheduler.interval("CALM") == 40
+    assert scheduler.interval("WARMUP") == 10
+
+def test_register_keeps_existing_clocks():
+    """
+    OBJECTIVE: Extend the universe mid-run.
+    EXPECTED RESULT: Known assets keep their next-due tick; the new one is staggered from the current tick.
+    """
+    scheduler = AnalystScheduler(10, mode="staggered", max_calls_per_tick=0)
+    scheduler.register(["A", "B"], 0)
+    scheduler.mark_called("A", 0)
+    scheduler.register(["A", "B", "C"], 7)
+    assert scheduler.next_due["A"] == 10
+    assert scheduler.next_due["B"] == 5
+    assert scheduler.next_due["C"] == 7 + (2 * 10) // 3
@@ -0,0 +1,136 @@
+# tests/unit/test_analyst_triggers.py
+
+"""
+TEST SUITE: State-Change Analyst Triggers
+OBJECTIVE: Verify the analyst is only re-invoked on price moves or volatility regime shifts, with the cooldown as a floor.
+EXPECTED RESULT: Flat markets make a single call; moves and regime shifts trigger calls; savings are reported.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from agents.analyst import AnalystAgent
+from utils.triggers import AnalystTrigger
+
+REAL_RUN = AnalystAgent.run # Captured before conftest mocks it
+
+def drive(trigger, prices, vols=None):
+    """Feeds one asset's price path and returns {tick: reason} for every call made."""
+    calls = {}
+    for t, price in enumerate(prices):
+        vol = None if vols is None else vols[t]
+        reason = trigger.due("BTC", t, price, vol)
+        if reason:
+            trigger.record_call("BTC", t, price, vol, reason)
+            calls[t] = reason
+    return calls
+
+def test_flat_market_calls_once():
+    """
+    OBJECTIVE: 100 ticks of constant price in state_change mode with cooldown 10.
+    EXPECTED RESULT: Only the initial call; the cooldown-only baseline would have made 10.
+    """
+    trigger = AnalystTrigger(mode="state_change", cooldown_ticks=10, price_move_pct=0.02, vol_ratio=1.5)
+    assert drive(trigger, [100.0] * 100) == {0: "initial"}
+    stats = trigger.stats()
+    assert (stats["calls"], stats["baseline_calls"], stats["saved_calls"]) == (1, 10, 9)
+
+def test_price_move_respects_cooldown_floor():
+    """
+    OBJECTIVE: Price jumps 5% at tick 3 and again at tick 20.
+    EXPECTED RESULT: The first jump waits for the cooldown (tick 10); the second fires immediately.
+    """
+    prices = [100.0] * 3 + [105.0] * 17 + [110.25] * 10
+    trigger = AnalystTrigger(mode="state_change", cooldown_ticks=10, price_move_pct=0.02, vol_ratio=1.5)
+    assert drive(trigger, prices) == {0: "initial", 10: "price_move", 20: "price_move"}
+
+def test_volatility_regime_shift():
+    """
+    OBJECTIVE: Flat price while volatility doubles at tick 15.
+    EXPECTED RESULT: A vol_regime call at tick 15.
+    """
+    vols = [0.01] * 15 + [0.02] * 15
+    trigger = AnalystTrigger(mode="state_change", cooldown_ticks=10, price_move_pct=0.02, vol_ratio=1.5)
+    assert drive(trigger, [100.0] * 30, vols) == {0: "initial", 15: "vol_regime"}
+
+def test_cooldown_mode_matches_legacy_schedule():
+    """
+    OBJECTIVE: Same flat path in the default cooldown mode.
+    EXPECTED RESULT: A call every cooldown period and zero savings.
+    """
+    trigger = AnalystTrigger(mode="cooldown", cooldown_ticks=10)
+    assert list(drive(trigger, [100.0] * 30)) == [0, 10, 20]
+    assert trigger.stats()["saved_calls"] == 0
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_engine_uses_triggers(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Run the engine over a flat BTC path and a trending ETH path in state_change mode.
+    EXPECTED RESULT: BTC is analyzed once, ETH repeatedly; stats reflect the saved calls.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "ANALYST_TRIGGER_MODE", "state_change")
+    monkeypatch.setattr(config, "LLM_COOLDOWN_TICKS", 5)
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    engine = SimulationEngine(load_data=False)
+    engine._persist_portfolio = MagicMock()
+    engine.market.assets = ["BTC-USD", "ETH-USD"]
+    engine.market.data = {
+        "BTC-USD": pd.DataFrame({"close": np.full(40, 100.0)}),
+        "ETH-USD": pd.DataFrame({"close": 100 * 1.01 ** np.arange(40)})
+    }
+    calls = []
+    engine.analyst.run = lambda symbol, context="": calls.append(symbol) or {"outlook": "NEUTRAL", "confidence": 0.0}
+    engine.analyst.run_many = lambda due: {a: engine.analyst.run(a, c) for a, c in due.items()}
+    while engine.run_tick():
+        pass
+
+    assert calls.count("BTC-USD") == 1
+    assert calls.count("ETH-USD") > 2
+    stats = engine.trigger.stats()
+    assert stats["calls"] == len(calls) and stats["saved_calls"] > 0
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_cache_hits_are_not_api_calls(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Cooldown mode (5 ticks) over 40 flat ticks, with the real analyst behind a 60-tick advice cache.
+    EXPECTED RESULT: 8 calls are dispatched but only the first reaches the client; stats report 1 API call and
+    7 cache hits, and the saving against the cooldown-only schedule counts the cached ones.
+    """
+    import json
+    from types import SimpleNamespace
+    from config import config
+    from agents.llm_cache import AdviceCache
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(AnalystAgent, "run", REAL_RUN)
+    monkeypatch.setattr(config, "ANALYST_TRIGGER_MODE", "cooldown")
+    monkeypatch.setattr(config, "LLM_COOLDOWN_TICKS", 5)
+    monkeypatch.setattr(config, "ANALYST_RATE_REQUESTS_PER_MIN", 0)
+    monkeypatch.setattr(config, "ANALYST_RATE_TOKENS_PER_MIN", 0)
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    requests = []
+    def create(**kwargs):
+        requests.append(kwargs)
+        content = json.dumps({"outlook": "NEUTRAL", "confidence": 0.5, "reasoning": "flat"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    engine = SimulationEngine(load_data=False)
+    engine._persist_portfolio = MagicMock()
+    engine.analyst.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    engine.analyst.cache = AdviceCache(max_entries=10, ttl_ticks=60, ttl_seconds=0, bucket_pct=0.005, path="")
+    engine.market.assets = ["BTC-USD"]
+    engine.market.data = {"BTC-USD": pd.DataFrame({"close": np.full(40, 100.0)})}
+    engine.start_loop()
+
+    stats = engine.trigger.stats(engine.analyst.cache.hits)
+    assert len(requests) == 1
+    assert (stats["dispatched"], stats["calls"], stats["cache_hits"]) == (8, 1, 7)
+    assert (stats["baseline_calls"], stats["saved_calls"]) == (8, 7)
@@ -0,0 +1,115 @@
+# tests/unit/test_async_analyst.py
+
+"""
+TEST SUITE: Concurrent Analyst Dispatch
+OBJECTIVE: Verify that due analyst calls for a tick fan out concurrently against a local fake client with simulated latency.
+EXPECTED RESULT: Wall time ~ one call, concurrency is capped, and slow/failed calls degrade to NEUTRAL.
+"""
+
+import json
+import time
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from agents.analyst import AnalystAgent
+
+REAL_RUN = AnalystAgent.run # Captured before conftest mocks it
+
+class FakeClient:
+    """Mimics groq.Groq: chat.completions.create() sleeps, then returns a BULLISH JSON reply."""
+
+    def __init__(self, latency=0.2, slow=None, failing=None):
+        self.latency = latency
+        self.slow = slow or {}
+        self.failing = set(failing or [])
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, **kwargs):
+        symbol = messages[-1]["content"].split("outlook for ")[1].split(".")[0]
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.slow.get(symbol, self.latency))
+            if symbol in self.failing:
+                raise ConnectionError("upstream 503")
+            content = json.dumps({"outlook": "BULLISH", "confidence": 0.7, "reasoning": symbol})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+@pytest.fixture
+def real_run(monkeypatch):
+    monkeypatch.setattr(AnalystAgent, "run", REAL_RUN)
+
+SYMBOLS = [f"SYM{i}" for i in range(8)]
+
+def test_calls_overlap(real_run):
+    """
+    OBJECTIVE: Analyze 8 symbols with 0.2s latency each.
+    EXPECTED RESULT: Finishes well under the 1.6s serial time; results keep input order.
+    """
+    agent = AnalystAgent(client=FakeClient(latency=0.2))
+    start = time.perf_counter()
+    results = agent.run_many({s: "Price: 1" for s in SYMBOLS}, concurrency=8, timeout=5)
+    elapsed = time.perf_counter() - start
+
+    assert list(results) == SYMBOLS
+    assert all(r["outlook"] == "BULLISH" for r in results.values())
+    assert elapsed < 0.8
+
+def test_concurrency_limit(real_run):
+    """
+    OBJECTIVE: Run 8 symbols with concurrency=3.
+    EXPECTED RESULT: Never more than 3 calls in flight.
+    """
+    client = FakeClient(latency=0.05)
+    AnalystAgent(client=client).run_many({s: "" for s in SYMBOLS}, concurrency=3, timeout=5)
+    assert client.max_in_flight == 3
+
+def test_slow_and_failed_calls_fall_back(real_run):
+    """
+    OBJECTIVE: One call exceeds the timeout and one raises.
+    EXPECTED RESULT: Both return the NEUTRAL fallback without waiting for the slow call; the rest succeed.
+    """
+    client = FakeClient(latency=0.01, slow={"SYM1": 1.0}, failing=["SYM2"])
+    start = time.perf_counter()
+    results = AnalystAgent(client=client).run_many({s: "" for s in SYMBOLS[:4]}, concurrency=4, timeout=0.3)
+    assert time.perf_counter() - start < 0.8
+
+    assert results["SYM1"] == AnalystAgent.fallback("Analysis timed out")
+    assert results["SYM2"]["outlook"] == "NEUTRAL" and results["SYM2"]["confidence"] == 0.0
+    assert results["SYM0"]["outlook"] == results["SYM3"]["outlook"] == "BULLISH"
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_engine_dispatches_due_assets_together(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Run one tick with three assets due at once.
+    EXPECTED RESULT: run_many() is called once with all three contexts and each result is recorded.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "ANALYST_ASYNC", True)
+    monkeypatch.setattr(config, "ANALYST_SCHEDULE", "aligned") # All three due on the same tick
+
+    engine = SimulationEngine(load_data=False)
+    assets = ["BTC-USD", "ETH-USD", "SPY"]
+    engine.market = MagicMock()
+    engine.market.assets = assets
+    engine.market.current_tick_id = 0
+    engine.market.tick = MagicMock(return_value={a: {"symbol": a, "price": 100.0} for a in assets})
+    engine.quant.run = MagicMock(return_value={"outlook": "NEUTRAL", "confidence": 0.5, "reasoning": "q"})
+    engine.analyst.run_many = MagicMock(return_value={a: {"outlook": "BULLISH", "confidence": 0.9, "reasoning": "x"} for a in assets})
+    engine._execute_rebalance = MagicMock()
+    engine._persist_portfolio = MagicMock()
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+
+    engine.run_tick()
+    engine.analyst.run_many.assert_called_once_with({a: "Price: 100.0" for a in assets})
+    assert engine.last_analyst_call == {a: 0 for a in assets}
@@ -0,0 +1,192 @@
+# tests/unit/test_background_writer.py
+
+"""
+TEST SUITE: Write-Behind Persistence
+OBJECTIVE: Verify tick batches are written off the tick loop through a bounded queue.
+EXPECTED RESULT: Ticks are coalesced into few transactions, a full queue blocks (or sheds MarketData only),
+and stopping the writer flushes everything queued, including after a KeyboardInterrupt.
+"""
+
+import time
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from database.models import MarketData, PortfolioState
+from database.unit_of_work import TickBatch
+from database.writer import BackgroundWriter
+
+def tick_batch(tick_id, market=True, portfolio=True):
+    batch = TickBatch()
+    if market:
+        for symbol in ["BTC-USD", "ETH-USD"]:
+            batch.add(MarketData, {"run_id": "r", "tick_id": tick_id, "symbol": symbol, "price": 1.0})
+    if portfolio:
+        batch.add(PortfolioState, {"run_id": "r", "tick_id": tick_id, "balance": 1.0, "holdings": {}, "total_equity": 1.0})
+    return batch
+
+class GatedWrite:
+    """Records written batches; blocks inside write() until `gate` is set."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+        self.batches = []
+
+    def __call__(self, batch):
+        self.entered.set()
+        self.gate.wait(5)
+        self.batches.append(batch)
+
+def test_sync_mode_writes_inline():
+    """
+    OBJECTIVE: Submit one tick in sync mode.
+    EXPECTED RESULT: It is written before submit() returns; latency metrics are recorded.
+    """
+    written = []
+    writer = BackgroundWriter(written.append, mode="sync")
+    writer.submit(tick_batch(1))
+    writer.submit(TickBatch()) # Empty ticks are skipped
+    assert len(written) == 1
+    stats = writer.stats()
+    assert (stats["ticks_written"], stats["rows_written"], stats["flushes"]) == (1, 3, 1)
+
+def test_coalesces_ticks_per_transaction():
+    """
+    OBJECTIVE: Queue 10 ticks with batch_ticks=5 and a generous flush window.
+    EXPECTED RESULT: Two transactions of 5 ticks each; stop() returns once all rows are written.
+    """
+    written = []
+    writer = BackgroundWriter(written.append, mode="background", max_queue=16, batch_ticks=5, flush_interval=5)
+    for tick in range(10):
+        writer.submit(tick_batch(tick))
+    writer.stop(timeout=5)
+    assert [len(batch) for batch in written] == [15, 15]
+    assert [row["tick_id"] for batch in written for row in batch.rows[PortfolioState]] == list(range(10))
+    stats = writer.stats()
+    assert (stats["ticks_written"], stats["flushes"], stats["queue_depth"]) == (10, 2, 0)
+
+def test_full_queue_applies_backpressure():
+    """
+    OBJECTIVE: A stalled database (write blocked) with room for 2 queued ticks; submit a 4th tick.
+    EXPECTED RESULT: The 4th submit blocks until the database recovers, is counted as a backpressure wait, and nothing is lost.
+    """
+    write = GatedWrite()
+    writer = BackgroundWriter(write, mode="background", max_queue=2, batch_ticks=1, flush_interval=0)
+    writer.submit(tick_batch(1))
+    assert write.entered.wait(5) # Tick 1 is being written
+    writer.submit(tick_batch(2))
+    writer.submit(tick_batch(3))
+
+    blocked = threading.Thread(target=writer.submit, args=(tick_batch(4),))
+    blocked.start()
+    time.sleep(0.1)
+    assert blocked.is_alive()
+    assert writer.stats()["queue_depth"] == 2
+
+    write.gate.set()
+    blocked.join(5)
+    writer.stop(timeout=5)
+    assert len(write.batches) == 4
+    stats = writer.stats()
+    assert stats["blocked"] == 1 and stats["max_queue_depth"] == 2 and stats["dropped_rows"] == 0
+
+def test_overflow_drops_market_data_only():
+    """
+    OBJECTIVE: Same stalled database with overflow="drop_market_data".
+    EXPECTED RESULT: A market-data-only tick is dropped without blocking; a mixed tick keeps its
+    PortfolioState row and waits for space.
+    """
+    write = GatedWrite()
+    writer = BackgroundWriter(write, mode="background", max_queue=1, batch_ticks=1, flush_interval=0,
+                              overflow="drop_market_data")
+    writer.submit(tick_batch(1))
+    assert write.entered.wait(5)
+    writer.submit(tick_batch(2))
+
+    writer.submit(tick_batch(3, portfolio=False)) # Returns at once
+    assert writer.stats()["dropped_rows"] == 2
+
+    mixed = tick_batch(4)
+    blocked = threading.Thread(target=writer.submit, args=(mixed,))
+    blocked.start()
+    time.sleep(0.1)
+    assert blocked.is_alive()
+    write.gate.set()
+    blocked.join(5)
+    writer.stop(timeout=5)
+
+    assert [batch.counts() for batch in write.batches] == [
+        {"MarketData": 2, "PortfolioState": 1},
+        {"MarketData": 2, "PortfolioState": 1},
+        {"PortfolioState": 1}
+    ]
+    assert writer.stats()["dropped_rows"] == 4
+
+def test_sync_write_error_raises():
+    """
+    OBJECTIVE: The database raises on write in sync mode.
+    EXPECTED RESULT: submit() re-raises the error to the tick loop instead of logging and dropping the tick.
+    """
+    def broken(batch):
+        raise RuntimeError("connection reset")
+    writer = BackgroundWriter(broken, mode="sync")
+    with pytest.raises(RuntimeError, match="connection reset"):
+        writer.submit(tick_batch(1))
+    stats = writer.stats()
+    assert (stats["failed_ticks"], stats["ticks_written"]) == (0, 0)
+
+def test_write_error_is_counted():
+    """
+    OBJECTIVE: The database raises on write in the background thread.
+    EXPECTED RESULT: The failed ticks are counted and the writer keeps draining later ticks.
+    """
+    calls = []
+    def flaky(batch):
+        calls.append(batch)
+        if len(calls) == 1:
+            raise RuntimeError("connection reset")
+    writer = BackgroundWriter(flaky, mode="background", max_queue=4, batch_ticks=1, flush_interval=0)
+    writer.submit(tick_batch(1))
+    writer.drain()
+    writer.submit(tick_batch(2))
+    writer.stop(timeout=5)
+    stats = writer.stats()
+    assert (stats["failed_ticks"], stats["ticks_written"]) == (1, 1)
+
+@patch("simulation.engine.SimulationEngine._start_run_record")
+@patch("simulation.engine.init_db")
+def test_interrupted_loop_flushes_queue(mock_init, mock_record, monkeypatch):
+    """
+    OBJECTIVE: Run the engine loop in background mode and press Ctrl-C after 25 ticks.
+    EXPECTED RESULT: start_loop flushes the queue on the way out; every completed tick's PortfolioState is stored.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    db = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(db)
+    monkeypatch.setattr(config, "PERSIST_MODE", "background")
+    monkeypatch.setattr(config, "PERSIST_FLUSH_SECONDS", 1.0)
+    monkeypatch.setattr("simulation.engine.engine", db)
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    engine = SimulationEngine(load_data=False)
+    engine.analyst.run = lambda symbol, context="": {"outlook": "NEUTRAL", "confidence": 0.5, "reasoning": "flat"}
+    engine.market.assets = ["BTC-USD", "ETH-USD"]
+    rng = np.random.default_rng(3)
+    engine.market.data = {a: pd.DataFrame({"close": 100 + rng.normal(0, 1, 40).cumsum()}) for a in engine.market.assets}
+    run_tick = engine.run_tick
+    def interrupt_after_25():
+        if engine.tick_id == 25:
+            raise KeyboardInterrupt
+        return run_tick()
+    engine.run_tick = interrupt_after_25
+    engine.start_loop()
+
+    assert engine.writer.stats()["ticks_written"] == 25
+    with Session(db) as session:
+        assert [s.tick_id for s in session.exec(select(PortfolioState))] == list(range(1, 26))
+        assert len(session.exec(select(MarketData)).all()) == 50
@@ -0,0 +1,155 @@
+# tests/unit/test_client_guard.py
+
+"""
+TEST SUITE: Analyst Client Rate Limiter & Circuit Breaker
+OBJECTIVE: Verify requests/tokens per minute are enforced and a degraded API is skipped for a cool-off window.
+EXPECTED RESULT: Throttled calls wait or fall back to NEUTRAL, the breaker trips and recovers, counters are exposed.
+"""
+
+import json
+import pytest
+from types import SimpleNamespace
+from agents.analyst import AnalystAgent
+from agents.throttle import RateLimiter, CircuitBreaker, RateLimited, CircuitOpen
+
+REAL_RUN = AnalystAgent.run # Captured before conftest mocks it
+
+class FakeClock:
+    """Manual monotonic clock; sleep() just advances it."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class LocalClient:
+    """Stand-in for groq.Groq: fails while `down` is set, otherwise returns a BULLISH reply with token usage."""
+
+    def __init__(self, tokens=100):
+        self.down = False
+        self.calls = 0
+        self.tokens = tokens
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("upstream 503")
+        content = json.dumps({"outlook": "BULLISH", "confidence": 0.8, "reasoning": "ok"})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(total_tokens=self.tokens)
+        )
+
+@pytest.fixture
+def real_run(monkeypatch):
+    monkeypatch.setattr(AnalystAgent, "run", REAL_RUN)
+
+def test_request_bucket_waits_then_rejects():
+    """
+    OBJECTIVE: 60 requests/min (one per second), burst of 60, then more calls.
+    EXPECTED RESULT: The 61st call waits ~1s; with no allowed wait it raises RateLimited.
+    """
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_min=60, tokens_per_min=0, max_wait=5, clock=clock, sleep=clock.sleep)
+    for _ in range(60):
+        limiter.acquire()
+    assert clock.now == 0.0
+
+    limiter.acquire()
+    assert clock.now == pytest.approx(1.0)
+    assert limiter.throttled == 1
+
+    limiter.max_wait = 0
+    with pytest.raises(RateLimited):
+        limiter.acquire()
+    assert limiter.stats() == {"throttled": 2, "rate_limited": 1}
+
+def test_token_bucket_settles_actual_usage():
+    """
+    OBJECTIVE: 1000 tokens/min; a 600-token estimate that actually used 100 tokens.
+    EXPECTED RESULT: The refund lets a second 900-token request through without waiting.
+    """
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_min=0, tokens_per_min=1000, max_wait=0, clock=clock, sleep=clock.sleep)
+    limiter.acquire(600)
+    with pytest.raises(RateLimited):
+        limiter.acquire(900)
+    limiter.settle(600, 100)
+    limiter.acquire(900)
+    assert clock.now == 0.0
+
+def test_breaker_trips_and_recovers():
+    """
+    OBJECTIVE: Threshold 3, cool-off 30s.
+    EXPECTED RESULT: Opens after 3 failures, skips calls, lets one trial call through after the cool-off.
+    """
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, cooloff=30, clock=clock)
+    for _ in range(3):
+        breaker.check()
+        breaker.record_failure()
+    assert breaker.state == "open" and breaker.tripped == 1
+    with pytest.raises(CircuitOpen):
+        breaker.check()
+
+    clock.now = 30
+    breaker.check() # Trial call
+    with pytest.raises(CircuitOpen):
+        breaker.check() # Only one trial at a time
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.tripped == 2
+
+    clock.now = 60
+    breaker.check()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.check()
+    assert breaker.stats() == {"tripped": 2, "short_circuited": 2, "failed": 4, "breaker_state": "closed"}
+
+def test_agent_skips_degraded_api(real_run):
+    """
+    OBJECTIVE: Run the analyst against a local client that goes down for a while.
+    EXPECTED RESULT: The client sees only `threshold` failing calls, later calls fall back without
+    touching it, and the first trial call after the cool-off restores normal advice.
+    """
+    clock = FakeClock()
+    client = LocalClient()
+    agent = AnalystAgent(
+        client=client, cache=None,
+        limiter=RateLimiter(requests_per_min=0, tokens_per_min=0, max_wait=0, clock=clock, sleep=clock.sleep),
+        breaker=CircuitBreaker(failure_threshold=3, cooloff=30, clock=clock)
+    )
+    client.down = True
+    results = [agent.run("BTC-USD", f"Price: {i}") for i in range(10)]
+    assert all(r["outlook"] == "NEUTRAL" for r in results)
+    assert client.calls == 3
+
+    client.down = False
+    clock.now = 30
+    assert agent.run("BTC-USD", "Price: 1")["outlook"] == "BULLISH"
+    stats = agent.guard_stats()
+    assert (stats["failed"], stats["tripped"], stats["short_circuited"]) == (3, 1, 7)
+    assert stats["breaker_state"] == "closed"
+
+def test_agent_falls_back_when_throttled(real_run):
+    """
+    OBJECTIVE: 2 requests/min and no allowed wait, 5 assets analyzed in one tick.
+    EXPECTED RESULT: Two real calls, three NEUTRAL fallbacks counted as rate-limited; the breaker stays closed.
+    """
+    clock = FakeClock()
+    client = LocalClient()
+    agent = AnalystAgent(
+        client=client, cache=None,
+        limiter=RateLimiter(requests_per_min=2, tokens_per_min=0, max_wait=0, clock=clock, sleep=clock.sleep),
+        breaker=CircuitBreaker(failure_threshold=3, cooloff=30, clock=clock)
+    )
+    outlooks = [agent.run(f"SYM{i}", "")["outlook"] for i in range(5)]
+    assert outlooks == ["BULLISH", "BULLISH", "NEUTRAL", "NEUTRAL", "NEUTRAL"]
+    assert client.calls == 2
+    stats = agent.guard_stats()
+    assert (stats["rate_limited"], stats["tripped"], stats["breaker_state"]) == (3, 0, "closed")
@@ -0,0 +1,109 @@
+# tests/unit/test_erc_allocator.py
+
+"""
+TEST SUITE: Equal Risk Contribution Allocator
+OBJECTIVE: Verify the ERC solver equalizes risk contributions under the full covariance matrix and respects caps/reserve.
+EXPECTED RESULT: Equal w_i (Cov w)_i, inverse-vol weights for a diagonal covariance, cheap warm-started re-solves.
+"""
+
+import pytest
+import numpy as np
+from utils.allocator import ERCAllocator
+
+def random_correlation(rng, n):
+    returns = rng.normal(size=(4 * n, n)) + rng.normal(size=(4 * n, 1)) # Common factor
+    return np.corrcoef(returns, rowvar=False)
+
+def risk_contributions(weights, vols, corr):
+    cov = corr * np.outer(vols, vols)
+    return weights * (cov @ weights)
+
+def test_equal_risk_contributions():
+    """
+    OBJECTIVE: 30 long assets with random vols and factor-driven correlations, no binding cap.
+    EXPECTED RESULT: Every asset contributes the same share of portfolio variance.
+    """
+    rng = np.random.default_rng(11)
+    n = 30
+    vols = rng.uniform(0.005, 0.05, n)
+    corr = random_correlation(rng, n)
+    allocator = ERCAllocator(max_position_pct=1.0, reserve_pct=0.0, tolerance=1e-12, max_iterations=100)
+    weights = allocator.allocate_vector(np.ones(n), vols, 1.0, correlation=corr)
+
+    assert weights.sum() == pytest.approx(1.0)
+    rc = risk_contributions(weights, vols, corr)
+    np.testing.assert_allclose(rc / rc.sum(), np.full(n, 1.0 / n), rtol=1e-8)
+
+def test_diagonal_covariance_is_inverse_vol():
+    """
+    OBJECTIVE: No correlation matrix.
+    EXPECTED RESULT: ERC reduces to inverse-volatility weights.
+    """
+    vols = np.array([0.01, 0.02, 0.04])
+    weights = ERCAllocator(max_position_pct=1.0, reserve_pct=0.0).allocate_vector(np.ones(3), vols, 1.0)
+    expected = (1 / vols) / (1 / vols).sum()
+    np.testing.assert_allclose(weights, expected, rtol=1e-7)
+
+def test_correlated_pair_gets_less_than_independent_asset():
+    """
+    OBJECTIVE: BTC/ETH correlated 0.9, GLD independent, equal vols.
+    EXPECTED RESULT: GLD gets the largest weight; BTC and ETH share equally.
+    """
+    corr = np.array([[1.0, 0.9, 0.0], [0.9, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    weights = ERCAllocator(max_position_pct=1.0, reserve_pct=0.0).allocate_vector(np.ones(3), np.full(3, 0.02), 1.0, corr)
+    assert weights[2] > weights[0] == pytest.approx(weights[1])
+
+def test_caps_reserve_and_long_only():
+    """
+    OBJECTIVE: Cap 30%, 5% reserve, one bearish and one neutral asset among five.
+    EXPECTED RESULT: Bearish/neutral get 0, no target exceeds 30% of investable capital, nothing exceeds the reserve.
+    """
+    rng = np.random.default_rng(4)
+    scores = np.array([1.0, 0.8, -0.5, 0.0, 1.0])
+    vols = np.array([0.001, 0.02, 0.01, 0.01, 0.03])
+    allocator = ERCAllocator(max_position_pct=0.3, reserve_pct=0.05)
+    targets = allocator.allocate_vector(scores, vols, 100000, correlation=random_correlation(rng, 5))
+    assert targets[2] == 0.0 and targets[3] == 0.0
+    assert targets.max() <= 0.3 * 95000 + 1e-6
+    assert targets.sum() <= 95000 + 1e-6
+
+def test_warm_start_converges_in_fewer_steps():
+    """
+    OBJECTIVE: Re-solve after a small covariance change, as on consecutive ticks.
+    EXPECTED RESULT: The warm-started solve needs fewer Newton steps than the cold one and lands on the same answer.
+    """
+    rng = np.random.default_rng(8)
+    n = 50
+    vols = rng.uniform(0.005, 0.05, n)
+    corr = random_correlation(rng, n)
+    allocator = ERCAllocator(max_position_pct=1.0, reserve_pct=0.0, tolerance=1e-10, max_iterations=100)
+    allocator.allocate_vector(np.ones(n), vols, 1.0, corr)
+    cold = allocator.last_iterations
+
+    vols = vols * (1 + rng.normal(0, 0.01, n))
+    warm_weights = allocator.allocate_vector(np.ones(n), vols, 1.0, corr)
+    warm = allocator.last_iterations
+
+    fresh = ERCAllocator(max_position_pct=1.0, reserve_pct=0.0, tolerance=1e-10, max_iterations=100)
+    np.testing.assert_allclose(warm_weights, fresh.allocate_vector(np.ones(n), vols, 1.0, corr), rtol=1e-7)
+    assert warm < cold
+
+def test_solver_edge_cases():
+    """
+    OBJECTIVE: Call the solver with max_iterations=0, then on a non-convex objective (negated covariance)
+    where the backtracking line search eventually finds no acceptable step.
+    EXPECTED RESULT: Zero iterations returns the start point; once the line search fails the solver stops
+    at the last accepted x, so more iterations never make the objective worse.
+    """
+    cov = np.array([[0.04, 0.01], [0.01, 0.09]])
+    start = np.array([1.0, 2.0])
+    x, iterations = ERCAllocator.solve(cov, start, max_iterations=0)
+    assert iterations == 0
+    np.testing.assert_array_equal(x, start)
+
+    concave = -10 * cov
+    objective = lambda y: 0.5 * y @ concave @ y - 0.5 * np.log(y).sum()
+    values = [objective(ERCAllocator.solve(concave, start, max_iterations=k)[0]) for k in range(8)]
+    assert all(later <= earlier for earlier, later in zip(values, values[1:]))
+    stopped, iterations = ERCAllocator.solve(concave, start, max_iterations=50)
+    assert iterations < 50 and np.all(stopped > 0)
@@ -0,0 +1,81 @@
+# tests/unit/test_lazy_arbiter.py
+
+"""
+TEST SUITE: Lazy Closed-Form Sentiment Decay
+OBJECTIVE: Verify the event-driven arbiter matches DecisionArbiter while only touching assets with new signals.
+EXPECTED RESULT: Same scores (up to float rounding), same snap-to-zero ticks, untouched assets are never rewritten.
+"""
+
+import pytest
+import numpy as np
+from utils.advice import Advice
+from utils.arbiter import DecisionArbiter, LazyDecayArbiter
+
+OUTLOOKS = ["BULLISH", "BEARISH", "NEUTRAL"]
+
+@pytest.mark.parametrize("smoothing, threshold", [(0.3, 0.6), (1.0, 0.0)])
+def test_matches_dict_arbiter(smoothing, threshold):
+    """
+    OBJECTIVE: 300 ticks of sparse random advice (10% of 40 assets per tick), same seeded memory.
+    EXPECTED RESULT: Scores agree to 1e-12 on every tick and are exactly 0.0 on the same ticks.
+    """
+    rng = np.random.default_rng(3)
+    assets = [f"SYM{j}" for j in range(40)]
+    reference = DecisionArbiter(threshold, smoothing)
+    lazy = LazyDecayArbiter(threshold, smoothing)
+    for asset in assets:
+        reference.sentiment_memory[asset] = lazy.sentiment_memory[asset] = float(rng.uniform(-1, 1))
+
+    for tick in range(300):
+        advice = [
+            Advice(tick, asset, "A", OUTLOOKS[rng.integers(0, 3)], float(rng.random()), "", {})
+            for asset in assets if rng.random() < 0.1
+        ]
+        expected = reference.aggregate_advice(advice)
+        scores = dict(lazy.aggregate_advice(advice))
+        assert scores.keys() == expected.keys()
+        for asset, score in expected.items():
+            assert scores[asset] == pytest.approx(score, abs=1e-12)
+            assert (scores[asset] == 0.0) == (score == 0.0)
+
+def test_ghost_asset_decay_on_read():
+    """
+    OBJECTIVE: Seed BTC at 1.0 and run ticks with no advice.
+    EXPECTED RESULT: 0.8 after one tick, 0.8**k after k, snapped to 0.0 once below 0.05; the stored entry is untouched.
+    """
+    arbiter = LazyDecayArbiter(smoothing_factor=1.0)
+    arbiter.sentiment_memory["BTC"] = 1.0
+    assert arbiter.aggregate_advice([])["BTC"] == 0.8
+    for _ in range(4):
+        scores = arbiter.aggregate_advice([])
+    assert scores["BTC"] == pytest.approx(0.8 ** 5)
+    for _ in range(8):
+        scores = arbiter.aggregate_advice([])
+    assert scores["BTC"] == pytest.approx(0.8 ** 13) # 0.055
+    assert arbiter.aggregate_advice([])["BTC"] == 0.0 # 0.8**14 = 0.044 snaps to neutral
+    assert arbiter.sentiment_memory.entries["BTC"] == (1.0, 0)
+
+def test_hysteresis_holds_without_decay():
+    """
+    OBJECTIVE: A small move inside the hysteresis band after some decay.
+    EXPECTED RESULT: The held score is the decayed value and does not decay on the tick it was held.
+    """
+    arbiter = LazyDecayArbiter(confidence_threshold=0.0, smoothing_factor=1.0)
+    arbiter.sentiment_memory["BTC"] = 0.5
+    arbiter.aggregate_advice([]) # 0.4
+    scores = arbiter.aggregate_advice([Advice(2, "BTC", "A", "BULLISH", 0.45, "", {})])
+    assert scores["BTC"] == pytest.approx(0.4)
+    assert arbiter.aggregate_advice([])["BTC"] == pytest.approx(0.32)
+
+def test_tick_cost_touches_only_signals():
+    """
+    OBJECTIVE: 10,000 remembered assets and one signal per tick.
+    EXPECTED RESULT: Only the advised asset's entry is rewritten.
+    """
+    arbiter = LazyDecayArbiter(confidence_threshold=0.0, smoothing_factor=1.0)
+    for j in range(10_000):
+        arbiter.sentiment_memory[f"SYM{j}"] = 0.9
+    before = dict(arbiter.sentiment_memory.entries)
+    arbiter.aggregate_advice([Advice(1, "SYM0", "A", "BEARISH", 0.9, "", {})])
+    changed = [a for a, entry in arbiter.sentiment_memory.entries.items() if before[a] != entry]
+    assert changed == ["SYM0"]
@@ -0,0 +1,157 @@
+# tests/unit/test_llm_cache.py
+
+"""
+TEST SUITE: Analyst Response Cache
+OBJECTIVE: Verify bucketed keys, TTL, LRU bounds, hit/miss counters and the on-disk store of AdviceCache.
+EXPECTED RESULT: Near-identical prompts are served from cache and a repeated backtest makes no client calls.
+"""
+
+import json
+import pytest
+from types import SimpleNamespace
+from agents.analyst import AnalystAgent
+from agents.llm_cache import AdviceCache
+
+REAL_RUN = AnalystAgent.run # Captured before conftest mocks it
+
+class CountingClient:
+    """Stands in for groq.Groq and counts completions."""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("upstream 503")
+        content = json.dumps({"outlook": "BEARISH", "confidence": 0.8, "reasoning": "cached?"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+@pytest.fixture
+def real_run(monkeypatch):
+    monkeypatch.setattr(AnalystAgent, "run", REAL_RUN)
+
+def memory_cache(**kwargs):
+    defaults = dict(max_entries=100, ttl_ticks=0, ttl_seconds=0, bucket_pct=0.005, path="")
+    defaults.update(kwargs)
+    return AdviceCache(**defaults)
+
+def test_context_bucketing():
+    """
+    OBJECTIVE: Key prices 0.02% and 3% apart.
+    EXPECTED RESULT: The close pair shares a key, the far one does not; symbol and model stay distinct.
+    """
+    cache = memory_cache()
+    base = cache.key("m", "BTC-USD", "Price: 50000.0")
+    assert cache.key("m", "BTC-USD", "Price:  50010.0") == base
+    assert cache.key("m", "BTC-USD", "Price: 51500.0") != base
+    assert cache.key("m", "ETH-USD", "Price: 50000.0") != base
+    assert cache.key("other", "BTC-USD", "Price: 50000.0") != base
+
+def test_ttl_in_ticks_and_seconds(monkeypatch):
+    """
+    OBJECTIVE: Store an entry at tick 0 with a 10-tick TTL, then a 60s TTL.
+    EXPECTED RESULT: Hit before expiry, miss after; counters track both.
+    """
+    cache = memory_cache(ttl_ticks=10)
+    cache.put("k", {"outlook": "BULLISH"}, tick=0)
+    assert cache.get("k", tick=9) == {"outlook": "BULLISH"}
+    assert cache.get("k", tick=10) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    now = [1000.0]
+    monkeypatch.setattr("agents.llm_cache.time.time", lambda: now[0])
+    cache = memory_cache(ttl_seconds=60)
+    cache.put("k", {"outlook": "BULLISH"})
+    now[0] += 59
+    assert cache.get("k") is not None
+    now[0] += 1
+    assert cache.get("k") is None
+
+def test_lru_bound():
+    """
+    OBJECTIVE: Insert 3 entries into a 2-entry cache after touching the oldest.
+    EXPECTED RESULT: The least recently used entry is evicted.
+    """
+    cache = memory_cache(max_entries=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    cache.get("a")
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1} and cache.get("c") == {"v": 3}
+    assert cache.stats()["entries"] == 2
+
+def test_agent_reuses_cached_advice(real_run):
+    """
+    OBJECTIVE: Ask the agent twice for near-identical prices, then with a failing client.
+    EXPECTED RESULT: One client call for the pair; fallbacks are never cached.
+    """
+    client = CountingClient()
+    agent = AnalystAgent(client=client, cache=memory_cache())
+    first = agent.run("BTC-USD", "Price: 50000.0")
+    second = agent.run("BTC-USD", "Price: 50010.0")
+    assert first == second and client.calls == 1
+    assert agent.cache.stats()["hit_rate"] == 0.5
+
+    failing = AnalystAgent(client=CountingClient(fail=True), cache=memory_cache())
+    failing.run("BTC-USD", "Price: 1")
+    failing.run("BTC-USD", "Price: 1")
+    assert failing.client.calls == 2
+
+def test_disk_store_skips_network_on_replay(real_run, tmp_path):
+    """
+    OBJECTIVE: Run the same 5 ticks twice with a shared SQLite cache file and fresh agents.
+    EXPECTED RESULT: The second "backtest" makes zero client calls.
+    """
+    path = str(tmp_path / "advice.sqlite")
+
+    def backtest():
+        client = CountingClient()
+        agent = AnalystAgent(client=client, cache=memory_cache(path=path, ttl_ticks=20))
+        for tick in range(5):
+            agent.tick_id = tick * 20
+            agent.run("ETH-USD", f"Price: {3000 + tick * 100}")
+        return client.calls
+
+    assert backtest() == 5
+    assert backtest() == 0
+
+def test_disk_store_replays_refreshed_entries(real_run, tmp_path):
+    """
+    OBJECTIVE: Ask for the same context on 30 consecutive ticks with ttl_ticks=10, so the entry is refreshed
+    at ticks 10 and 20, then rerun the same backtest against the SQLite file.
+    EXPECTED RESULT: The first run makes 3 calls; the rerun makes none, because the refreshes went to later
+    tick buckets instead of replacing the tick-0 entry.
+    """
+    path = str(tmp_path / "advice.sqlite")
+
+    def backtest():
+        client = CountingClient()
+        agent = AnalystAgent(client=client, cache=memory_cache(path=path, ttl_ticks=10))
+        for tick in range(30):
+            agent.tick_id = tick
+            agent.run("ETH-USD", "Price: 3000")
+        return client.calls
+
+    assert backtest() == 3
+    assert backtest() == 0
+
+def test_disk_store_is_bounded(tmp_path, monkeypatch):
+    """
+    OBJECTIVE: Store 40 distinct entries with disk_max_entries=10, pruning every 8 writes.
+    EXPECTED RESULT: The file never holds more than 10 + 8 rows and keeps the newest ones; reopening prunes to 10.
+    """
+    import sqlite3
+    monkeypatch.setattr(AdviceCache, "PRUNE_EVERY", 8)
+    path = str(tmp_path / "advice.sqlite")
+    cache = memory_cache(path=path, disk_max_entries=10)
+    for i in range(40):
+        cache.put(cache.key("m", f"SYM{i}", "ctx"), {"outlook": "NEUTRAL"}, tick=i)
+        assert sqlite3.connect(path).execute("SELECT COUNT(*) FROM advice").fetchone()[0] <= 18
+
+    memory_cache(path=path, disk_max_entries=10)
+    rows = sqlite3.connect(path).execute("SELECT tick FROM advice ORDER BY tick").fetchall()
+    assert [tick for (tick,) in rows] == list(range(30, 40))
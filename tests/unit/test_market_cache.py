@@ -0,0 +1,86 @@
+# tests/unit/test_market_cache.py
+
+"""
+TEST SUITE: Persistent Market Data Cache
+OBJECTIVE: Verify downloads are cached on disk, overlapping ranges only fetch the missing tail, and the cache is size-bounded.
+EXPECTED RESULT: Warm reads make no network calls and old entries are evicted first.
+"""
+
+import pytest
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from simulation.cache import MarketDataCache
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+class FakeFetcher:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, symbol, start, end):
+        self.calls.append((symbol, start, end))
+        ts = pd.date_range(start, end, freq="1h", tz="UTC")
+        return pd.DataFrame({"datetime": ts, "close": [float(t.hour) for t in ts], "volume": 1.0})
+
+def test_warm_read_skips_network(tmp_path):
+    """
+    OBJECTIVE: Request the same range twice.
+    EXPECTED RESULT: Only the first request reaches the fetcher; both return identical frames.
+    """
+    fetch = FakeFetcher()
+    cache = MarketDataCache(root=str(tmp_path), max_bytes=10**8, ttl_seconds=0)
+    first = cache.get("BTC-USD", "1h", T0, T0 + timedelta(days=1), fetch)
+    second = cache.get("BTC-USD", "1h", T0, T0 + timedelta(days=1), fetch)
+
+    assert len(fetch.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+    # A fresh cache instance (new process) reads the manifest from disk
+    reopened = MarketDataCache(root=str(tmp_path), max_bytes=10**8, ttl_seconds=0, offline=True)
+    assert len(reopened.get("BTC-USD", "1h", T0, T0 + timedelta(days=1), fetch)) == len(first)
+    assert len(fetch.calls) == 1
+
+def test_overlapping_range_fetches_tail_only(tmp_path):
+    """
+    OBJECTIVE: Extend a cached range by one day.
+    EXPECTED RESULT: The fetcher is asked only for the missing tail and the result spans both days.
+    """
+    fetch = FakeFetcher()
+    cache = MarketDataCache(root=str(tmp_path), max_bytes=10**8, ttl_seconds=0)
+    cache.get("ETH-USD", "1h", T0, T0 + timedelta(days=1), fetch)
+    df = cache.get("ETH-USD", "1h", T0, T0 + timedelta(days=2), fetch)
+
+    assert len(fetch.calls) == 2
+    _, tail_start, tail_end = fetch.calls[1]
+    assert tail_start == T0 + timedelta(days=1)
+    assert tail_end == T0 + timedelta(days=2)
+    assert df["datetime"].is_unique
+    assert len(df) == 49
+
+def test_fresh_entry_serves_without_network(tmp_path):
+    """
+    OBJECTIVE: Request a slightly later end time within the freshness TTL.
+    EXPECTED RESULT: Cached rows are served and the fetcher is not called again.
+    """
+    fetch = FakeFetcher()
+    cache = MarketDataCache(root=str(tmp_path), max_bytes=10**8, ttl_seconds=3600)
+    cache.get("SOL-USD", "1h", T0, T0 + timedelta(days=1), fetch)
+    cache.get("SOL-USD", "1h", T0, T0 + timedelta(days=1, minutes=5), fetch)
+    assert len(fetch.calls) == 1
+
+def test_size_bounded_eviction(tmp_path):
+    """
+    OBJECTIVE: Fill the cache past its byte budget.
+    EXPECTED RESULT: The least recently accessed symbol is evicted; the newest survives.
+    """
+    fetch = FakeFetcher()
+    cache = MarketDataCache(root=str(tmp_path), max_bytes=10**8, ttl_seconds=0)
+    cache.get("AAPL", "1h", T0, T0 + timedelta(days=1), fetch)
+    one_entry = cache.size_bytes()
+
+    cache.max_bytes = int(one_entry * 1.5)
+    cache.get("MSFT", "1h", T0, T0 + timedelta(days=1), fetch)
+
+    assert "AAPL|1h" not in cache.manifest
+    assert "MSFT|1h" in cache.manifest
+    assert cache.size_bytes() <= cache.max_bytes
@@ -0,0 +1,157 @@
+# tests/unit/test_parallel_loader.py
+
+"""
+TEST SUITE: Parallel Market Data Loading
+OBJECTIVE: Verify concurrent symbol loading is deterministic, retries transient failures, and tolerates partial failures.
+EXPECTED RESULT: Identical aligned output regardless of completion order; failed symbols are reported, not fatal.
+"""
+
+import time
+import random
+import pytest
+import numpy as np
+import pandas as pd
+from simulation.loader import ParallelLoader, PermanentFetchError
+from simulation.market import MarketReplay
+
+def frame_for(symbol, n=50):
+    seed = sum(map(ord, symbol))
+    ts = pd.date_range("2024-01-01", periods=n, freq="5min", tz="UTC")
+    return pd.DataFrame({"datetime": ts, "close": 100.0 + np.arange(n) + seed, "volume": 1.0})
+
+def test_deterministic_order_under_jitter():
+    """
+    OBJECTIVE: Load symbols whose fetches complete in random order.
+    EXPECTED RESULT: Frames are keyed in input order on every run.
+    """
+    symbols = [f"SYM{i}" for i in range(20)]
+
+    def jittery_fetch(symbol):
+        time.sleep(random.uniform(0, 0.01))
+        return frame_for(symbol)
+
+    loader = ParallelLoader(jittery_fetch, max_workers=8, timeout=5, retries=0, backoff=0)
+    first, _ = loader.load(symbols)
+    second, _ = loader.load(symbols)
+    assert list(first) == symbols
+    assert list(second) == symbols
+
+def test_retry_then_partial_failure():
+    """
+    OBJECTIVE: One symbol fails once, another always fails, a third hangs past its timeout.
+    EXPECTED RESULT: The flaky symbol is retried and loaded; the others are reported as failures.
+    """
+    calls = {"FLAKY": 0}
+
+    def fetch(symbol):
+        if symbol == "FLAKY":
+            calls["FLAKY"] += 1
+            if calls["FLAKY"] == 1:
+                raise ConnectionError("reset by peer")
+        if symbol == "DEAD":
+            return pd.DataFrame()
+        if symbol == "SLOW":
+            time.sleep(0.5)
+        return frame_for(symbol)
+
+    loader = ParallelLoader(fetch, max_workers=4, timeout=0.1, retries=1, backoff=0)
+    frames, failures = loader.load(["OK", "FLAKY", "DEAD", "SLOW"])
+
+    assert list(frames) == ["OK", "FLAKY"]
+    assert calls["FLAKY"] == 2
+    assert failures["DEAD"] == "no data returned"
+    assert "timed out" in failures["SLOW"]
+
+def test_unfixable_failures_are_not_retried():
+    """
+    OBJECTIVE: With 2 retries and a 1s backoff, one symbol returns an empty frame and one raises PermanentFetchError.
+    EXPECTED RESULT: Each is fetched once and reported straight away, without waiting out any backoff.
+    """
+    calls = {}
+
+    def fetch(symbol):
+        calls[symbol] = calls.get(symbol, 0) + 1
+        if symbol == "EMPTY":
+            return pd.DataFrame()
+        if symbol == "MISSING":
+            raise PermanentFetchError("MISSING (5m) is not in the offline market cache")
+        return frame_for(symbol)
+
+    loader = ParallelLoader(fetch, max_workers=4, timeout=5, retries=2, backoff=1.0)
+    start = time.monotonic()
+    frames, failures = loader.load(["OK", "EMPTY", "MISSING"])
+    assert time.monotonic() - start < 0.5
+    assert list(frames) == ["OK"]
+    assert calls == {"OK": 1, "EMPTY": 1, "MISSING": 1}
+    assert failures == {"EMPTY": "no data returned", "MISSING": "MISSING (5m) is not in the offline market cache"}
+
+def test_backoff_does_not_hold_a_worker():
+    """
+    OBJECTIVE: One worker; the first symbol fails once and is retried after a 0.3s backoff.
+    EXPECTED RESULT: The other symbols load during the backoff instead of queueing behind a sleeping worker.
+    """
+    fetched = []
+
+    def fetch(symbol):
+        fetched.append((symbol, time.monotonic()))
+        if symbol == "FLAKY" and len([s for s, _ in fetched if s == "FLAKY"]) == 1:
+            raise ConnectionError("reset by peer")
+        return frame_for(symbol)
+
+    loader = ParallelLoader(fetch, max_workers=1, timeout=5, retries=1, backoff=0.3)
+    start = time.monotonic()
+    frames, failures = loader.load(["FLAKY", "A", "B"])
+    assert list(frames) == ["FLAKY", "A", "B"] and not failures
+    assert [s for s, _ in fetched] == ["FLAKY", "A", "B", "FLAKY"]
+    assert fetched[2][1] - start < 0.2 # A and B did not wait for FLAKY's backoff
+
+def test_market_replay_drops_failed_assets(monkeypatch):
+    """
+    OBJECTIVE: Run MarketReplay's loader with one unavailable symbol.
+    EXPECTED RESULT: The load completes, the symbol is dropped and recorded in load_failures.
+    """
+    monkeypatch.setattr("config.config.DATA_LOAD_RETRIES", 0)
+
+    def fake_fetch(self, symbol, days):
+        return pd.DataFrame() if symbol == "GONE" else frame_for(symbol)
+
+    monkeypatch.setattr(MarketReplay, "_fetch_asset_data", fake_fetch)
+    market = MarketReplay(assets=["BTC-USD", "GONE", "AAPL"])
+
+    assert market.assets == ["BTC-USD", "AAPL"]
+    assert "GONE" in market.load_failures
+    assert market.store.close.shape == (50, 2)
+
+def test_concurrent_downloads_leave_stdout_alone(monkeypatch):
+    """
+    OBJECTIVE: Load 10 symbols through MarketReplay._download on 8 workers with a stubbed yf.download
+    whose calls overlap and log failures.
+    EXPECTED RESULT: Every symbol loads, sys.stdout/sys.stderr are untouched, and printing afterwards works.
+    """
+    import sys
+    import logging
+    import itertools
+    import threading
+    monkeypatch.setattr("config.config.MARKET_CACHE_ENABLED", False)
+    monkeypatch.setattr("config.config.DATA_LOAD_WORKERS", 8)
+    stdout, stderr = sys.stdout, sys.stderr
+    barrier = threading.Barrier(8, timeout=5)
+    calls = itertools.count()
+    streams = []
+
+    def fake_download(symbol, **kwargs):
+        if next(calls) < 8:
+            barrier.wait() # Force the first 8 downloads to overlap
+        streams.append((sys.stdout, sys.stderr))
+        logging.getLogger("yfinance").error("1 Failed download: %s", symbol)
+        frame = frame_for(symbol).rename(columns={"datetime": "Datetime", "close": "Close", "volume": "Volume"})
+        return frame.set_index("Datetime")
+
+    monkeypatch.setattr("simulation.market.yf.download", fake_download)
+    symbols = [f"SYM{i}" for i in range(10)]
+    market = MarketReplay(assets=symbols)
+
+    assert market.assets == symbols and not market.load_failures
+    assert all(s == (stdout, stderr) for s in streams)
+    assert (sys.stdout, sys.stderr) == (stdout, stderr)
+    print("stdout still open")
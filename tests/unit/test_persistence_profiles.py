@@ -0,0 +1,143 @@
+# tests/unit/test_persistence_profiles.py
+
+"""
+TEST SUITE: Persistence Profiles
+OBJECTIVE: Verify PERSIST_PROFILE selects which rows a run writes, from a full audit trail down to nothing.
+EXPECTED RESULT: Each profile stores exactly its row set; decisions and portfolio math are unaffected.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from database.models import MarketData, LLMAdvice, Order, PortfolioState
+from database.profile import PersistenceProfile
+
+TICKS = 30
+
+def test_profile_rules():
+    """
+    OBJECTIVE: Query every profile for market data, advice, orders and portfolio rows.
+    EXPECTED RESULT: Rules match the documented row sets; "-only" aliases resolve and unknown names raise.
+    """
+    full = PersistenceProfile("full", persist_advice=True)
+    assert full.market_data(3) and full.advice(3, "Quant") and full.orders() and full.portfolio(3, traded=False)
+
+    decisions = PersistenceProfile("decisions", persist_advice=True)
+    assert not decisions.market_data(3) and decisions.orders()
+    assert decisions.advice(3, "LLM_Analyst") and not decisions.advice(3, "Quant")
+    assert decisions.portfolio(3, traded=True) and not decisions.portfolio(3, traded=False)
+
+    sampled = PersistenceProfile("sampled", sample_every=5, persist_advice=True)
+    assert [t for t in range(1, 16) if sampled.market_data(t)] == [5, 10, 15]
+    assert sampled.orders() and not sampled.portfolio(4, traded=True)
+
+    summary = PersistenceProfile("summary", persist_advice=True)
+    assert summary.run_record and summary.summary and not summary.orders() and not summary.market_data(10)
+
+    none = PersistenceProfile("none", persist_advice=True)
+    assert not none.run_record and not none.summary and not none.risk()
+
+    assert PersistenceProfile("summary-only").name == "summary"
+    assert PersistenceProfile("Decisions-Only").name == "decisions"
+    with pytest.raises(ValueError, match="decision"):
+        PersistenceProfile("decision")
+    assert not PersistenceProfile("full", persist_advice=False).advice(1, "LLM_Analyst")
+
+def run_engine(profile, monkeypatch, loop=False):
+    """Runs TICKS ticks over 3 assets against an in-memory SQLite database; returns (engine, row counts)."""
+    from config import config
+    from simulation.engine import SimulationEngine
+    db = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(db)
+    monkeypatch.setattr(config, "PERSIST_PROFILE", profile)
+    monkeypatch.setattr(config, "PERSIST_SAMPLE_EVERY", 10)
+    monkeypatch.setattr(config, "ANALYST_SCHEDULE", "aligned")
+    monkeypatch.setattr("simulation.engine.engine", db)
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    engine = SimulationEngine(load_data=False)
+    engine.analyst.run = lambda symbol, context="": {"outlook": "BULLISH", "confidence": 0.9, "reasoning": "up"}
+    engine.market.assets = ["BTC-USD", "ETH-USD", "SOL-USD"]
+    rng = np.random.default_rng(11)
+    engine.market.data = {a: pd.DataFrame({"close": 100 + rng.normal(0, 1, TICKS).cumsum()}) for a in engine.market.assets}
+    if loop:
+        engine.start_loop()
+    else:
+        while engine.run_tick():
+            pass
+
+    with Session(db) as session:
+        counts = {
+            "market": len(session.exec(select(MarketData)).all()),
+            "quant": len(session.exec(select(LLMAdvice).where(LLMAdvice.advisor_name == "Quant")).all()),
+            "llm": len(session.exec(select(LLMAdvice).where(LLMAdvice.advisor_name == "LLM_Analyst")).all()),
+            "orders": sorted({o.tick_id for o in session.exec(select(Order))}),
+            "portfolio": [s.tick_id for s in session.exec(select(PortfolioState))]
+        }
+    return engine, counts
+
+@patch("simulation.engine.SimulationEngine._start_run_record")
+@patch("simulation.engine.init_db")
+def test_full_and_decisions_profiles(mock_init, mock_record, monkeypatch):
+    """
+    OBJECTIVE: Run the same 30 ticks under "full" and "decisions".
+    EXPECTED RESULT: full stores everything; decisions keeps the same orders and LLM advice, portfolio
+    states only on traded ticks, and no market data or quant advice. Final equity is identical.
+    """
+    full_engine, full = run_engine("full", monkeypatch)
+    assert (full["market"], full["quant"], len(full["portfolio"])) == (90, 90, TICKS)
+    assert full["orders"] and full["llm"] > 0
+
+    dec_engine, decisions = run_engine("decisions", monkeypatch)
+    assert (decisions["market"], decisions["quant"]) == (0, 0)
+    assert decisions["llm"] == full["llm"]
+    assert decisions["orders"] == full["orders"] == decisions["portfolio"]
+    assert dec_engine.portfolio["total_equity"] == full_engine.portfolio["total_equity"]
+
+@patch("simulation.engine.SimulationEngine._start_run_record")
+@patch("simulation.engine.init_db")
+def test_sampled_profile(mock_init, mock_record, monkeypatch):
+    """
+    OBJECTIVE: Run 30 ticks with PERSIST_PROFILE=sampled and PERSIST_SAMPLE_EVERY=10.
+    EXPECTED RESULT: Market data, quant advice and portfolio state exist for ticks 10, 20 and 30 only; orders are kept.
+    """
+    _, full = run_engine("full", monkeypatch)
+    _, sampled = run_engine("sampled", monkeypatch)
+    assert (sampled["market"], sampled["quant"]) == (9, 9)
+    assert sampled["portfolio"] == [10, 20, 30]
+    assert sampled["orders"] == full["orders"]
+
+@patch("simulation.engine.SimulationEngine._start_run_record")
+@patch("simulation.engine.init_db")
+def test_summary_and_none_profiles(mock_init, mock_record, monkeypatch):
+    """
+    OBJECTIVE: Run the loop under "summary" and "none".
+    EXPECTED RESULT: summary stores only the final portfolio state; none stores nothing and opens no session.
+    """
+    _, summary = run_engine("summary", monkeypatch, loop=True)
+    assert summary == {"market": 0, "quant": 0, "llm": 0, "orders": [], "portfolio": [TICKS]}
+
+    session_cls = MagicMock()
+    monkeypatch.setattr("simulation.engine.Session", session_cls)
+    engine, none = run_engine("none", monkeypatch, loop=True)
+    assert none == {"market": 0, "quant": 0, "llm": 0, "orders": [], "portfolio": []}
+    session_cls.assert_not_called()
+    assert engine.tick_id == TICKS
+
+@patch("simulation.engine.init_db")
+def test_none_profile_skips_run_record(mock_init, monkeypatch):
+    """
+    OBJECTIVE: Construct an engine with load_data=True under "none" (market loading stubbed).
+    EXPECTED RESULT: Neither init_db nor the SimulationRun record is touched.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "PERSIST_PROFILE", "none")
+    monkeypatch.setattr("simulation.market.MarketReplay._load_all_data", lambda self, days: None)
+    with patch.object(SimulationEngine, "_start_run_record") as record:
+        SimulationEngine(load_data=True)
+    mock_init.assert_not_called()
+    record.assert_not_called()
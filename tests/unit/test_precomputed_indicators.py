@@ -0,0 +1,89 @@
+# tests/unit/test_precomputed_indicators.py
+
+"""
+TEST SUITE: Precomputed Indicator Panels (Vectorized Backtest Mode)
+OBJECTIVE: Verify the whole-run RSI/volatility panels are look-ahead safe and reproduce the incremental engine path.
+EXPECTED RESULT: Bit-identical quant advice; volatilities and allocations equal up to floating-point rounding.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from simulation.panel import IndicatorPanel
+from simulation.store import TickStore
+
+ASSETS = ["BTC-USD", "ETH-USD", "AAPL"]
+
+def price_frames(n_ticks=90, seed=5):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_ticks, len(ASSETS))), axis=0))
+    ts = pd.date_range("2024-01-01", periods=n_ticks, freq="5min", tz="UTC")
+    return {a: pd.DataFrame({"datetime": ts, "close": closes[:, j], "volume": 1.0}) for j, a in enumerate(ASSETS)}
+
+def test_panel_is_look_ahead_safe():
+    """
+    OBJECTIVE: Rebuild the panel after rewriting the second half of the price history.
+    EXPECTED RESULT: Rows for the untouched first half are unchanged.
+    """
+    frames = price_frames()
+    before = IndicatorPanel.build(TickStore.from_frames(ASSETS, frames))
+    for df in frames.values():
+        df.loc[45:, "close"] *= 3.0
+    after = IndicatorPanel.build(TickStore.from_frames(ASSETS, frames))
+
+    np.testing.assert_array_equal(before.rsi[:45], after.rsi[:45])
+    np.testing.assert_array_equal(before.volatility[:45], after.volatility[:45])
+    assert not np.array_equal(before.rsi[45:], after.rsi[45:])
+
+def run_engine(monkeypatch, mode):
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "INDICATOR_MODE", mode)
+    engine = SimulationEngine(load_data=False)
+    engine._persist_portfolio = MagicMock()
+    engine.market.assets = list(ASSETS)
+    engine.market.data = price_frames()
+
+    decisions = []
+    allocate = engine.allocator.allocate
+    def record(scores, vols, equity, **kwargs):
+        targets = allocate(scores, vols, equity, **kwargs)
+        decisions.append((dict(scores), np.array(vols).tolist(), dict(targets)))
+        return targets
+    engine.allocator.allocate = record
+
+    quant = []
+    run_quant = engine._run_quant
+    engine._run_quant = lambda tick: quant.append(run_quant(tick)) or quant[-1]
+
+    while engine.run_tick():
+        pass
+    return quant, decisions, engine.portfolio
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_bit_identical_decisions(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Replay the same 90-tick history in incremental and precomputed mode.
+    EXPECTED RESULT: Every quant advice and sentiment score is exactly equal; volatilities, target
+    allocations and the final portfolio agree to floating-point rounding (the panel sums windows differently).
+    """
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    quant_inc, decisions_inc, portfolio_inc = run_engine(monkeypatch, "incremental")
+    quant_pre, decisions_pre, portfolio_pre = run_engine(monkeypatch, "precomputed")
+
+    assert len(decisions_inc) == 90
+    assert quant_inc == quant_pre
+    for (scores_inc, vols_inc, targets_inc), (scores_pre, vols_pre, targets_pre) in zip(decisions_inc, decisions_pre):
+        assert scores_inc == scores_pre
+        np.testing.assert_allclose(vols_pre, vols_inc, rtol=1e-9)
+        assert targets_pre.keys() == targets_inc.keys()
+        for asset, target in targets_inc.items():
+            assert targets_pre[asset] == pytest.approx(target, rel=1e-9, abs=1e-9)
+    assert portfolio_pre["total_equity"] == pytest.approx(portfolio_inc["total_equity"], rel=1e-9)
+    assert portfolio_pre["holdings"].keys() == portfolio_inc["holdings"].keys()
+    for asset, quantity in portfolio_inc["holdings"].items():
+        assert portfolio_pre["holdings"][asset] == pytest.approx(quantity, rel=1e-9, abs=1e-9)
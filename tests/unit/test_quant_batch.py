@@ -0,0 +1,119 @@
+# tests/unit/test_quant_batch.py
+
+"""
+TEST SUITE: Batched Cross-Asset Quant Signals
+OBJECTIVE: Verify QuantAgent.run_batch scores the whole universe from the close matrix exactly like the per-asset path.
+EXPECTED RESULT: Identical outlooks, confidences and RSI for every asset on every tick.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from agents.quant import QuantAgent
+from simulation.market import MarketReplay
+
+def price_matrix(n_ticks, n_assets, seed=3):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_ticks, n_assets)), axis=0))
+
+def test_batch_matches_per_asset():
+    """
+    OBJECTIVE: Replay 120 ticks for 6 assets through run_batch and per-asset run().
+    EXPECTED RESULT: batch_advice() equals run() for every asset and tick.
+    """
+    closes = price_matrix(120, 6)
+    symbols = [f"A{j}" for j in range(6)]
+    batch_agent, single_agent = QuantAgent(), QuantAgent()
+
+    for i in range(1, len(closes) + 1):
+        batch = batch_agent.run_batch(symbols, closes[:i])
+        for j, symbol in enumerate(symbols):
+            expected = single_agent.run(symbol, pd.DataFrame({"close": closes[:i, j]}))
+            assert QuantAgent.batch_advice(batch, j) == expected
+
+def test_batch_state_resets_on_new_matrix():
+    """
+    OBJECTIVE: Call run_batch with an unrelated matrix after state has been built.
+    EXPECTED RESULT: Output equals that of a fresh agent.
+    """
+    symbols = ["A", "B"]
+    agent = QuantAgent()
+    agent.run_batch(symbols, price_matrix(40, 2, seed=1))
+    other = price_matrix(40, 2, seed=2)
+    np.testing.assert_array_equal(agent.run_batch(symbols, other)["rsi"], QuantAgent().run_batch(symbols, other)["rsi"])
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_engine_uses_batch_path(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Run engine ticks on a replay market.
+    EXPECTED RESULT: Quant advice comes from run_batch, never the per-asset run().
+    """
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    engine = SimulationEngine(load_data=False)
+    engine._persist_portfolio = MagicMock()
+    closes = price_matrix(30, 2)
+    engine.market.assets = ["BTC-USD", "ETH-USD"]
+    engine.market.data = {a: pd.DataFrame({"close": closes[:, j]}) for j, a in enumerate(engine.market.assets)}
+    engine.quant.run = MagicMock(side_effect=AssertionError("per-asset path used"))
+    batch_spy = MagicMock(wraps=engine.quant.run_batch)
+    engine.quant.run_batch = batch_spy
+
+    for _ in range(25):
+        assert engine.run_tick()
+    assert batch_spy.call_count == 25
+
+def test_stale_closes_skip_rsi():
+    """
+    OBJECTIVE: Asset 1 is forward-filled and flagged stale for 30 of 120 ticks.
+    EXPECTED RESULT: Its batch RSI equals an RSI over its fresh closes only; the per-asset path
+    (frames carrying a "stale" column) agrees with the batch path.
+    """
+    from agents.quant import WilderRSI
+    closes = price_matrix(120, 2)
+    stale = np.zeros(closes.shape, dtype=bool)
+    stale[50:80, 1] = True
+    closes[50:80, 1] = closes[49, 1]
+
+    batch = QuantAgent().run_batch(["A", "B"], closes, stale)
+    reference = WilderRSI()
+    for close in closes[~stale[:, 1], 1]:
+        reference.update(float(close))
+    assert batch["rsi"][1] == reference.value
+
+    frame = pd.DataFrame({"close": closes[:, 1], "stale": stale[:, 1]})
+    assert QuantAgent(incremental=True).run("B", frame) == QuantAgent.batch_advice(batch, 1)
+
+@pytest.mark.parametrize("real", [1, 3, 5])
+def test_mostly_stale_frame_is_insufficient_history(real):
+    """
+    OBJECTIVE: A 25-row frame where only the first `real` closes are real (rising) and the rest are
+    forward-filled and flagged stale, as for an equity whose first session in the window was partial.
+    EXPECTED RESULT: The ta path, the incremental path and the batch path all return NEUTRAL with zero
+    confidence instead of an RSI-100 sell signal; the RSI state reports NaN until it has `window` closes.
+    """
+    from agents.quant import WilderRSI, BatchWilderRSI
+    closes = np.full(25, 100.0 + real - 1)
+    closes[:real] = 100.0 + np.arange(real)
+    stale = np.arange(25) >= real
+    frame = pd.DataFrame({"close": closes, "stale": stale})
+    insufficient = {"outlook": "NEUTRAL", "confidence": 0.0, "reasoning": "Insufficient history"}
+
+    assert QuantAgent(incremental=False).run("IPO", frame) == insufficient
+    assert QuantAgent(incremental=True).run("IPO", frame) == insufficient
+    batch = QuantAgent().run_batch(["IPO", "BTC"], np.column_stack([closes, price_matrix(25, 1)[:, 0]]),
+                                   np.column_stack([stale, np.zeros(25, dtype=bool)]))
+    assert QuantAgent.batch_advice(batch, 0) == insufficient
+    assert list(batch["history"]) == [real, 25]
+    assert QuantAgent.batch_advice(batch, 1)["indicators"]["rsi"] == pytest.approx(batch["rsi"][1])
+
+    single, vector = WilderRSI(), BatchWilderRSI(1)
+    for close, flag in zip(closes, stale):
+        if not flag:
+            single.update(float(close))
+        vector.update(np.array([close]), np.array([flag]))
+    assert np.isnan(single.value) and np.isnan(vector.value[0])
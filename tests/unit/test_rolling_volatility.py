@@ -0,0 +1,119 @@
+# tests/unit/test_rolling_volatility.py
+
+"""
+TEST SUITE: Streaming Rolling Volatility
+OBJECTIVE: Verify the ring-buffer volatility engine matches a pandas rolling std of returns and honors VOLATILITY_LOOKBACK.
+EXPECTED RESULT: Values agree within 1e-12 and the allocator receives a NumPy vector.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from utils.risk import RollingVolatility, DEFAULT_VOLATILITY, rolling_volatility_panel
+
+def price_matrix(n_ticks, n_assets, seed=9):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_ticks, n_assets)), axis=0))
+
+@pytest.mark.parametrize("window", [5, 20])
+def test_matches_pandas_rolling_std(window):
+    """
+    OBJECTIVE: Stream 500 ticks for 4 assets through RollingVolatility.
+    EXPECTED RESULT: Each tick matches pandas pct_change().rolling(window).std() once the window is full.
+    """
+    closes = price_matrix(500, 4)
+    reference = pd.DataFrame(closes).pct_change().rolling(window).std().to_numpy()
+
+    rolling = RollingVolatility(4, window=window)
+    streamed = np.array([rolling.update(row) for row in closes])
+    np.testing.assert_allclose(streamed[window:], reference[window:], rtol=1e-9, atol=1e-12)
+
+def test_defaults_and_bad_prints():
+    """
+    OBJECTIVE: Query before two returns exist and feed a NaN price.
+    EXPECTED RESULT: Default 2% volatility early; NaN prints do not poison the running sums.
+    """
+    rolling = RollingVolatility(2, window=3)
+    assert list(rolling.update(np.array([100.0, 50.0]))) == [DEFAULT_VOLATILITY] * 2
+    rolling.update(np.array([101.0, np.nan]))
+    rolling.update(np.array([102.0, 51.0]))
+    for _ in range(5):
+        vols = rolling.update(np.array([103.0, 52.0]))
+    assert np.all(np.isfinite(vols))
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_engine_honors_lookback(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Run the engine with VOLATILITY_LOOKBACK=5.
+    EXPECTED RESULT: The allocator receives a volatility vector equal to the 5-return rolling std.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "VOLATILITY_LOOKBACK", 5)
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+
+    engine = SimulationEngine(load_data=False)
+    engine._persist_portfolio = MagicMock()
+    closes = price_matrix(30, 2)
+    engine.market.assets = ["BTC-USD", "ETH-USD"]
+    engine.market.data = {a: pd.DataFrame({"close": closes[:, j]}) for j, a in enumerate(engine.market.assets)}
+
+    seen = []
+    allocate = engine.allocator.allocate
+    engine.allocator.allocate = lambda scores, vols, equity, **kw: seen.append(vols.copy()) or allocate(scores, vols, equity, **kw)
+    while engine.run_tick():
+        pass
+
+    reference = pd.DataFrame(closes).pct_change().rolling(5).std().to_numpy()
+    assert isinstance(seen[-1], np.ndarray)
+    np.testing.assert_allclose(seen[-1], reference[-1], rtol=1e-9)
+
+def test_stale_cells_keep_last_real_volatility():
+    """
+    OBJECTIVE: Asset 1 is closed (forward-filled, flagged stale) for 40 ticks while asset 0 keeps trading.
+    EXPECTED RESULT: Asset 1's volatility stays at the rolling std of its last real returns instead of decaying
+    to zero, then resumes from its own returns; asset 0 is unaffected.
+    """
+    window = 5
+    closes = price_matrix(100, 2)
+    stale = np.zeros(closes.shape, dtype=bool)
+    stale[40:80, 1] = True
+    closes[40:80, 1] = closes[39, 1]
+
+    rolling = RollingVolatility(2, window=window)
+    streamed = np.array([rolling.update(row, mask) for row, mask in zip(closes, stale)])
+
+    fresh = closes[~stale[:, 1], 1]
+    reference = pd.Series(fresh).pct_change().rolling(window).std().to_numpy()
+    np.testing.assert_allclose(streamed[~stale[:, 1], 1][window:], reference[window:], rtol=1e-9)
+    np.testing.assert_array_equal(streamed[40:80, 1], streamed[39, 1])
+    assert streamed[79, 1] > 0
+    full = pd.DataFrame(closes[:, 0]).pct_change().rolling(window).std().to_numpy()[:, 0]
+    np.testing.assert_allclose(streamed[window:, 0], full[window:], rtol=1e-9)
+
+@pytest.mark.parametrize("window", [5, 20])
+def test_panel_matches_streaming(window):
+    """
+    OBJECTIVE: Compute the whole-history volatility panel for 400 ticks x 5 assets with scattered stale cells,
+    an asset that only opens at tick 30, and one that never prints.
+    EXPECTED RESULT: Every row matches streaming the same rows through RollingVolatility, including the warm mask.
+    """
+    rng = np.random.default_rng(4)
+    closes = price_matrix(400, 5)
+    stale = rng.random(closes.shape) < 0.3
+    stale[:30, 2] = True
+    stale[:, 4] = True
+
+    rolling = RollingVolatility(5, window=window)
+    streamed, warm = [], []
+    for row, mask in zip(closes, stale):
+        streamed.append(rolling.update(row, mask))
+        warm.append(rolling.warm)
+
+    volatility, panel_warm = rolling_volatility_panel(closes, stale, window=window)
+    np.testing.assert_allclose(volatility, np.array(streamed), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(panel_warm, np.array(warm))
+    assert (volatility[:, 4] == DEFAULT_VOLATILITY).all()
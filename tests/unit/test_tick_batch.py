@@ -0,0 +1,115 @@
+# tests/unit/test_tick_batch.py
+
+"""
+TEST SUITE: Per-Tick Unit of Work
+OBJECTIVE: Verify a tick's MarketData, LLMAdvice, Order and PortfolioState rows are bulk-inserted in one transaction.
+EXPECTED RESULT: Rows land with their model defaults filled in when queued, and the engine opens one session per tick.
+"""
+
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+from database.models import MarketData, LLMAdvice, Order, PortfolioState, RiskSnapshot
+from database.unit_of_work import TickBatch
+
+@pytest.fixture
+def db():
+    db = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(db)
+    return db
+
+def test_flush_bulk_inserts_with_defaults(db):
+    """
+    OBJECTIVE: Queue rows of every bulk model plus one RiskSnapshot object, flush and commit.
+    EXPECTED RESULT: All rows are stored; omitted fields get the model defaults (volume, created_at, unrealized_pnl).
+    """
+    stamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    batch = TickBatch()
+    for symbol in ["BTC-USD", "ETH-USD"]:
+        batch.add(MarketData, {"run_id": "r", "tick_id": 1, "symbol": symbol, "price": 100.0, "timestamp": stamp})
+    batch.add(LLMAdvice, {"run_id": "r", "tick_id": 1, "asset": "BTC-USD", "advisor_name": "Quant", "outlook": "BULLISH",
+                          "confidence": 0.8, "rationale": "rsi", "raw_response": {"outlook": "BULLISH"}})
+    batch.add(Order, {"run_id": "r", "tick_id": 1, "symbol": "BTC-USD", "side": "BUY",
+                      "quantity": 1.5, "filled_price": 100.0, "status": "FILLED"})
+    batch.add(PortfolioState, {"run_id": "r", "tick_id": 1, "balance": 850.0, "holdings": {"BTC-USD": 1.5},
+                               "total_equity": 1000.0, "max_drawdown": 0.0})
+    batch.add_object(RiskSnapshot(run_id="r", tick_id=1, assets=["BTC-USD"], volatility=[0.01], correlation=[[1.0]]))
+    assert len(batch) == 6
+    assert batch.counts() == {"MarketData": 2, "LLMAdvice": 1, "Order": 1, "PortfolioState": 1}
+
+    with Session(db) as session:
+        batch.flush(session)
+        session.commit()
+
+    with Session(db) as session:
+        market = session.exec(select(MarketData)).all()
+        assert [m.symbol for m in market] == ["BTC-USD", "ETH-USD"]
+        assert all(m.volume == 0.0 for m in market)
+        advice = session.exec(select(LLMAdvice)).one()
+        assert advice.raw_response == {"outlook": "BULLISH"} and advice.created_at is not None
+        assert session.exec(select(Order)).one().created_at is not None
+        state = session.exec(select(PortfolioState)).one()
+        assert state.holdings == {"BTC-USD": 1.5} and state.unrealized_pnl == 0.0
+        assert session.exec(select(RiskSnapshot)).one().assets == ["BTC-USD"]
+
+def test_coalesced_ticks_keep_their_timestamps(db):
+    """
+    OBJECTIVE: Queue three ticks 20ms apart, coalesce them into one batch (as the background writer does) and flush later.
+    EXPECTED RESULT: Each tick's MarketData and PortfolioState rows carry the time the tick produced them, not the flush time.
+    """
+    coalesced = TickBatch()
+    produced = []
+    for tick in range(1, 4):
+        batch = TickBatch()
+        batch.add(MarketData, {"run_id": "r", "tick_id": tick, "symbol": "BTC-USD", "price": 100.0})
+        batch.add(PortfolioState, {"run_id": "r", "tick_id": tick, "balance": 1.0, "holdings": {}, "total_equity": 1.0})
+        produced.append(datetime.now(timezone.utc).replace(tzinfo=None))
+        coalesced.extend(batch)
+        time.sleep(0.02)
+
+    with Session(db) as session:
+        coalesced.flush(session)
+        session.commit()
+
+    with Session(db) as session:
+        for model in (MarketData, PortfolioState):
+            stamps = [row.timestamp.replace(tzinfo=None) for row in session.exec(select(model).order_by(model.tick_id))]
+            assert len(set(stamps)) == 3
+            for stamp, seen in zip(stamps, produced):
+                assert abs((stamp - seen).total_seconds()) < 0.01
+
+@patch("simulation.engine.SimulationEngine._start_run_record")
+@patch("simulation.engine.init_db")
+def test_engine_commits_once_per_tick(mock_init, mock_record, db, monkeypatch):
+    """
+    OBJECTIVE: Run 30 ticks over 3 assets against an in-memory SQLite database.
+    EXPECTED RESULT: One session per tick (none from MarketReplay), and every tick's market data,
+    quant advice and portfolio state is stored.
+    """
+    from simulation.engine import SimulationEngine
+    session_cls = MagicMock(side_effect=lambda bind: Session(bind))
+    monkeypatch.setattr("simulation.engine.Session", session_cls)
+    monkeypatch.setattr("simulation.engine.engine", db)
+    market_session = MagicMock()
+    monkeypatch.setattr("simulation.market.Session", market_session)
+
+    engine = SimulationEngine(load_data=False)
+    engine.analyst.run = lambda symbol, context="": {"outlook": "BULLISH", "confidence": 0.9, "reasoning": "up"}
+    engine.market.assets = ["BTC-USD", "ETH-USD", "SOL-USD"]
+    rng = np.random.default_rng(7)
+    engine.market.data = {a: pd.DataFrame({"close": 100 + rng.normal(0, 1, 30).cumsum()}) for a in engine.market.assets}
+    while engine.run_tick():
+        pass
+
+    assert session_cls.call_count == 30
+    market_session.assert_not_called()
+    with Session(db) as session:
+        assert len(session.exec(select(MarketData)).all()) == 90
+        assert len(session.exec(select(LLMAdvice).where(LLMAdvice.advisor_name == "Quant")).all()) == 90
+        assert [s.tick_id for s in session.exec(select(PortfolioState))] == list(range(1, 31))
+        assert len(session.exec(select(Order)).all()) > 0
@@ -0,0 +1,117 @@
+# tests/unit/test_timeline_alignment.py
+
+"""
+TEST SUITE: Timestamp-Aligned Market Timeline
+OBJECTIVE: Verify 24/7 crypto and market-hours equities are aligned by time on one master index, not by position.
+EXPECTED RESULT: Gaps are forward-filled once at load time and flagged in a per-asset stale mask.
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock, patch
+from simulation.market import MarketReplay
+
+def crypto_and_equity():
+    crypto_ts = pd.date_range("2024-01-05 12:00", periods=8, freq="1h", tz="UTC")
+    crypto = pd.DataFrame({"datetime": crypto_ts, "close": np.arange(100.0, 108.0), "volume": 1.0})
+    # Equity starts an hour later, skips two hours (closed) and has one bad print
+    equity_ts = crypto_ts[[1, 2, 5, 6, 7]].tz_convert("America/New_York")
+    equity = pd.DataFrame({"datetime": equity_ts, "close": [10.0, 11.0, np.nan, 13.0, 14.0], "volume": 5.0})
+    return {"BTC-USD": crypto, "AAPL": equity}
+
+def load(monkeypatch, frames):
+    monkeypatch.setattr(MarketReplay, "_fetch_asset_data", lambda self, symbol, days: frames[symbol])
+    monkeypatch.setattr("simulation.market.Session", MagicMock())
+    return MarketReplay(assets=list(frames))
+
+def test_union_timeline_and_stale_mask(monkeypatch):
+    """
+    OBJECTIVE: Align an 8-bar crypto series with a gappy, later-starting equity series.
+    EXPECTED RESULT: Timeline starts at the equity's first print, gaps carry the last price and are marked stale.
+    """
+    market = load(monkeypatch, crypto_and_equity())
+    store = market.store
+
+    assert len(store) == 7 # Starts at the first bar where both assets have printed
+    assert list(store.close[:, 0]) == [101.0, 102.0, 103.0, 104.0, 105.0, 106.0, 107.0]
+    assert list(store.close[:, 1]) == [10.0, 11.0, 11.0, 11.0, 11.0, 13.0, 14.0]
+    assert list(store.stale[:, 1]) == [False, False, True, True, True, False, False]
+    assert not store.stale[:, 0].any()
+    assert store.volume[2, 1] == 0.0 # No trading while closed
+
+def test_tick_carries_stale_flag_without_repair(monkeypatch, capsys):
+    """
+    OBJECTIVE: Replay the aligned timeline.
+    EXPECTED RESULT: Candles expose the stale flag and the hot loop prints no per-price warnings.
+    """
+    market = load(monkeypatch, crypto_and_equity())
+    capsys.readouterr()
+
+    candles = [market.tick() for _ in range(len(market.store))]
+    assert [c["AAPL"]["stale"] for c in candles][2:5] == [True, True, True]
+    assert all(c["AAPL"]["price"] > 0 for c in candles)
+    assert "WARN" not in capsys.readouterr().out
+
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_engine_holds_stale_assets(mock_record, mock_init, monkeypatch):
+    """
+    OBJECTIVE: Ask the engine to rebalance into an asset whose market is closed.
+    EXPECTED RESULT: No order is placed for the stale asset; the fresh asset still trades.
+    """
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+    engine = SimulationEngine(load_data=False)
+
+    prices = {
+        "BTC-USD": {"price": 50000.0, "stale": False},
+        "AAPL": {"price": 180.0, "stale": True},
+    }
+    engine._execute_rebalance({"BTC-USD": 5000.0, "AAPL": 5000.0}, prices)
+
+    assert engine.portfolio["holdings"]["BTC-USD"] > 0
+    assert engine.portfolio["holdings"]["AAPL"] == 0.0
+
+def crypto_and_market_hours(days=4):
+    """Hourly BTC around the clock; SPY only 14:00-20:00 UTC on each day."""
+    rng = np.random.default_rng(4)
+    crypto_ts = pd.date_range("2024-01-08", periods=24 * days, freq="1h", tz="UTC")
+    crypto = pd.DataFrame({"datetime": crypto_ts, "close": 40000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(crypto_ts)))), "volume": 1.0})
+    equity_ts = crypto_ts[(crypto_ts.hour >= 14) & (crypto_ts.hour <= 20)]
+    equity = pd.DataFrame({"datetime": equity_ts, "close": 470 * np.exp(np.cumsum(rng.normal(0, 0.004, len(equity_ts)))), "volume": 5.0})
+    return {"BTC-USD": crypto, "SPY": equity}
+
+@pytest.mark.parametrize("mode", ["incremental", "precomputed"])
+@patch("simulation.engine.init_db")
+@patch("simulation.engine.SimulationEngine._start_run_record")
+def test_closed_market_keeps_volatility(mock_record, mock_init, mode, monkeypatch):
+    """
+    OBJECTIVE: Replay 24/7 BTC with market-hours SPY; SPY is closed for 17 hours every night (longer than VOLATILITY_LOOKBACK).
+    EXPECTED RESULT: SPY's volatility (and EWMA volatility) hold their last real value overnight instead of dropping
+    to zero, so the closed equity never receives an outsized inverse-vol weight.
+    """
+    from config import config
+    from simulation.engine import SimulationEngine
+    monkeypatch.setattr(config, "INDICATOR_MODE", mode)
+    monkeypatch.setattr(config, "VOLATILITY_LOOKBACK", 5)
+    monkeypatch.setattr("simulation.engine.Session", MagicMock())
+    market = load(monkeypatch, crypto_and_market_hours())
+
+    engine = SimulationEngine(load_data=False)
+    engine.market = market
+    engine.portfolio["holdings"] = {a: 0.0 for a in market.assets}
+    seen = []
+    volatilities = engine._volatilities
+    engine._volatilities = lambda tick_data: seen.append(volatilities(tick_data).copy()) or seen[-1]
+    ewma = []
+    while engine.run_tick():
+        ewma.append(engine.covariance.volatility.copy())
+
+    vols, ewma, stale = np.array(seen), np.array(ewma), market.stale
+    spy = market.assets.index("SPY")
+    closed = np.flatnonzero(stale[:, spy])
+    assert len(closed) > 40
+    for t in closed[closed > 10]:
+        assert vols[t, spy] == vols[t - 1, spy] > 0
+        assert ewma[t, spy] == ewma[t - 1, spy] > 0
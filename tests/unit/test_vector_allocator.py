@@ -0,0 +1,80 @@
+# tests/unit/test_vector_allocator.py
+
+"""
+TEST SUITE: Vectorized Allocator with Cap-and-Redistribute
+OBJECTIVE: Verify the array allocator matches the dict allocator when no cap binds and redistributes excess weight when one does.
+EXPECTED RESULT: Identical targets without binding caps; capped assets sit at the cap and the excess funds uncapped long assets.
+"""
+
+import pytest
+import numpy as np
+from utils.allocator import CapitalAllocator, VectorAllocator
+
+def test_matches_dict_allocator_without_binding_cap():
+    """
+    OBJECTIVE: 50 random universes of 20 assets (mixed signs, some zero scores), cap 1.0, with and without correlation.
+    EXPECTED RESULT: Same keys and targets as CapitalAllocator.
+    """
+    rng = np.random.default_rng(5)
+    legacy = CapitalAllocator(max_position_pct=1.0, reserve_pct=0.05)
+    vector = VectorAllocator(max_position_pct=1.0, reserve_pct=0.05)
+    assets = [f"SYM{j}" for j in range(20)]
+    for _ in range(50):
+        raw = rng.uniform(-1, 1, 20) * (rng.random(20) < 0.7)
+        scores = dict(zip(assets, raw.tolist()))
+        vols = rng.uniform(0.0005, 0.05, 20)
+        returns = rng.normal(size=(60, 20))
+        corr = np.corrcoef(returns, rowvar=False)
+        for correlation in (None, corr):
+            expected = legacy.allocate(scores, vols, 100000, assets=assets, correlation=correlation)
+            actual = vector.allocate(scores, vols, 100000, assets=assets, correlation=correlation)
+            assert actual.keys() == expected.keys()
+            for asset, target in expected.items():
+                assert actual[asset] == pytest.approx(target, rel=1e-12, abs=1e-9)
+
+def test_excess_is_redistributed():
+    """
+    OBJECTIVE: One very low-vol asset among three, cap 40%, no reserve, full conviction.
+    EXPECTED RESULT: The low-vol asset sits at the cap and the remaining 60% is split 50/50 by inverse vol, fully invested.
+    """
+    allocator = VectorAllocator(max_position_pct=0.4, reserve_pct=0.0)
+    scores = np.ones(3)
+    vols = np.array([0.001, 0.02, 0.02])
+    targets = allocator.allocate_vector(scores, vols, 100000)
+    np.testing.assert_allclose(targets, [40000, 30000, 30000])
+
+    legacy = CapitalAllocator(max_position_pct=0.4, reserve_pct=0.0)
+    dropped = legacy.allocate({"A": 1.0, "B": 1.0, "C": 1.0}, {"A": 0.001, "B": 0.02, "C": 0.02}, 100000)
+    assert sum(dropped.values()) < 50000 # Legacy version leaves the excess in cash
+
+def test_cascading_caps():
+    """
+    OBJECTIVE: Redistribution pushes a second asset over the cap.
+    EXPECTED RESULT: Both end at the cap, the remainder goes to the rest; nothing exceeds the cap.
+    """
+    allocator = VectorAllocator(max_position_pct=0.3, reserve_pct=0.0)
+    vols = np.array([0.001, 0.004, 0.02, 0.02, 0.02])
+    targets = allocator.allocate_vector(np.ones(5), vols, 1.0)
+    assert targets[:2] == pytest.approx([0.3, 0.3])
+    assert targets[2:] == pytest.approx([0.4 / 3] * 3)
+    assert targets.sum() == pytest.approx(1.0)
+
+def test_all_capped_keeps_cash_and_long_only():
+    """
+    OBJECTIVE: Two long assets and one bearish asset, cap 20%, 5% reserve.
+    EXPECTED RESULT: Longs sit at the cap (of the investable capital), the bearish asset gets 0, the rest is cash.
+    """
+    allocator = VectorAllocator(max_position_pct=0.2, reserve_pct=0.05)
+    scores = {"BTC": 1.0, "ETH": 0.9, "SPY": -0.8, "GLD": 0.0}
+    vols = {"BTC": 0.02, "ETH": 0.02, "SPY": 0.01, "GLD": 0.01}
+    targets = allocator.allocate(scores, vols, 100000)
+    assert targets == pytest.approx({"BTC": 19000.0, "ETH": 19000.0, "SPY": 0.0})
+
+def test_zero_sentiment():
+    """
+    OBJECTIVE: No active assets.
+    EXPECTED RESULT: Zero targets, same shape as CapitalAllocator's output.
+    """
+    allocator = VectorAllocator()
+    assert allocator.allocate({"BTC": 0.0}, {"BTC": 0.02}, 100000) == {"BTC": 0.0}
+    assert not allocator.allocate_vector(np.zeros(3), np.full(3, 0.02), 100000).any()
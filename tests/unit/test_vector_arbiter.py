@@ -0,0 +1,77 @@
+# tests/unit/test_vector_arbiter.py
+
+"""
+TEST SUITE: Vectorized Decision Arbiter
+OBJECTIVE: Verify the array-based arbiter reproduces DecisionArbiter exactly, including memory, hysteresis and decay.
+EXPECTED RESULT: Identical score dicts and sentiment memory on every tick.
+"""
+
+import pytest
+import numpy as np
+from utils.advice import Advice
+from utils.arbiter import DecisionArbiter, VectorArbiter
+
+OUTLOOKS = ["BULLISH", "BEARISH", "NEUTRAL"]
+
+def random_tick(rng, tick, assets):
+    """Sparse advice: some assets get several signals, others none."""
+    advice = []
+    for asset in assets:
+        for _ in range(rng.integers(0, 4) if rng.random() < 0.6 else 0):
+            advice.append(Advice(tick, asset, "A", OUTLOOKS[rng.integers(0, 3)], float(rng.random()), "", {}))
+    rng.shuffle(advice)
+    return advice
+
+@pytest.mark.parametrize("smoothing, threshold", [(0.3, 0.6), (1.0, 0.0), (0.5, 0.5)])
+def test_matches_dict_arbiter(smoothing, threshold):
+    """
+    OBJECTIVE: 200 ticks of random sparse advice over 30 assets, both arbiters seeded with the same memory.
+    EXPECTED RESULT: Scores and memory are bit-identical on every tick.
+    """
+    rng = np.random.default_rng(7)
+    assets = [f"SYM{j}" for j in range(30)]
+    reference = DecisionArbiter(threshold, smoothing)
+    vector = VectorArbiter(threshold, smoothing)
+    for asset in assets:
+        reference.sentiment_memory[asset] = vector.sentiment_memory[asset] = float(rng.uniform(-1, 1))
+
+    for tick in range(200):
+        advice = random_tick(rng, tick, assets)
+        assert vector.aggregate_advice(advice) == reference.aggregate_advice(advice)
+        assert dict(vector.sentiment_memory) == reference.sentiment_memory
+
+def test_hysteresis_with_seeded_memory():
+    """
+    OBJECTIVE: Seed memory through the dict view, then send noise and a real signal.
+    EXPECTED RESULT: Noise (<0.1) is ignored, the signal moves the score.
+    """
+    arbiter = VectorArbiter(confidence_threshold=0.0, smoothing_factor=1.0)
+    arbiter.sentiment_memory["BTC"] = 0.5
+    assert arbiter.aggregate_advice([Advice(1, "BTC", "A", "BULLISH", 0.55, "", {})]) == {"BTC": 0.5}
+    assert arbiter.aggregate_advice([Advice(2, "BTC", "A", "BULLISH", 0.8, "", {})]) == {"BTC": 0.8}
+
+def test_ghost_asset_decays_to_zero():
+    """
+    OBJECTIVE: An asset with no further signals.
+    EXPECTED RESULT: Fades by 20% per tick and snaps to 0.0 below 0.05, while staying in memory.
+    """
+    arbiter = VectorArbiter(smoothing_factor=1.0)
+    arbiter.sentiment_memory["BTC"] = 1.0
+    path = [arbiter.aggregate_advice([])["BTC"] for _ in range(15)]
+    assert path[0] == 0.8
+    assert path[-1] == 0.0 and all(abs(s) >= 0.05 for s in path if s)
+    assert list(arbiter.sentiment_memory) == ["BTC"]
+
+def test_array_api_and_growing_universe():
+    """
+    OBJECTIVE: Feed signals as arrays, then introduce new assets on a later tick.
+    EXPECTED RESULT: Scores for the array call, earlier assets keep decaying alongside the new ones.
+    """
+    arbiter = VectorArbiter(confidence_threshold=0.5, smoothing_factor=1.0)
+    index = arbiter.sentiment_memory.register(["BTC", "ETH", "BTC"])
+    scores = arbiter.aggregate(index, np.array([1.0, -1.0, 1.0]), np.array([0.8, 0.9, 0.6]))
+    assert scores == {"BTC": pytest.approx(0.7), "ETH": -0.9}
+
+    scores = arbiter.aggregate_advice([Advice(2, f"NEW{j}", "A", "BULLISH", 1.0, "", {}) for j in range(5)])
+    assert scores["BTC"] == pytest.approx(0.56) and scores["ETH"] == pytest.approx(-0.72)
+    assert all(scores[f"NEW{j}"] == 1.0 for j in range(5))
@@ -0,0 +1,43 @@
+# utils/advice.py
+
+from typing import Any, Dict
+from database.models import LLMAdvice
+
+class Advice:
+    """
+    Compact advice record for the decision path.
+    Carries only what the arbiter and persistence need, with no ORM or
+    Pydantic validation. `values()` / `to_row()` build the LLMAdvice row at
+    persistence time, so runs that do not store advice never create ORM objects.
+    """
+
+    __slots__ = ("tick_id", "asset", "advisor_name", "outlook", "confidence", "rationale", "raw_response")
+
+    def __init__(self, tick_id: int, asset: str, advisor_name: str, outlook: str,
+                 confidence: float, rationale: str, raw_response: Dict[str, Any]):
+        self.tick_id = tick_id
+        self.asset = asset
+        self.advisor_name = advisor_name
+        self.outlook = outlook
+        self.confidence = confidence
+        self.rationale = rationale
+        self.raw_response = raw_response
+
+    def values(self, run_id: str) -> Dict[str, Any]:
+        """Column values of the LLMAdvice row (for bulk inserts)."""
+        return {
+            "run_id": run_id,
+            "tick_id": self.tick_id,
+            "asset": self.asset,
+            "advisor_name": self.advisor_name,
+            "outlook": self.outlook,
+            "confidence": self.confidence,
+            "rationale": self.rationale,
+            "raw_response": self.raw_response
+        }
+
+    def to_row(self, run_id: str) -> LLMAdvice:
+        return LLMAdvice(**self.values(run_id))
+
+    def __repr__(self) -> str:
+        return f"Advice({self.advisor_name} {self.asset}@{self.tick_id}: {self.outlook} {self.confidence:.2f})"
@@ -1,7 +1,7 @@
 # utils/allocator.py
 
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Union
 from config import config
 
 class CapitalAllocator:
@@ -15,18 +15,25 @@ class CapitalAllocator:
         self.max_position_pct = max_position_pct if max_position_pct is not None else config.MAX_POSITION_PCT
         self.reserve_pct = reserve_pct if reserve_pct is not None else config.PORTFOLIO_CASH_RESERVE
 
-    def allocate(self, scores: Dict[str, float], volatilities: Dict[str, float], total_equity: float) -> Dict[str, float]:
+    def allocate(self, scores: Dict[str, float], volatilities: Union[Dict[str, float], np.ndarray],
+                 total_equity: float, assets: List[str] = None,
+                 correlation: np.ndarray = None) -> Dict[str, float]:
         """
         Calculates target quantities for each asset.
         
         Args:
             scores: Map of asset -> sentiment score (-1 to 1)
-            volatilities: Map of asset -> rolling volatility %
+            volatilities: Map of asset -> rolling volatility %, or a vector aligned with `assets`
             total_equity: Total USD value of portfolio
+            assets: Asset order of `volatilities` / `correlation` when given as arrays
+            correlation: Optional (assets x assets) correlation matrix aligned with `assets`
             
         Returns:
             Map of asset -> target_usd_allocation
         """
+        if isinstance(volatilities, np.ndarray):
+            volatilities = dict(zip(assets, volatilities.tolist()))
+
         # 1. Filter for non-zero scores
         active_assets = [a for a, s in scores.items() if s != 0]
         if not active_assets:
@@ -35,6 +42,8 @@ class CapitalAllocator:
         # 2. Calculate Inverse Volatility Weights
         # W_i = (1/Vol_i) / Sum(1/Vol_k)
         inv_vols = {a: 1.0 / max(volatilities.get(a, 0.01), 0.001) for a in active_assets}
+        if correlation is not None:
+            inv_vols = self._correlation_penalty(inv_vols, correlation, assets)
         total_inv_vol = sum(inv_vols.values())
         weights = {a: (v / total_inv_vol) for a, v in inv_vols.items()}
 
@@ -60,3 +69,195 @@ class CapitalAllocator:
             allocations[asset] = target_pct * available_capital * direction
             
         return allocations
+
+    @staticmethod
+    def _correlation_penalty(inv_vols: Dict[str, float], correlation: np.ndarray,
+                             assets: List[str]) -> Dict[str, float]:
+        """
+        Shrinks each active asset's inverse-vol weight by sqrt(sum of its positive
+        correlations with the other active assets, itself included). Independent
+        assets keep their weight; a cluster of k perfectly correlated assets shares
+        roughly the weight of sqrt(k) independent ones.
+        """
+        index = {a: i for i, a in enumerate(assets)}
+        active = [a for a in inv_vols if a in index]
+        if len(active) < 2:
+            return inv_vols
+        idx = np.array([index[a] for a in active])
+        sub = np.clip(correlation[np.ix_(idx, idx)], 0.0, None)
+        crowding = np.sqrt(np.maximum(sub.sum(axis=1), 1.0))
+        penalized = dict(inv_vols)
+        for a, c in zip(active, crowding.tolist()):
+            penalized[a] = inv_vols[a] / c
+        return penalized
+
+class VectorAllocator(CapitalAllocator):
+    """
+    Array-based allocator with cap-and-redistribute (water-filling).
+    Takes score and volatility vectors aligned with one asset order. Capital
+    goes by inverse volatility like CapitalAllocator, but when an asset hits
+    `max_position_pct` its excess weight is handed to the uncapped long assets
+    in proportion to their weights, repeated until no asset exceeds the cap.
+    Whatever cannot be placed (every long asset capped) stays in cash. Without
+    a binding cap the result equals CapitalAllocator's.
+    """
+
+    def allocate(self, scores: Dict[str, float], volatilities: Union[Dict[str, float], np.ndarray],
+                 total_equity: float, assets: List[str] = None,
+                 correlation: np.ndarray = None) -> Dict[str, float]:
+        """
+        Dict interface of allocate_vector(), same arguments as CapitalAllocator.allocate.
+        Scores of assets outside `assets` (when given) are ignored.
+        
+        Returns:
+            Map of asset -> target_usd_allocation for every asset with a non-zero score
+        """
+        if assets is None:
+            assets = list(scores)
+        if isinstance(volatilities, np.ndarray):
+            vols = np.asarray(volatilities, dtype=np.float64)
+        else:
+            vols = np.array([volatilities.get(a, 0.01) for a in assets], dtype=np.float64)
+        score_vec = np.array([scores.get(a, 0.0) for a in assets], dtype=np.float64)
+
+        active = np.flatnonzero(score_vec != 0)
+        if active.size == 0:
+            return {a: 0.0 for a in scores}
+        targets = self.allocate_vector(score_vec, vols, total_equity, correlation)
+        return {assets[i]: t for i, t in zip(active.tolist(), targets[active].tolist())}
+
+    def allocate_vector(self, scores: np.ndarray, volatilities: np.ndarray, total_equity: float,
+                        correlation: np.ndarray = None) -> np.ndarray:
+        """
+        Target USD allocation per asset.
+        
+        Args:
+            scores: Sentiment score vector (-1 to 1)
+            volatilities: Rolling volatility vector, same order
+            total_equity: Total USD value of portfolio
+            correlation: Optional (assets x assets) correlation matrix, same order
+            
+        Returns:
+            Vector of target USD allocations (0 for inactive and non-long assets)
+        """
+        active = scores != 0
+        if not active.any():
+            return np.zeros(len(scores))
+
+        # 1. Base weights (sum to 1)
+        weights = self._weights(scores, volatilities, correlation)
+
+        # 2. Water-filling: cap each long asset's target at max_position_pct, redistribute the excess
+        strength = np.abs(scores)
+        long = scores > 0 # Long only enforcement for v1
+        capped = np.zeros(len(scores), dtype=bool)
+        for _ in range(int(long.sum())):
+            over = long & ~capped & (weights * strength > self.max_position_pct)
+            if not over.any():
+                break
+            limit = self.max_position_pct / strength[over]
+            excess = float((weights[over] - limit).sum())
+            weights[over] = limit
+            capped |= over
+            pool = long & ~capped
+            if not pool.any():
+                break # Every long asset is capped: the rest stays in cash
+            weights[pool] += excess * weights[pool] / weights[pool].sum()
+
+        # 3. Sentiment scaling, long-only mask and cash reserve
+        target_pct = np.minimum(weights * strength, self.max_position_pct)
+        available_capital = total_equity * (1.0 - self.reserve_pct)
+        return target_pct * available_capital * long
+
+    def _weights(self, scores: np.ndarray, volatilities: np.ndarray, correlation: np.ndarray = None) -> np.ndarray:
+        """Inverse volatility weights over the active assets, shrunk for correlated clusters."""
+        active = scores != 0
+        inv_vols = np.where(active, 1.0 / np.maximum(volatilities, 0.001), 0.0)
+        if correlation is not None and active.sum() >= 2:
+            idx = np.flatnonzero(active)
+            sub = np.clip(correlation[np.ix_(idx, idx)], 0.0, None)
+            inv_vols[idx] /= np.sqrt(np.maximum(sub.sum(axis=1), 1.0))
+        return inv_vols / inv_vols.sum()
+
+class ERCAllocator(VectorAllocator):
+    """
+    Equal-risk-contribution ("true" risk parity) allocator.
+    Builds the covariance of the long assets from their volatilities and the
+    correlation matrix (diagonal when none is given, which reduces to inverse
+    volatility) and solves for weights whose risk contributions w_i (Cov w)_i
+    are all equal. The solver is a damped Newton method on the convex problem
+    min 1/2 x'Cov x - sum(ln x_i) / n, warm-started from the previous tick's
+    solution, so consecutive ticks usually take a couple of iterations.
+    Position caps and the cash reserve are then applied as in VectorAllocator.
+    """
+
+    def __init__(self, max_position_pct: float = None, reserve_pct: float = None,
+                 tolerance: float = None, max_iterations: int = None):
+        super().__init__(max_position_pct, reserve_pct)
+        self.tolerance = tolerance if tolerance is not None else config.ERC_TOLERANCE
+        self.max_iterations = max_iterations if max_iterations is not None else config.ERC_MAX_ITERATIONS
+        self.solution: np.ndarray = None # Last x per asset (0 = not solved for), for warm starts
+        self.last_iterations = 0
+
+    def _weights(self, scores: np.ndarray, volatilities: np.ndarray, correlation: np.ndarray = None) -> np.ndarray:
+        weights = np.zeros(len(scores))
+        idx = np.flatnonzero(scores > 0) # Bearish assets get no position, so no risk budget either
+        if idx.size == 0:
+            self.last_iterations = 0
+            return weights
+
+        vol = np.maximum(np.asarray(volatilities, dtype=np.float64)[idx], 0.001)
+        corr = correlation[np.ix_(idx, idx)] if correlation is not None else np.eye(idx.size)
+        cov = corr * np.outer(vol, vol)
+
+        if self.solution is None or len(self.solution) != len(scores):
+            self.solution = np.zeros(len(scores))
+        start = self.solution[idx]
+        x = np.where(start > 0, start, 1.0 / (vol * np.sqrt(idx.size))) # Cold entries start at inverse vol
+        x, self.last_iterations = self.solve(cov, x, self.tolerance, self.max_iterations)
+
+        self.solution[:] = 0.0
+        self.solution[idx] = x
+        weights[idx] = x / x.sum()
+        return weights
+
+    @staticmethod
+    def solve(cov: np.ndarray, x: np.ndarray, tolerance: float = 1e-10, max_iterations: int = 50):
+        """
+        Damped Newton iterations for equal risk budgets.
+        Minimizes f(x) = 1/2 x'Cov x - b * sum(ln x) with b = 1/n; at the optimum
+        x_i (Cov x)_i = b for every i. Steps are shortened to keep x positive and
+        backtracked until f decreases; if none does, the solver stops at the last accepted x.
+        
+        Returns:
+            (x, iterations): the unnormalized solution and the number of Newton steps
+        """
+        n = len(x)
+        budget = 1.0 / n
+        x = np.array(x, dtype=np.float64)
+
+        def objective(y):
+            return 0.5 * y @ cov @ y - budget * np.log(y).sum()
+
+        value = objective(x)
+        iteration = 0
+        for iteration in range(1, max_iterations + 1):
+            gradient = cov @ x - budget / x
+            hessian = cov + np.diag(budget / (x * x))
+            step = -np.linalg.solve(hessian, gradient)
+            if np.max(np.abs(step) / x) < tolerance:
+                break
+
+            shrinking = step < 0
+            t = min(1.0, 0.99 * float(np.min(-x[shrinking] / step[shrinking]))) if shrinking.any() else 1.0
+            slope = float(gradient @ step)
+            while t > 1e-12:
+                candidate = x + t * step
+                new_value = objective(candidate)
+                if new_value <= value + 1e-4 * t * slope:
+                    break
+                t *= 0.5
+            else:
+                break # No step passed the Armijo check: keep the last accepted x
+            x, value = candidate, new_value
+        return x, iteration
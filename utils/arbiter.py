@@ -1,8 +1,9 @@
 # utils/arbiter.py
 
-import numpy
-from typing import Dict, List
-from database.models import LLMAdvice
+import numpy as np
+from collections.abc import Mapping, MutableMapping
+from typing import Dict, List, Sequence
+from utils.advice import Advice
 
 class DecisionArbiter:
     def __init__(self, confidence_threshold: float = 0.6, smoothing_factor: float = 0.3):
@@ -10,7 +11,8 @@ class DecisionArbiter:
         self.smoothing_factor = smoothing_factor
         self.sentiment_memory: Dict[str, float] = {}
         
-    def aggregate_advice(self, advice_list: List[LLMAdvice]) -> Dict[str, float]:
+    def aggregate_advice(self, advice_list: Sequence[Advice]) -> Dict[str, float]:
+        # Reads only .asset/.outlook/.confidence, so LLMAdvice rows work too
         asset_scores = {}
         grouped_advice = {}
         for advice in advice_list:
@@ -32,7 +34,7 @@ class DecisionArbiter:
             
             if scores:
                 # 1. Calculate Raw Mean
-                raw_score = float(numpy.mean(scores))
+                raw_score = float(np.mean(scores))
                 
                 # 2. Apply smoothing (EMA)
                 prev_score = self.sentiment_memory.get(asset, 0.0)
@@ -51,3 +53,228 @@ class DecisionArbiter:
                 asset_scores[asset] = self.sentiment_memory[asset]
                 
         return asset_scores
+
+SIDES = {"BULLISH": 1.0, "BEARISH": -1.0}
+
+class SentimentVector(MutableMapping):
+    """
+    Sentiment memory as a float vector indexed by asset, with a dict view.
+    `known` marks the assets that have a remembered score (the keys of the
+    equivalent dict); assets are appended to the index on first sight.
+    """
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.assets: List[str] = []
+        self.values = np.zeros(0)
+        self.known = np.zeros(0, dtype=bool)
+
+    def register(self, assets: Sequence[str]) -> np.ndarray:
+        """Vector positions of `assets`, growing the index for new ones."""
+        positions = []
+        for asset in assets:
+            i = self.index.get(asset)
+            if i is None:
+                i = self.index[asset] = len(self.assets)
+                self.assets.append(asset)
+            positions.append(i)
+        grow = len(self.assets) - len(self.values)
+        if grow > 0:
+            self.values = np.concatenate([self.values, np.zeros(max(grow, len(self.values)))])
+            self.known = np.concatenate([self.known, np.zeros(max(grow, len(self.known)), dtype=bool)])
+        return np.array(positions, dtype=np.intp)
+
+    def __getitem__(self, asset: str) -> float:
+        i = self.index.get(asset)
+        if i is None or not self.known[i]:
+            raise KeyError(asset)
+        return float(self.values[i])
+
+    def __setitem__(self, asset: str, value: float):
+        i = self.register([asset])[0]
+        self.values[i] = value
+        self.known[i] = True
+
+    def __delitem__(self, asset: str):
+        i = self.index.get(asset)
+        if i is None or not self.known[i]:
+            raise KeyError(asset)
+        self.values[i] = 0.0
+        self.known[i] = False
+
+    def __iter__(self):
+        n = len(self.assets)
+        return (self.assets[i] for i in np.flatnonzero(self.known[:n]))
+
+    def __len__(self) -> int:
+        return int(self.known.sum())
+
+class VectorArbiter:
+    """
+    Array-based DecisionArbiter with identical results.
+    Sentiment memory is a float vector indexed by asset (`sentiment_memory`
+    keeps the dict interface). Each tick, qualifying signals are summed per
+    asset with `np.bincount`, and the mean, EMA, hysteresis and the decay of
+    assets without fresh signals are applied as masked vector operations.
+    """
+
+    def __init__(self, confidence_threshold: float = 0.6, smoothing_factor: float = 0.3):
+        self.confidence_threshold = confidence_threshold
+        self.smoothing_factor = smoothing_factor
+        self.sentiment_memory = SentimentVector()
+
+    def aggregate_advice(self, advice_list: Sequence[Advice]) -> Dict[str, float]:
+        memory = self.sentiment_memory
+        index = memory.register([advice.asset for advice in advice_list])
+        side = np.array([SIDES.get(advice.outlook, 0.0) for advice in advice_list])
+        confidence = np.array([advice.confidence for advice in advice_list], dtype=np.float64)
+        return self.aggregate(index, side, confidence)
+
+    def aggregate(self, index: np.ndarray, side: np.ndarray, confidence: np.ndarray) -> Dict[str, float]:
+        """
+        Aggregates one tick of signals given as parallel arrays.
+        
+        Args:
+            index: Position of each signal's asset in `sentiment_memory` (see register())
+            side: +1 bullish, -1 bearish, 0 neutral
+            confidence: Signal confidence
+            
+        Returns:
+            Map of asset -> smoothed sentiment for every advised or remembered asset
+        """
+        memory = self.sentiment_memory
+        n = len(memory.assets)
+        values, known = memory.values[:n], memory.known[:n]
+
+        advised = np.bincount(index, minlength=n) > 0
+        qualifying = confidence >= self.confidence_threshold
+        counts = np.bincount(index[qualifying], minlength=n)
+        sums = np.bincount(index[qualifying], weights=(side * confidence)[qualifying], minlength=n)
+        active = advised | known
+        scored = counts > 0
+
+        prev = values.copy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            raw = sums / counts
+        smoothed = (raw * self.smoothing_factor) + (prev * (1 - self.smoothing_factor))
+        # Hysteresis: Only update memory if delta is significant (> 0.1)
+        update = scored & ((np.abs(smoothed - prev) > 0.1) | (np.abs(smoothed) < 0.05))
+        values[update] = smoothed[update]
+
+        # Decay towards neutral if no new signals
+        decay = active & ~scored
+        decayed = prev[decay] * 0.8
+        decayed[np.abs(decayed) < 0.05] = 0.0
+        values[decay] = decayed
+
+        # A first signal inside the hysteresis band leaves the asset unremembered (scored 0.0)
+        known |= update | decay
+        active_idx = np.flatnonzero(active)
+        scores = np.where(known[active_idx], values[active_idx], 0.0)
+        return dict(zip([memory.assets[i] for i in active_idx], scores.tolist()))
+
+DECAY = 0.8      # Per-tick decay of assets without fresh signals
+SNAP_ZERO = 0.05 # Decayed scores below this snap to neutral
+
+class LazySentiment(MutableMapping):
+    """
+    Sentiment memory that decays on read.
+    Each asset stores (score, tick it was set at); its value at tick t is
+    `score * DECAY**(t - tick)`, snapped to 0.0 below SNAP_ZERO, which matches
+    applying the per-tick decay k times. `at()` reads as of a given tick;
+    the mapping interface reads as of the arbiter's current tick.
+    """
+
+    def __init__(self):
+        self.entries: Dict[str, tuple] = {} # asset -> (score, tick)
+        self.tick = 0
+
+    def at(self, asset: str, tick: int) -> float:
+        score, since = self.entries[asset]
+        if score == 0.0 or tick <= since:
+            return score
+        decayed = score * DECAY ** (tick - since)
+        return 0.0 if abs(decayed) < SNAP_ZERO else decayed
+
+    def set(self, asset: str, score: float, tick: int):
+        self.entries[asset] = (score, tick)
+
+    def __getitem__(self, asset: str) -> float:
+        return self.at(asset, self.tick)
+
+    def __setitem__(self, asset: str, score: float):
+        self.entries[asset] = (score, self.tick)
+
+    def __delitem__(self, asset: str):
+        del self.entries[asset]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+class SentimentScores(Mapping):
+    """Read-only scores of one tick; decayed values are computed when read."""
+
+    def __init__(self, memory: LazySentiment, tick: int, unremembered: Dict[str, float]):
+        self.memory = memory
+        self.tick = tick
+        self.unremembered = unremembered
+
+    def __getitem__(self, asset: str) -> float:
+        if asset in self.unremembered:
+            return self.unremembered[asset]
+        return self.memory.at(asset, self.tick)
+
+    def __iter__(self):
+        yield from self.memory
+        yield from (a for a in self.unremembered if a not in self.memory.entries)
+
+    def __len__(self) -> int:
+        return len(self.memory) + sum(1 for a in self.unremembered if a not in self.memory.entries)
+
+class LazyDecayArbiter:
+    """
+    Event-driven DecisionArbiter.
+    Only assets with new signals are touched on a tick; the decay of every
+    other remembered asset is applied in closed form when its score is read
+    (see LazySentiment). Per-tick cost therefore scales with the number of
+    signals instead of the universe size. Scores match DecisionArbiter up to
+    float rounding of `DECAY**k` vs. k repeated multiplications.
+    """
+
+    def __init__(self, confidence_threshold: float = 0.6, smoothing_factor: float = 0.3):
+        self.confidence_threshold = confidence_threshold
+        self.smoothing_factor = smoothing_factor
+        self.sentiment_memory = LazySentiment()
+
+    def aggregate_advice(self, advice_list: Sequence[Advice]) -> SentimentScores:
+        memory = self.sentiment_memory
+        last, tick = memory.tick, memory.tick + 1
+        memory.tick = tick
+
+        grouped: Dict[str, List[float]] = {}
+        for advice in advice_list:
+            scores = grouped.setdefault(advice.asset, [])
+            if advice.confidence >= self.confidence_threshold:
+                scores.append(SIDES.get(advice.outlook, 0.0) * advice.confidence)
+
+        unremembered = {}
+        for asset, scores in grouped.items():
+            known = asset in memory.entries
+            if not scores:
+                if not known:
+                    memory.set(asset, 0.0, tick) # Decay of an unseen asset: remembered as neutral
+                continue
+
+            prev = memory.at(asset, last) if known else 0.0
+            raw_score = float(np.mean(scores))
+            smoothed_score = (raw_score * self.smoothing_factor) + (prev * (1 - self.smoothing_factor))
+            if abs(smoothed_score - prev) > 0.1 or abs(smoothed_score) < 0.05:
+                memory.set(asset, smoothed_score, tick)
+            elif known:
+                memory.set(asset, prev, tick) # Held by hysteresis: no decay on this tick
+            else:
+                unremembered[asset] = 0.0
+        return SentimentScores(memory, tick, unremembered)
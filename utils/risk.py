@@ -0,0 +1,216 @@
+# utils/risk.py
+
+import numpy as np
+from typing import Optional, Tuple
+from config import config
+
+DEFAULT_VOLATILITY = 0.02 # 2% when there is not enough history
+
+def simple_returns(prices: np.ndarray, last_prices: np.ndarray) -> np.ndarray:
+    """Per-asset simple returns; bad/missing prints contribute a flat (0) return."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = prices / last_prices - 1
+    returns[~np.isfinite(returns)] = 0.0
+    return returns
+
+def observed_returns(prices: np.ndarray, last_prices: Optional[np.ndarray], stale: Optional[np.ndarray] = None
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns of the assets that printed on this tick, measured from their last real print.
+    Stale (forward-filled) cells are not observations: they are masked out instead of
+    counting as flat returns, and their last real price is carried forward.
+    Returns (returns, observed mask, last real prices).
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    fresh = np.ones(len(prices), dtype=bool) if stale is None else ~np.asarray(stale, dtype=bool)
+    if last_prices is None:
+        return np.zeros(len(prices)), np.zeros(len(prices), dtype=bool), np.where(fresh, prices, np.nan)
+    observed = fresh & np.isfinite(last_prices)
+    returns = simple_returns(prices, last_prices)
+    returns[~observed] = 0.0
+    return returns, observed, np.where(fresh, prices, last_prices)
+
+class RollingVolatility:
+    """
+    Streaming rolling statistics of simple returns for a whole universe.
+    Keeps a fixed-size (window x assets) ring buffer of returns plus running
+    sums and sums of squares, so each tick is an O(1)-per-asset vector update.
+    Every asset has its own ring position: stale cells (no fresh print, e.g. a
+    closed market) push nothing, so a closed asset keeps the volatility of its
+    last `window` real returns instead of decaying to zero. The sums are
+    re-derived from the buffer once per full cycle to stop floating-point
+    drift from accumulating.
+    """
+
+    def __init__(self, n_assets: int, window: int = None):
+        self.n_assets = n_assets
+        self.window = window if window is not None else config.VOLATILITY_LOOKBACK
+        self.buffer = np.zeros((self.window, n_assets))
+        self.sum = np.zeros(n_assets)
+        self.sum_sq = np.zeros(n_assets)
+        self.last_prices = None
+        self.pos = np.zeros(n_assets, dtype=np.int64)
+        self.count = np.zeros(n_assets, dtype=np.int64)
+
+    def update(self, prices: np.ndarray, stale: Optional[np.ndarray] = None) -> np.ndarray:
+        """Feeds one row of prices (one per asset) and returns the updated volatility vector."""
+        returns, observed, self.last_prices = observed_returns(prices, self.last_prices, stale)
+        if observed.all() and (self.pos == self.pos[0]).all() and (self.count == self.count[0]).all():
+            # Every asset printed and the rings are in step: plain row update
+            pos = self.pos[0]
+            old = self.buffer[pos] if self.count[0] == self.window else 0.0
+            self.sum += returns - old
+            self.sum_sq += returns * returns - old * old
+            self.buffer[pos] = returns
+            self.count[:] = min(self.count[0] + 1, self.window)
+            self.pos[:] = (pos + 1) % self.window
+            if self.pos[0] == 0 and self.count[0] == self.window:
+                self.sum = self.buffer.sum(axis=0)
+                self.sum_sq = (self.buffer * self.buffer).sum(axis=0)
+            return self.volatility
+
+        cols = np.flatnonzero(observed)
+        if len(cols):
+            returns = returns[cols]
+            pos = self.pos[cols]
+            old = np.where(self.count[cols] == self.window, self.buffer[pos, cols], 0.0)
+            self.buffer[pos, cols] = returns
+            self.sum[cols] += returns - old
+            self.sum_sq[cols] += returns * returns - old * old
+            self.count[cols] = np.minimum(self.count[cols] + 1, self.window)
+            self.pos[cols] = (pos + 1) % self.window
+
+            cycled = cols[(self.pos[cols] == 0) & (self.count[cols] == self.window)]
+            if len(cycled):
+                self.sum[cycled] = self.buffer[:, cycled].sum(axis=0)
+                self.sum_sq[cycled] = (self.buffer[:, cycled] * self.buffer[:, cycled]).sum(axis=0)
+        return self.volatility
+
+    @property
+    def warm(self) -> np.ndarray:
+        """Assets whose volatility is measured from at least two real returns."""
+        return self.count >= 2
+
+    @property
+    def mean(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > 0, self.sum / self.count, 0.0)
+
+    @property
+    def variance(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            var = (self.sum_sq - self.sum * self.sum / self.count) / (self.count - 1)
+        return np.where(self.warm, np.maximum(var, 0.0), DEFAULT_VOLATILITY ** 2)
+
+    @property
+    def volatility(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+def rolling_volatility_panel(prices: np.ndarray, stale: Optional[np.ndarray] = None, window: int = None
+                             ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Whole-history RollingVolatility: row t is the volatility after streaming rows 0..t
+    (equal up to floating-point rounding), computed for all ticks at once.
+    Each window is a difference of cumulative sums over the (ticks x assets) matrix of
+    real returns, taken back to the asset's `window`-th most recent real return, so
+    stale cells push nothing, exactly as in the streaming path.
+    Returns (volatility, warm), both (ticks x assets).
+    """
+    window = window if window is not None else config.VOLATILITY_LOOKBACK
+    prices = np.asarray(prices, dtype=np.float64)
+    n_ticks, n_assets = prices.shape
+    fresh = np.ones(prices.shape, dtype=bool) if stale is None else ~np.asarray(stale, dtype=bool)
+    cols = np.arange(n_assets)
+
+    # Last real price before each tick (NaN until an asset's first fresh print)
+    last_row = np.maximum.accumulate(np.where(fresh, np.arange(n_ticks)[:, None], -1), axis=0)
+    last_real = np.where(last_row >= 0, prices[np.maximum(last_row, 0), cols], np.nan)
+    prev_real = np.vstack([np.full((1, n_assets), np.nan), last_real[:-1]])[:n_ticks]
+    observed = fresh & np.isfinite(prev_real)
+    if not observed.any():
+        return np.full(prices.shape, DEFAULT_VOLATILITY), np.zeros(prices.shape, dtype=bool)
+    returns = simple_returns(prices, prev_real)
+    returns[~observed] = 0.0
+
+    cum = np.cumsum(returns, axis=0)
+    cum_sq = np.cumsum(returns * returns, axis=0)
+    seen = np.cumsum(observed, axis=0) # Real returns per asset up to each tick
+    count = np.minimum(seen, window)
+
+    # Tick of the last real return that has left each window (cumulative sums are subtracted there)
+    obs_rows = np.nonzero(observed.T)[1] # Observation ticks, asset by asset
+    first_obs = np.concatenate(([0], np.cumsum(observed.sum(axis=0))[:-1]))
+    left = seen - count
+    left_row = obs_rows[np.maximum(first_obs + left - 1, 0)]
+    total = cum - np.where(left > 0, cum[left_row, cols], 0.0)
+    total_sq = cum_sq - np.where(left > 0, cum_sq[left_row, cols], 0.0)
+
+    warm = count >= 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = (total_sq - total * total / count) / (count - 1)
+    return np.sqrt(np.where(warm, np.maximum(var, 0.0), DEFAULT_VOLATILITY ** 2)), warm
+
+class EWMACovariance:
+    """
+    Exponentially weighted covariance of returns (RiskMetrics style, zero mean).
+    Each tick applies one in-place rank-one update, cov = lambda * cov + (1 - lambda) * r r^T,
+    so the cost is O(N^2) per tick with no history kept. With an `observed` mask
+    only the block of assets that printed is updated; rows of stale assets keep
+    their last real estimate. The first observation seeds the matrix with r r^T,
+    so correlations are +-1 until `min_observations` returns have been folded in
+    (see `warm`).
+    """
+
+    def __init__(self, n_assets: int, decay: float = None, min_observations: int = None):
+        self.n_assets = n_assets
+        self.decay = decay if decay is not None else config.COVARIANCE_DECAY
+        self.min_observations = min_observations if min_observations is not None else config.COVARIANCE_MIN_OBSERVATIONS
+        self.cov = np.zeros((n_assets, n_assets))
+        self.count = np.zeros(n_assets, dtype=np.int64)
+
+    def update(self, returns: np.ndarray, observed: Optional[np.ndarray] = None) -> np.ndarray:
+        """Folds one return vector (one per asset) into the covariance matrix."""
+        returns = np.asarray(returns, dtype=np.float64)
+        everyone = observed is None or observed.all()
+        if everyone and self.count.all():
+            self.cov *= self.decay
+            self.cov += np.outer((1 - self.decay) * returns, returns)
+            self.count += 1
+            return self.cov
+        if everyone and not self.count.any():
+            self.cov[:] = np.outer(returns, returns)
+            self.count += 1
+            return self.cov
+
+        cols = np.arange(self.n_assets) if everyone else np.flatnonzero(observed)
+        if len(cols):
+            r = returns[cols]
+            block = np.ix_(cols, cols)
+            first = self.count[cols] == 0
+            outer = np.outer(r, r)
+            updated = self.decay * self.cov[block] + (1 - self.decay) * outer
+            # Pairs involving an asset's first observation start from r r^T, as on the first tick
+            seed = first[:, None] | first[None, :]
+            self.cov[block] = np.where(seed, outer, updated)
+            self.count[cols] += 1
+        return self.cov
+
+    @property
+    def warm(self) -> np.ndarray:
+        """Assets with at least `min_observations` real returns folded in."""
+        return self.count >= self.min_observations
+
+    @property
+    def volatility(self) -> np.ndarray:
+        return np.sqrt(np.diag(self.cov))
+
+    @property
+    def correlation(self) -> np.ndarray:
+        """Correlation matrix; assets without variance yet are treated as uncorrelated."""
+        vol = self.volatility
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = self.cov / np.outer(vol, vol)
+        corr[~np.isfinite(corr)] = 0.0
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, 1.0)
+        return corr
@@ -0,0 +1,71 @@
+# utils/scheduler.py
+
+from typing import Dict, List
+from config import config
+
+class AnalystScheduler:
+    """
+    Per-asset next-due clock for Analyst calls.
+    In "staggered" mode the first calls of N registered assets are spread over
+    one cooldown window (asset i starts at i * cooldown / N), so calls do not
+    all land on the same ticks. Priorities stretch the interval of low-priority
+    assets up to `max_stretch` x cooldown; the highest-priority asset keeps the
+    plain cooldown, which stays the floor. `select()` applies a global
+    calls-per-tick budget, serving the most overdue assets first.
+    "aligned" mode reproduces the legacy behaviour: every asset is due at once.
+    """
+
+    def __init__(self, cooldown_ticks: int = None, mode: str = None,
+                 max_calls_per_tick: int = None, max_stretch: float = None):
+        self.cooldown_ticks = cooldown_ticks if cooldown_ticks is not None else config.LLM_COOLDOWN_TICKS
+        self.mode = mode if mode is not None else config.ANALYST_SCHEDULE
+        self.max_calls_per_tick = max_calls_per_tick if max_calls_per_tick is not None else config.ANALYST_MAX_CALLS_PER_TICK
+        self.max_stretch = max_stretch if max_stretch is not None else config.ANALYST_MAX_STRETCH
+        self.assets: List[str] = []
+        self.next_due: Dict[str, int] = {}
+        self.priorities: Dict[str, float] = {}
+
+    def register(self, assets: List[str], tick_id: int):
+        """Assigns first-call ticks for a (new) universe; a no-op if it is unchanged."""
+        assets = list(assets)
+        if assets == self.assets:
+            return
+        self.assets = assets
+        for i, asset in enumerate(assets):
+            if asset in self.next_due:
+                continue
+            offset = (i * self.cooldown_ticks) // len(assets) if self.mode == "staggered" else 0
+            self.next_due[asset] = tick_id + offset
+
+    def set_priorities(self, priorities: Dict[str, float]):
+        """Higher priority -> shorter interval (e.g. pass per-asset volatility)."""
+        self.priorities = {a: p for a, p in priorities.items() if p is not None and p > 0}
+
+    def is_due(self, asset: str, tick_id: int) -> bool:
+        return tick_id >= self.next_due.get(asset, tick_id)
+
+    def select(self, due: List[str], tick_id: int) -> List[str]:
+        """Trims the due assets to the per-tick budget, most overdue (then highest priority) first."""
+        if self.max_calls_per_tick <= 0 or len(due) <= self.max_calls_per_tick:
+            return list(due)
+        ranked = sorted(due, key=lambda a: (self.next_due.get(a, tick_id), -self.priorities.get(a, 0.0)))
+        chosen = set(ranked[:self.max_calls_per_tick])
+        return [a for a in due if a in chosen]
+
+    def interval(self, asset: str) -> int:
+        top = max(self.priorities.values(), default=0.0)
+        priority = self.priorities.get(asset)
+        if not top or not priority:
+            return self.cooldown_ticks
+        stretch = min(top / priority, self.max_stretch)
+        return max(self.cooldown_ticks, round(self.cooldown_ticks * stretch))
+
+    def mark_called(self, asset: str, tick_id: int):
+        self.next_due[asset] = tick_id + self.interval(asset)
+
+    def load(self) -> Dict[int, int]:
+        """Histogram of upcoming first-due ticks (tick -> number of assets), for diagnostics."""
+        counts: Dict[int, int] = {}
+        for tick in self.next_due.values():
+            counts[tick] = counts.get(tick, 0) + 1
+        return counts
@@ -0,0 +1,95 @@
+# utils/triggers.py
+
+from typing import Dict, Optional
+from config import config
+from utils.scheduler import AnalystScheduler
+
+class AnalystTrigger:
+    """
+    Decides when an asset needs a fresh Analyst call.
+    The cooldown is always a floor. In "cooldown" mode every asset is analyzed as
+    soon as its cooldown expires (legacy behaviour); in "state_change" mode it is
+    only analyzed when the price moved more than `price_move_pct` since the last
+    analysis or its volatility changed by more than a factor of `vol_ratio`.
+    The cooldown clock itself (staggering, priorities, per-tick budget) lives in
+    `scheduler`. A shadow cooldown-only schedule is tracked alongside so the run
+    can report how many API calls the triggers (and the advice cache) saved.
+    """
+
+    def __init__(self, mode: str = None, cooldown_ticks: int = None,
+                 price_move_pct: float = None, vol_ratio: float = None,
+                 scheduler: AnalystScheduler = None):
+        self.mode = mode if mode is not None else config.ANALYST_TRIGGER_MODE
+        self.cooldown_ticks = cooldown_ticks if cooldown_ticks is not None else config.LLM_COOLDOWN_TICKS
+        self.price_move_pct = price_move_pct if price_move_pct is not None else config.ANALYST_TRIGGER_PRICE_PCT
+        self.vol_ratio = vol_ratio if vol_ratio is not None else config.ANALYST_TRIGGER_VOL_RATIO
+        self.scheduler = scheduler if scheduler is not None else AnalystScheduler(self.cooldown_ticks)
+
+        self.last_call: Dict[str, int] = {}        # {asset: tick_id}
+        self.last_price: Dict[str, float] = {}
+        self.last_vol: Dict[str, float] = {}
+        self.baseline_last_call: Dict[str, int] = {}
+        self.calls = 0
+        self.baseline_calls = 0
+        self.reasons: Dict[str, int] = {}
+
+    def due(self, asset: str, tick_id: int, price: float, vol: Optional[float] = None) -> Optional[str]:
+        """
+        Returns the reason the asset should be analyzed on this tick, or None.
+        Callers must call record_call() for the assets they actually dispatch.
+        """
+        self._track_baseline(asset, tick_id)
+
+        if not self.scheduler.is_due(asset, tick_id):
+            return None
+        last = self.last_call.get(asset)
+        if self.mode != "state_change" or last is None:
+            return "cooldown" if last is not None else "initial"
+
+        ref_price = self.last_price.get(asset)
+        if ref_price and abs(price / ref_price - 1) >= self.price_move_pct:
+            return "price_move"
+
+        if vol is None:
+            return None
+        # Volatility was still warming up at the last call: adopt the first real reading as reference
+        ref_vol = self.last_vol.setdefault(asset, vol)
+        if ref_vol:
+            ratio = vol / ref_vol
+            if ratio >= self.vol_ratio or ratio <= 1 / self.vol_ratio:
+                return "vol_regime"
+        return None
+
+    def record_call(self, asset: str, tick_id: int, price: float, vol: Optional[float] = None, reason: str = "cooldown"):
+        self.last_call[asset] = tick_id
+        self.scheduler.mark_called(asset, tick_id)
+        self.last_price[asset] = price
+        if vol is not None:
+            self.last_vol[asset] = vol
+        self.calls += 1
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+    def stats(self, cache_hits: int = 0) -> Dict[str, object]:
+        """
+        API calls made vs. the calls a cooldown-only schedule would have made.
+        `cache_hits` are dispatched calls the advice cache answered; they never reach
+        the client, so they are reported separately instead of as calls.
+        """
+        calls = self.calls - cache_hits
+        saved = self.baseline_calls - calls
+        return {
+            "mode": self.mode,
+            "calls": calls,
+            "dispatched": self.calls,
+            "cache_hits": cache_hits,
+            "baseline_calls": self.baseline_calls,
+            "saved_calls": saved,
+            "saved_pct": saved / self.baseline_calls if self.baseline_calls else 0.0,
+            "by_reason": dict(self.reasons)
+        }
+
+    def _track_baseline(self, asset: str, tick_id: int):
+        last = self.baseline_last_call.get(asset)
+        if last is None or tick_id - last >= self.cooldown_ticks:
+            self.baseline_last_call[asset] = tick_id
+            self.baseline_calls += 1